@@ -1,8 +1,29 @@
 import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
+import pytest
+from sklearn import metrics
 
 import tmkit as tmk
+from tmkit.contact.Cache import Cache
+from tmkit.contact.Ensemble import Ensemble
+from tmkit.contact.Evaluator import evaluator
+from tmkit.contact.Format import Format
+from tmkit.contact.Join import Join
+from tmkit.contact.Metric import Metric
+from tmkit.contact.ProteinContext import ProteinContext
+from tmkit.contact.Reader import Reader
+from tmkit.position.scenario.Segment import Segment
+from tmkit.structure.Binary import Binary
+from tmkit.structure.ppi.Distance import Distance as ppidistance
+from tmkit.structure.ppi.Label import Label as ppilabel
+from tmkit.structure.rrc.Distance import Distance
+from tmkit.structure.rrc.Label import Label
 
 from . import dir_data
 
@@ -20,3 +41,362 @@ from . import dir_data
 #         tool="membrain2",
 #     )
 #     assert df1.shape == (19448, 3)
+
+
+def test_join_index():
+    ids = Join().index(
+        ref_1=[1, 1, 2, 1],
+        ref_2=[2, 3, 3, 2],
+        query_1=[2, 1, 5, 1],
+        query_2=[3, 2, 6, 3],
+    )
+    assert ids.tolist() == [2, 3, -1, 1]
+
+
+def test_contact_map_membrain2():
+    cmap = Format().read(
+        tool="membrain2",
+        fpn=os.path.join(dir_data, "rrc/tool/1xqfA.membrain2"),
+    )
+    assert len(cmap) == 23934
+    assert cmap.score.dtype == "float32"
+    top = cmap.top(k=5, mask=cmap.separation(seq_sep_inferior=4))
+    assert (cmap.id_1[top[0]], cmap.id_2[top[0]]) == (20, 192)
+    mask = cmap.region(fas_lower=[7, 42], fas_upper=[32, 65])
+    assert mask.sum() == cmap.select(mask).region([7, 42], [32, 65]).sum()
+
+
+def test_contact_cache(tmp_path, monkeypatch):
+    cache = Cache(cache_fp=str(tmp_path))
+    fpn = os.path.join(dir_data, "rrc/tool/1xqfA.membrain2")
+    cmap = Format(cache=cache).read(tool="membrain2", fpn=fpn)
+    cmap_ = Format(cache=cache).read(tool="membrain2", fpn=fpn)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (cmap.score == cmap_.score).all() and cmap.len_seq == cmap_.len_seq
+
+    key = cache.key(fpn, tool="membrain2")
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: Cache(cache_fp=str(tmp_path)).put(key, cmap), range(8)))
+    assert os.listdir(tmp_path) == [key + ".npz"]
+
+    def utime(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", utime)
+    assert cache.get(key).len_seq == cmap.len_seq and cache.hits == 2
+    monkeypatch.undo()
+    Cache(cache_fp=str(tmp_path), size_limit=0).evict()
+    assert cache.stats()["entries"] == 0
+
+
+def test_contact_matrix_sidecar(tmp_path, monkeypatch):
+    mat = np.arange(36, dtype=np.float64).reshape(6, 6) / 100
+    fpn = str(tmp_path / "x.ccmpred")
+    np.savetxt(fpn, mat, fmt="%.2f", delimiter="\t")
+    sidecar = fpn + ".npy"
+    cmap = Format().read(tool="ccmpred", fpn=fpn)
+    assert not os.path.exists(sidecar)
+    id_1, id_2 = np.triu_indices(6, k=1)
+    assert (cmap.id_1 == id_1 + 1).all() and (cmap.id_2 == id_2 + 1).all()
+    assert np.allclose(cmap.score, mat[id_1, id_2])
+    cmap_ = Format(is_mmap=True).read(tool="ccmpred", fpn=fpn)
+    assert os.path.exists(sidecar)
+    assert (cmap_.id_1 == cmap.id_1).all() and (cmap_.score == cmap.score).all()
+    mtime = os.stat(sidecar).st_mtime_ns
+    assert isinstance(Format(is_mmap=True).load_matrix(fpn), np.memmap)
+    assert os.stat(sidecar).st_mtime_ns == mtime
+    np.savetxt(fpn, mat * 2, fmt="%.2f", delimiter="\t")
+    os.utime(fpn, ns=(mtime + 10**9, mtime + 10**9))
+    cmap_ = Format(is_mmap=True).read(tool="ccmpred", fpn=fpn)
+    assert np.allclose(cmap_.score, mat[id_1, id_2] * 2)
+    assert np.allclose(np.load(sidecar), mat * 2)
+    Format(is_mmap=True).load_matrix(fpn, dtype=np.float64)
+    assert np.load(sidecar).dtype == np.float64
+    with open(sidecar, "wb") as file:
+        file.write(b"\x93NUMPY")
+    assert np.allclose(Format(is_mmap=True).load_matrix(fpn), mat * 2)
+    assert np.allclose(np.load(sidecar), mat * 2)
+    os.remove(sidecar)
+
+    def mkstemp(**kwargs):
+        raise PermissionError
+
+    monkeypatch.setattr(tempfile, "mkstemp", mkstemp)
+    assert np.allclose(Format(is_mmap=True).load_matrix(fpn), mat * 2)
+    assert not os.path.exists(sidecar)
+
+
+def test_contact_stream():
+    reader = Reader(seq_sep_inferior=4)
+    fpn = os.path.join(dir_data, "rrc/tool/1xqfA.membrain2")
+    df = reader.stream(tool="membrain2", fpn=fpn, k=50, chunksize=1000)
+    cmap = reader.contact_map(tool="membrain2", fpn=fpn)
+    top = cmap.select(cmap.top(k=50, mask=cmap.separation(seq_sep_inferior=4)))
+    assert df.shape == (50, 3)
+    assert (df["score"].values == top.score).all()
+    assert (df["contact_id_2"].values - df["contact_id_1"].values > 4).all()
+
+
+def test_contact_ensemble():
+    rrc_fp = os.path.join(dir_data, "rrc/")
+    dist_df = Label(dist_path=rrc_fp, prot_name="1xqf", file_chain="A").attach()
+    pairs = Segment().to_pair([7, 42, 80], [32, 65, 100])
+    scores, ids, label_df = Ensemble(dist_df=dist_df, pair_list=pairs).read(
+        tools=["membrain2"],
+        tool_fp=os.path.join(rrc_fp, "tool/"),
+        file_name="1xqf",
+        file_chain="A",
+    )
+    df1, df2 = Reader().membrain2(
+        os.path.join(rrc_fp, "tool/"),
+        file_name="1xqf",
+        file_chain="A",
+        dist_df=dist_df.copy(),
+        pair_list=pairs,
+        sort_=2,
+    )
+    assert scores.shape == (1, df1.shape[0]) == (1, ids.shape[0])
+    assert (scores[0] == df1["score"].values).all()
+    assert label_df.equals(df2)
+
+
+def test_evaluator_cutoffs():
+    rrc_fp = os.path.join(dir_data, "rrc/")
+    dist_df = Label(dist_path=rrc_fp, prot_name="1xqf", file_chain="A").attach()
+    p = evaluator(
+        prot_name="1xqf",
+        file_chain="A",
+        dist_df=dist_df,
+        pair_list=Segment().to_pair([7, 42, 80, 120], [32, 65, 100, 150]),
+        tool_fp=os.path.join(rrc_fp, "tool/"),
+        tool="membrain2",
+        sort_=2,
+    )
+    target = p.fetch()
+    df = p.compare_cutoffs(target, cut_offs=["L/5", 110])
+    assert df["top"].tolist() == [72, 110]
+    assert df["precision"][0] == df["tp"][0] / 72
+    assert p.compare(target, cut_off=110)["mcc"] == df["mcc"][1]
+
+
+def test_evaluate_batch(tmp_path, monkeypatch, capsys):
+    ### the PDB file of 1xqfA is not bundled, so helices are given as in
+    ### test_evaluator_cutoffs rather than mapped from PDBTM
+    monkeypatch.setattr(
+        ProteinContext,
+        "tmh",
+        property(lambda self: ([7, 42, 80, 120], [32, 65, 100, 150])),
+    )
+    for fp in ["fasta", "rrc", "rrc/tool"]:
+        os.makedirs(tmp_path / fp, exist_ok=True)
+    shutil.copy(
+        os.path.join(dir_data, "fasta/1xqfA.fasta"), tmp_path / "fasta/1xqfA.fasta"
+    )
+    shutil.copy(os.path.join(dir_data, "rrc/1xqfA.dist"), tmp_path / "rrc/1xqfA.dist")
+    shutil.copy(
+        os.path.join(dir_data, "rrc/tool/1xqfA.membrain2"),
+        tmp_path / "rrc/tool/1xqfA.membrain2",
+    )
+    ### chain B has a sequence and distances but no predictor file
+    shutil.copy(
+        os.path.join(dir_data, "fasta/1xqfA.fasta"), tmp_path / "fasta/1xqfB.fasta"
+    )
+    shutil.copy(os.path.join(dir_data, "rrc/1xqfA.dist"), tmp_path / "rrc/1xqfB.dist")
+    kwargs = dict(
+        fasta_fp=str(tmp_path / "fasta") + "/",
+        pdb_fp=str(tmp_path / "pdb") + "/",
+        dist_fp=str(tmp_path / "rrc") + "/",
+        xml_fp=str(tmp_path / "xml") + "/",
+        tool_fp=str(tmp_path / "rrc/tool") + "/",
+        tools=["membrain2"],
+        sv_fpn=str(tmp_path / "metrics.txt"),
+        cut_offs=["L/5", 110],
+    )
+    chain = tmk.rrc.evaluate_chain(
+        prot_name="1xqf",
+        seq_chain="A",
+        **{k: v for k, v in kwargs.items() if k != "sv_fpn"}
+    )
+    assert chain["top"].tolist() == [72, 110]
+    prot_df = pd.DataFrame([["1xqf", "A"], ["1xqf", "B"]])
+    df = tmk.rrc.evaluate_batch(prot_df, num_workers=2, **kwargs)
+    assert "Failed 1xqfB" in capsys.readouterr().out
+    assert df[["prot", "chain", "tool"]].drop_duplicates().values.tolist() == [
+        ["1xqf", "A", "membrain2"]
+    ]
+    assert df["cut_off"].astype(str).tolist() == ["L/5", "110"]
+    assert np.allclose(
+        df[["tp", "precision", "mcc"]], chain[["tp", "precision", "mcc"]]
+    )
+    df = tmk.rrc.evaluate_batch(prot_df, num_workers=1, **kwargs)
+    assert "1 chains to evaluate, 1 results found" in capsys.readouterr().out
+    assert len(df) == len(chain)
+
+
+def test_metric_ranking():
+    y_true = np.array([1, 0, 1, 1, 0, 0, 1, 0])
+    y_score = np.array([0.9, 0.8, 0.8, 0.5, 0.5, 0.3, 0.2, 0.1])
+    ranking = Metric().ranking(y_true, y_score)
+    assert np.isclose(
+        ranking["auprc"], metrics.average_precision_score(y_true, y_score)
+    )
+    assert np.isclose(ranking["roc_auc"], metrics.roc_auc_score(y_true, y_score))
+    assert Metric().precision_at_k(y_true, y_score, ks=[1, 4]).tolist() == [1.0, 0.75]
+
+
+def test_protein_context():
+    context = ProteinContext(
+        prot_name="1xqf",
+        seq_chain="A",
+        fasta_fp=os.path.join(dir_data, "fasta/"),
+        pdb_fp=os.path.join(dir_data, "pdb/"),
+        dist_fp=os.path.join(dir_data, "rrc/"),
+        xml_fp=os.path.join(dir_data, "xml/"),
+    )
+    dist_df = context.dist(seq_sep_superior=25)
+    dist_df["dist"] = 0
+    assert context.dist(seq_sep_superior=25)["dist"].max() > 0
+    assert [*context._dists.keys()] == [(None, 25)]
+    assert context.fasids is context.fasids
+
+
+def test_distance_dist_format(tmp_path):
+    atoms = [
+        ("N", "ALA", 3, (0.0, 0.0, 0.0)),
+        ("CA", "ALA", 3, (1.5, 0.0, 0.0)),
+        ("CB", "ALA", 3, (1.5, 1.5, 0.0)),
+        ("N", "GLY", 4, (4.0, 0.0, 0.0)),
+        ("CA", "GLY", 4, (5.0, 0.0, 0.0)),
+        ("N", "VAL", 6, (12.0, 0.0, 0.0)),
+        ("CA", "VAL", 6, (13.0, 0.0, 0.0)),
+        ("CB", "VAL", 6, (13.0, 3.0, 4.0)),
+    ]
+    with open(tmp_path / "9xyzA.pdb", "w") as f:
+        for i, (name, res, res_id, (x, y, z)) in enumerate(atoms):
+            f.write(
+                "ATOM  %5d  %-3s %3s A%4d    %8.3f%8.3f%8.3f  1.00  0.00           %s\n"
+                % (i + 1, name, res, res_id, x, y, z, name[0])
+            )
+    pdb_fp = str(tmp_path) + "/"
+    heavy = Distance(pdb_fp, prot_name="9xyz", seq_chain="A", file_chain="A", block=2)
+    heavy.write(pdb_fp)
+    df = Label(dist_path=pdb_fp, prot_name="9xyz", file_chain="A").attach()
+    assert df["pdb_id_1"].tolist() == [3, 3, 4]
+    assert df["pdb_id_2"].tolist() == [4, 6, 6]
+    assert [round(d, 4) for d in df["dist"]] == [2.5, 10.5, 7.0]
+    assert df["is_contact"].tolist() == [1, 0, 0]
+    cb = Distance(pdb_fp, prot_name="9xyz", seq_chain="A", file_chain="A", kind="cb")
+    assert round(float(cb.matrix()[0, 1]), 4) == round((3.5**2 + 1.5**2) ** 0.5, 4)
+    with open(tmp_path / "9xyzB.pdb", "w") as f:
+        for i, (name, res, res_id, (x, y, z)) in enumerate(atoms):
+            if not (res == "GLY" and name == "CA"):
+                f.write(
+                    "ATOM  %5d  %-3s %3s B%4d    %8.3f%8.3f%8.3f  1.00  0.00           %s\n"
+                    % (i + 1, name, res, res_id, x, y, z, name[0])
+                )
+    with open(tmp_path / "9xyzB.fasta", "w") as f:
+        f.write(">9xyzB\nAGVK\n")
+    ca = Distance(pdb_fp, prot_name="9xyz", seq_chain="B", file_chain="B", kind="ca")
+    with pytest.warns(UserWarning, match="3 residues of chain B"):
+        ca.write(pdb_fp, fasta_fpn=str(tmp_path / "9xyzB.fasta"))
+    df = Label(dist_path=pdb_fp, prot_name="9xyz", file_chain="B").attach()
+    assert df["fasta_id_2"].tolist() == [2, 3, 3]
+    assert df["pdb_id_2"].tolist() == [4, 6, 6]
+    assert df["dist"].tolist() == [np.inf, 11.5, np.inf]
+    assert df["is_contact"].tolist() == [0, 0, 0]
+
+
+def test_ppi_distance(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    ### chain A near chain B, chain C 50 angstrom away
+    offsets = {"A": 0.0, "B": 6.0, "C": 60.0}
+    coords = {chain: {} for chain in offsets}
+    with open(tmp_path / "9xyz.pdb", "w") as f:
+        k = 0
+        for chain, offset in offsets.items():
+            for res_id in range(1, 6):
+                for name in ["N", "CA", "C", "CB"]:
+                    x, y, z = rng.random(3) * 8 + [offset, 0, 0]
+                    coords[chain].setdefault(res_id, []).append((x, y, z))
+                    k += 1
+                    f.write(
+                        "ATOM  %5d  %-3s ALA %s%4d    %8.3f%8.3f%8.3f  1.00  0.00           %s\n"
+                        % (k, name, chain, res_id, x, y, z, name[0])
+                    )
+    pdb_fp = str(tmp_path) + "/"
+    brute = np.array(
+        [
+            [
+                min(
+                    np.linalg.norm(np.array(a) - np.array(b))
+                    for a in coords["A"][res_id]
+                    for res in coords[chain].values()
+                    for b in res
+                )
+                for chain in ["B", "C"]
+            ]
+            for res_id in range(1, 6)
+        ]
+    )
+    p = ppidistance(pdb_fp, prot_name="9xyz", seq_chain="A")
+    assert p.partners() == ["B", "C"]
+    df = p.extract()
+    assert df[2].tolist() == [1, 2, 3, 4, 5]
+    assert np.allclose(df[[3, 4]].to_numpy(dtype=float), brute, atol=1e-3)
+    ### numpy blocks without scipy
+    monkeypatch.setitem(sys.modules, "scipy.spatial", None)
+    df = ppidistance(pdb_fp, prot_name="9xyz", seq_chain="A", block=3).extract()
+    assert np.allclose(df[[3, 4]].to_numpy(dtype=float), brute, atol=1e-3)
+    monkeypatch.delitem(sys.modules, "scipy.spatial")
+    p = ppidistance(pdb_fp, prot_name="9xyz", seq_chain="A", radius=3)
+    df = p.extract()
+    near = np.where(brute[:, 0] <= 3, brute[:, 0], np.inf)
+    assert np.isinf(near).sum() == 2
+    assert np.allclose(df[3].to_numpy(dtype=float), near, atol=1e-3)
+    assert np.isinf(df[4].to_numpy(dtype=float)).all()
+    p.write(pdb_fp, is_binary=True)
+    text = ppilabel(
+        dist_path=pdb_fp, prot_name="9xyz", file_chain="", cutoff=2, is_binary=False
+    )
+    p.write(pdb_fp)
+    text = text.attach()
+    binary = ppilabel(
+        dist_path=pdb_fp, prot_name="9xyz", file_chain="", cutoff=2, is_binary=True
+    ).attach()
+    assert binary["pdb_id"].tolist() == [1, 2, 3, 4, 5]
+    assert np.allclose(binary["dist_1"], text["dist_1"].astype(float), atol=1e-3)
+    assert np.allclose(binary["dist_1"], near, atol=1e-3)
+    assert np.isinf(binary["dist_2"]).all()
+    assert (
+        binary["is_contact"].tolist() == text["is_contact"].tolist() == [1, 0, 1, 0, 0]
+    )
+
+
+def test_binary_dist(tmp_path):
+    shutil.copy(os.path.join(dir_data, "rrc/1xqfA.dist"), tmp_path / "1xqfA.dist")
+    dist_fp = str(tmp_path) + "/"
+    header, arrays = Binary().open(Binary().from_rrc(dist_fp + "1xqfA.dist"))
+    assert header["is_triu"] and arrays["fasta_id"].dtype == np.int16
+    for seq_sep_inferior, seq_sep_superior in [(None, None), (4, 12), (24, None)]:
+        kwargs = dict(
+            seq_sep_inferior=seq_sep_inferior, seq_sep_superior=seq_sep_superior
+        )
+        text = Label(dist_fp, "1xqf", "A", **kwargs).attach()
+        binary = Label(dist_fp, "1xqf", "A", is_binary=True, **kwargs).attach()
+        assert text["fasta_id_1"].astype(int).tolist() == binary["fasta_id_1"].tolist()
+        assert text["fasta_id_2"].astype(int).tolist() == binary["fasta_id_2"].tolist()
+        assert text["aa_2"].tolist() == binary["aa_2"].tolist()
+        assert text["is_contact"].astype(int).tolist() == binary["is_contact"].tolist()
+        assert np.allclose(text["dist"].astype(float), binary["dist"])
+
+
+def test_label_cutoffs():
+    dist_fp = os.path.join(dir_data, "rrc/")
+    label = Label(dist_fp, "1xqf", "A", cutoff=[5.5, 6, 8, 12], seq_sep_inferior=4)
+    df, labels = label.labels()
+    assert labels.shape == (df.shape[0], 4) and labels.dtype == np.uint8
+    assert (labels[:, 0] == df["is_contact"].values).all()
+    assert (labels[:, 3] == (df["dist"].values < 12)).all()
+    assert (labels.sum(0) == np.sort(labels.sum(0))).all()
+    _, packed = label.labels(is_packed=True)
+    assert (np.unpackbits(packed, axis=0, count=df.shape[0]) == labels).all()
@@ -0,0 +1,46 @@
+"""
+Scaling benchmarks of seqnetrr pipelines under pytest-benchmark.
+
+Not collected by a plain `pytest tests` run; run explicitly, e.g.,
+
+    pytest tests/seqnetrr_benchmark.py --benchmark-json=bench.json
+    pytest tests/seqnetrr_benchmark.py -k "100-"
+
+Records of stages (see tmkit.seqnetrr.Benchmark) are kept in extra_info
+of each benchmark. Without pytest-benchmark, use
+
+    python -m tmkit.seqnetrr.Benchmark -o bench.csv
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from tmkit.seqnetrr.Benchmark import Benchmark
+
+GRID = Benchmark()
+
+
+@pytest.fixture(scope="module")
+def bench(tmp_path_factory):
+    return Benchmark(work_dir=str(tmp_path_factory.mktemp("seqnetrr_bench")))
+
+
+@pytest.mark.parametrize(
+    "len_seq,window_size,pair_mode,method",
+    list(GRID.configs()),
+    ids=["-".join(str(c) for c in config) for config in GRID.configs()],
+)
+def test_controller(benchmark, bench, len_seq, window_size, pair_mode, method):
+    bench.fasta(len_seq)
+    bench.net(len_seq)
+    records = benchmark.pedantic(
+        bench.controller,
+        args=(len_seq, window_size, pair_mode, method),
+        rounds=1,
+        iterations=1,
+    )
+    for record in records:
+        benchmark.extra_info[record["stage"] + "_time"] = record["time"]
+        benchmark.extra_info[record["stage"] + "_peak_rss"] = record["peak_rss"]
+        benchmark.extra_info[record["stage"] + "_rss"] = record["rss"]
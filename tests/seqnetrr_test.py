@@ -0,0 +1,382 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tmkit import edge
+from tmkit.seqnetrr.Benchmark import Benchmark
+from tmkit.seqnetrr.combo.Length import length as plength
+from tmkit.seqnetrr.combo.Position import Position as pfasta
+from tmkit.seqnetrr.Controller import Controller
+from tmkit.seqnetrr.graph.Bipartite import Bipartite
+from tmkit.seqnetrr.graph.Cumulative import Cumulative
+from tmkit.seqnetrr.graph.Unipartite import Unipartite
+from tmkit.seqnetrr.Index import Index
+from tmkit.seqnetrr.net.Sparse import Sparse
+from tmkit.seqnetrr.window.Pair import Pair
+from tmkit.seqnetrr.window.Single import Single
+
+
+@pytest.fixture
+def net(tmp_path):
+    rng = np.random.default_rng(0)
+    len_seq = 24
+    sequence = "".join(
+        np.array(list("ACDEFGHIKLMNPQRSTVWY"))[rng.integers(0, 20, len_seq)]
+    )
+    id_1, id_2 = np.triu_indices(len_seq, k=1)
+    net_fpn = str(tmp_path / "x.net")
+    np.savetxt(
+        net_fpn,
+        np.c_[id_1 + 1, id_2 + 1, rng.random(id_1.shape[0])],
+        fmt=["%d", "%d", "%.6f"],
+        delimiter="\t",
+    )
+    return sequence, net_fpn
+
+
+@pytest.fixture
+def fasta_fpn(net, tmp_path):
+    sequence, _ = net
+    fasta_fpn = str(tmp_path / "x.fasta")
+    with open(fasta_fpn, "w") as f:
+        f.write(">x\n" + sequence + "\n")
+    return fasta_fpn
+
+
+def windows(sequence, window_size, seq_sep_inferior=0, seq_sep_superior=None):
+    position = pfasta(sequence).pair(
+        pos_list=plength(
+            seq_sep_inferior=seq_sep_inferior,
+            seq_sep_superior=seq_sep_superior,
+        ).to_pair(len(sequence))
+    )
+    window_m_ids = Pair(
+        sequence=sequence, position=position, window_size=window_size
+    ).mid()
+    return position, window_m_ids
+
+
+@pytest.mark.parametrize("window_size", [1, 3])
+def test_unipartite_gather(net, window_size):
+    sequence, net_fpn = net
+    position, window_m_ids = windows(sequence, window_size, seq_sep_superior=10)
+    p = Unipartite(
+        sequence=sequence, window_size=window_size, window_m_ids=window_m_ids
+    )
+    hashed = p.assign(list_2d=copy.deepcopy(position), fpn=net_fpn, mode="hash")
+    gathered = p.assign(list_2d=None, fpn=net_fpn, mode="gather")
+    assert gathered.shape == (len(position), 2 * p.stretch_window)
+    assert np.allclose(np.array([row[7:] for row in hashed]), gathered, atol=1e-6)
+    assert np.array_equal(p.assign(list_2d=None, fpn=net_fpn, mode="window"), gathered)
+
+
+@pytest.mark.parametrize("kind", ["patch", "memconp", "cross", "unchanged"])
+def test_bipartite_gather(net, kind):
+    sequence, net_fpn = net
+    position, window_m_ids = windows(sequence, 2, seq_sep_inferior=2)
+    p = Bipartite(
+        sequence=sequence,
+        window_size=2,
+        window_m_ids=window_m_ids,
+        kind=kind,
+        patch_size=2,
+    )
+    hashed = p.assign(list_2d=copy.deepcopy(position), fpn=net_fpn, mode="hash")
+    gathered = p.assign(list_2d=None, fpn=net_fpn, mode="gather")
+    assert gathered.shape == (len(position), p.num_to_dos_in_window)
+    assert np.allclose(np.array([row[7:] for row in hashed]), gathered, atol=1e-6)
+
+
+@pytest.mark.parametrize("is_activate", [False, True])
+def test_cumulative_gather(net, is_activate):
+    sequence, net_fpn = net
+    position = pfasta(sequence).single(pos_list=plength().tosgl(len(sequence)))
+    window_m_ids = Single(sequence=sequence, position=position, window_size=2).mid()
+    p = Cumulative(sequence=sequence, window_size=2, window_m_ids=window_m_ids)
+    summed = p.assign(
+        list_2d=copy.deepcopy(position), fpn=net_fpn, L=6, is_activate=is_activate
+    )
+    gathered = p.assign(
+        list_2d=None, fpn=net_fpn, L=6, is_activate=is_activate, mode="gather"
+    )
+    assert np.allclose(np.array([row[len(position[0]) :] for row in summed]), gathered)
+
+
+def test_controller_stream(net, fasta_fpn, tmp_path):
+    _, net_fpn = net
+    kwargs = dict(
+        fasta_fpn=fasta_fpn,
+        net_fpn=net_fpn,
+        window_size=2,
+        seq_sep_inferior=1,
+        seq_sep_superior=12,
+        pair_mode="cross",
+    )
+    for method in ["unipartite", "bipartite"]:
+        list_2d = getattr(Controller(method=None, **kwargs), method)()
+        sv_fpn = str(tmp_path / (method + ".npy"))
+        Controller(method=method, block_size=10, is_sv=True, sv_fpn=sv_fpn, **kwargs)
+        streamed = np.load(sv_fpn, mmap_mode="r")
+        meta = np.load(sv_fpn[:-4] + ".meta.npy")
+        assert streamed.shape[0] == len(list_2d)
+        assert np.array_equal(
+            np.c_[meta["fasta_id_1"], meta["fasta_id_2"]],
+            np.array([[row[0], row[3]] for row in list_2d]),
+        )
+        assert np.allclose(streamed, np.array([row[7:] for row in list_2d]), atol=1e-6)
+        blocks = list(Controller(method=method, block_size=10, **kwargs).stream())
+        assert max(pairs.shape[0] for pairs, _ in blocks) == 10
+    c = Controller(method="unipartite", block_size=10, **kwargs)
+    c.stream = lambda: (_ for _ in [blocks[0], None])
+    for suffix in [".npy", ".txt"]:
+        c.sv_fpn = str(tmp_path / ("failed" + suffix))
+        with pytest.raises(TypeError):
+            c.streaming()
+        assert not os.path.exists(c.sv_fpn)
+    assert not os.path.exists(tmp_path / "failed.meta.npy")
+
+
+@pytest.mark.parametrize(
+    "suffix,compression,module",
+    [
+        (".npy", None, None),
+        (".npz", "deflate", None),
+        (".parquet", "zstd", "pyarrow"),
+        (".h5", "gzip", "h5py"),
+    ],
+)
+def test_controller_output(net, fasta_fpn, tmp_path, suffix, compression, module):
+    if module is not None:
+        pytest.importorskip(module)
+    _, net_fpn = net
+    sv_fpn = str(tmp_path / ("x" + suffix))
+    list_2d = Controller(
+        method="bipartite",
+        fasta_fpn=fasta_fpn,
+        net_fpn=net_fpn,
+        seq_sep_inferior=2,
+        is_sv=True,
+        sv_fpn=sv_fpn,
+        compression=compression,
+    ).bipartite()
+    if suffix == ".npy":
+        features, meta = np.load(sv_fpn), np.load(sv_fpn[:-4] + ".meta.npy")
+    elif suffix == ".npz":
+        with np.load(sv_fpn) as arrays:
+            features, meta = arrays["features"], arrays["meta"]
+    elif suffix == ".parquet":
+        features = pd.read_parquet(sv_fpn).values
+        meta = pd.read_parquet(sv_fpn[:-8] + ".meta.parquet")
+    else:
+        import h5py
+
+        with h5py.File(sv_fpn, "r") as f:
+            features = f["features"][:]
+            meta = {name: f["meta/" + name][:] for name in f["meta"]}
+    assert features.dtype == np.float32
+    assert np.allclose(features, np.array([row[7:] for row in list_2d]), atol=1e-6)
+    assert np.array_equal(np.asarray(meta["fasta_id_2"]), [row[3] for row in list_2d])
+    assert "".join(np.asarray(meta["aa_1"]).astype(str)) == "".join(
+        row[1] for row in list_2d
+    )
+
+
+@pytest.mark.parametrize(
+    "seq_sep_inferior,seq_sep_superior",
+    [(None, None), (0, None), (2, 9), (None, 4.5), (30, None)],
+)
+def test_length_to_array(seq_sep_inferior, seq_sep_superior):
+    p = plength(seq_sep_inferior=seq_sep_inferior, seq_sep_superior=seq_sep_superior)
+    pairs = p.to_array(24)
+    id_1, id_2 = np.triu_indices(24, k=1)
+    sep = id_2 - id_1
+    keep = sep > (0 if seq_sep_inferior is None else seq_sep_inferior)
+    if seq_sep_superior is not None:
+        keep &= sep < seq_sep_superior
+    assert pairs.dtype == np.int32
+    assert np.array_equal(pairs, np.c_[id_1[keep] + 1, id_2[keep] + 1])
+    assert np.array_equal(
+        np.concatenate([pairs[:0]] + list(p.blocks(24, block_size=7))), pairs
+    )
+
+
+def test_extract_batch(net, fasta_fpn, tmp_path):
+    sequence, net_fpn = net
+    manifest = [
+        dict(
+            fasta_fpn=fasta_fpn,
+            net_fpn=net_fpn,
+            sv_fpn=str(tmp_path / (m + ".txt")),
+            method=m,
+        )
+        for m in ["unipartite", "bipartite", "unipartite"]
+    ]
+    manifest.append(
+        dict(
+            fasta_fpn=fasta_fpn,
+            net_fpn=str(tmp_path / "no.net"),
+            sv_fpn=str(tmp_path / "no.txt"),
+            method="unipartite",
+        )
+    )
+    report = edge.extract_batch(
+        manifest, num_workers=1, assign_mode="gather", input_kind="general"
+    )
+    assert report["status"].tolist() == ["ok", "ok", "ok", "failed"]
+    assert (report["len_seq"] == len(sequence)).all()
+    features = np.loadtxt(manifest[0]["sv_fpn"], usecols=range(7, 27))
+    assert features.shape == (len(sequence) * (len(sequence) - 1) // 2, 20)
+
+
+def test_index(tmp_path):
+    index = Index(cache_dir=str(tmp_path / "index"))
+    pairs = index.pairs(24, seq_sep_inferior=2)
+    assert not pairs.flags.writeable
+    assert index.pairs(24, seq_sep_inferior=2) is pairs
+    sequence = "A" * 24
+    position, window_m_ids = windows(sequence, 2, seq_sep_inferior=2)
+    assert np.array_equal(
+        index.windows(24, 2, seq_sep_inferior=2),
+        Pair(sequence, position, 2).mid_array(),
+    )
+    expected = Bipartite(
+        sequence=sequence, window_size=2, window_m_ids=window_m_ids, kind="cross"
+    ).pairindex()
+    assert np.array_equal(
+        index.bipartite(24, 2, seq_sep_inferior=2, pair_mode="cross"), expected
+    )
+    ### a new factory on the same directory opens saved arrays by memory map
+    reopened = Index(max_bytes=0, cache_dir=str(tmp_path / "index"))
+    assert isinstance(
+        reopened.bipartite(24, 2, seq_sep_inferior=2, pair_mode="cross"), np.memmap
+    )
+    assert reopened.nbytes == 0
+    small = Index(max_bytes=pairs.nbytes)
+    small.pairs(24, seq_sep_inferior=2)
+    small.pairs(24, seq_sep_inferior=3)
+    assert list(small.cache) == [("pairs", 24, 3, None)]
+
+
+def test_controller_all(net, fasta_fpn, tmp_path):
+    _, net_fpn = net
+    kwargs = dict(
+        fasta_fpn=fasta_fpn,
+        net_fpn=net_fpn,
+        seq_sep_inferior=3,
+        pair_mode="cross",
+        cumu_ratio=0.5,
+    )
+    single = {
+        method: np.array(
+            [
+                row[7 if method != "cumulative" else 4 :]
+                for row in getattr(Controller(method=None, **kwargs), method)()
+            ]
+        )
+        for method in ["unipartite", "bipartite", "cumulative"]
+    }
+    sv_fpn = str(tmp_path / "all.npz")
+    p = Controller(
+        method="all", assign_mode="gather", is_sv=True, sv_fpn=sv_fpn, **kwargs
+    )
+    with np.load(sv_fpn) as arrays:
+        features, meta = arrays["features"], arrays["meta"]
+    start, stop = p.columns["bipartite"]
+    assert np.allclose(features[:, start:stop], single["bipartite"], atol=1e-6)
+    start, stop = p.columns["cumulative"]
+    cumu = single["cumulative"]
+    assert np.allclose(
+        features[:, start:stop],
+        np.c_[cumu[meta["fasta_id_1"] - 1], cumu[meta["fasta_id_2"] - 1]],
+        atol=1e-6,
+    )
+    assert p.columns["unipartite"] == (0, single["unipartite"].shape[1])
+
+
+def test_sparse_network(net, tmp_path):
+    sequence, net_fpn = net
+    full = np.loadtxt(net_fpn)
+    top = full[np.argsort(-full[:, 2])[:40]]
+    top_fpn = str(tmp_path / "top.net")
+    np.savetxt(top_fpn, top, fmt=["%d", "%d", "%.6f"], delimiter="\t")
+    position, window_m_ids = windows(sequence, 2, seq_sep_inferior=2)
+    for graph, kwargs in [
+        (Unipartite, {}),
+        (Bipartite, {"kind": "cross", "patch_size": 2}),
+    ]:
+        p = graph(sequence=sequence, window_size=2, window_m_ids=window_m_ids, **kwargs)
+        assert np.array_equal(
+            p.assign(list_2d=None, fpn=net_fpn, mode="sparse"),
+            p.assign(list_2d=None, fpn=net_fpn, mode="gather"),
+        )
+        assert np.array_equal(
+            p.assign(list_2d=None, fpn=top_fpn, mode="sparse"),
+            p.assign(list_2d=None, fpn=top_fpn, mode="gather"),
+        )
+    mat = p.netsparse(fpn=top_fpn, fill=-1.0)
+    assert mat.nnz == 40
+    dense = mat.todense()
+    assert dense[0].sum() == 0 and dense[:, 0].sum() == 0
+    assert (dense == -1).sum() == len(sequence) ** 2 - 40
+    id_1, id_2 = np.meshgrid(
+        np.arange(len(sequence) + 1), np.arange(len(sequence) + 1), indexing="ij"
+    )
+    assert np.array_equal(mat[id_1, id_2], dense)
+    assert np.array_equal(
+        Sparse(top[:, 0], top[:, 1], top[:, 2], len(sequence)).todense(),
+        p.netmat(fpn=top_fpn),
+    )
+
+
+def test_benchmark(tmp_path):
+    bench = Benchmark(
+        len_seqs=[20],
+        window_sizes=[1],
+        pair_modes=["patch", "cross"],
+        work_dir=str(tmp_path),
+        is_sv=True,
+    )
+    df = bench.run()
+    assert len(list(bench.configs())) == 4
+    assert set(df["stage"]) == {
+        "pairs",
+        "position",
+        "windows",
+        "index",
+        "network",
+        "assign",
+        "save",
+    }
+    assert (df["time"] >= 0).all() and df["peak_rss"].notna().all()
+    df = Benchmark(
+        len_seqs=[20],
+        window_sizes=[2],
+        methods=["unipartite", "cumulative"],
+        assign_mode="hash",
+        work_dir=str(tmp_path),
+    ).run()
+    assert set(df["stage"]) == {"pairs", "position", "windows", "assign"}
+    df = Benchmark(
+        len_seqs=[20],
+        window_sizes=[2],
+        methods=["bipartite"],
+        assign_mode="sparse",
+        net_ratio=0.2,
+        work_dir=str(tmp_path),
+    ).run()
+    assert len(df) == 4 * 6
+    assert np.loadtxt(bench.net(20)).shape == (190, 3)
+    assert np.loadtxt(tmp_path / "net_20_0.2_0.net").shape == (38, 3)
+    df = Benchmark(
+        len_seqs=[20],
+        window_sizes=[2],
+        methods=["unipartite"],
+        block_size=50,
+        work_dir=str(tmp_path),
+        is_sv=True,
+    ).run()
+    assert df["stage"].tolist() == ["stream"]
+    assert np.load(tmp_path / "features.npy").shape == (190, 20)
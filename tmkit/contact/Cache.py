@@ -0,0 +1,237 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, List, Optional, Tuple
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from tmkit.contact.ContactMap import ContactMap
+
+
+class Cache:
+    """
+    On-disk cache of parsed predictor files.
+
+    Each entry is an `.npz` file holding the `id_1`, `id_2` and `score`
+    columns of a ContactMap, together with the sequence length. Entries are
+    named by a blake2b digest of the file path, size, mtime (in ns), tool
+    and score dtype, so that an edited or replaced file never hits a stale
+    entry and a lookup costs one `os.stat` rather than reading the file.
+    Entries are evicted least-recently-used first once the cache grows
+    beyond `size_limit`.
+
+    Entries are written to a unique temporary file and renamed into place,
+    so several processes may share `cache_fp`: readers never see a partial
+    entry, and entries removed by another process are skipped.
+
+    Parameters
+    ----------
+    cache_fp : str
+        Directory of cache entries. It is created if it does not exist.
+    size_limit : int, optional
+        Maximum total size of entries in bytes, by default 1 GiB.
+    """
+
+    def __init__(
+        self,
+        cache_fp: str,
+        size_limit: int = 1 << 30,
+    ) -> None:
+        self.cache_fp = cache_fp
+        self.size_limit = int(size_limit)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_fp, exist_ok=True)
+
+    def key(
+        self,
+        fpn: str,
+        tool: str,
+        dtype: np.dtype = np.float32,
+    ) -> str:
+        """
+        Key of a predictor file, from its path and `os.stat` only (the
+        content is not read).
+
+        Parameters
+        ----------
+        fpn : str
+            Path to a predictor file.
+        tool : str
+            Name of a predictor.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+
+        Returns
+        -------
+        str
+            Hex digest.
+        """
+        stat = os.stat(fpn)
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(
+            "|".join(
+                [
+                    os.path.abspath(fpn),
+                    str(stat.st_size),
+                    str(stat.st_mtime_ns),
+                    tool,
+                    np.dtype(dtype).str,
+                ]
+            ).encode()
+        )
+        return hasher.hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Path to the entry of a key.
+
+        Parameters
+        ----------
+        key : str
+            Key of a predictor file.
+
+        Returns
+        -------
+        str
+            Path to an `.npz` file.
+        """
+        return os.path.join(self.cache_fp, key + ".npz")
+
+    def get(
+        self,
+        key: str,
+        len_seq: Optional[int] = None,
+    ) -> Optional[ContactMap]:
+        """
+        Fetch a cached contact map.
+
+        Parameters
+        ----------
+        key : str
+            Key of a predictor file.
+        len_seq : int, optional
+            Length of the sequence, by default the cached one.
+
+        Returns
+        -------
+        Optional[ContactMap]
+            The contact map, or None if it is not cached.
+        """
+        fpn = self.path(key)
+        try:
+            with np.load(fpn) as entry:
+                cmap = ContactMap(
+                    id_1=entry["id_1"],
+                    id_2=entry["id_2"],
+                    score=entry["score"],
+                    len_seq=int(entry["len_seq"]) if len_seq is None else len_seq,
+                    dtype=entry["score"].dtype,
+                )
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        ### touch the entry so that eviction sees it as recently used
+        try:
+            os.utime(fpn)
+        except FileNotFoundError:
+            ### evicted by another process since it was loaded
+            pass
+        self.hits += 1
+        return cmap
+
+    def put(
+        self,
+        key: str,
+        cmap: ContactMap,
+    ) -> None:
+        """
+        Store a contact map and evict old entries if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            Key of a predictor file.
+        cmap : ContactMap
+            A contact map.
+        """
+        ### written aside under a unique name and renamed, so processes
+        ### caching the same file never clash or publish a partial entry
+        handle, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.cache_fp)
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(
+                    file,
+                    id_1=cmap.id_1,
+                    id_2=cmap.id_2,
+                    score=cmap.score,
+                    len_seq=np.int64(cmap.len_seq),
+                )
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least-recently-used entries until the cache fits `size_limit`.
+        """
+        entries = []
+        for name, stat in self.entries():
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.size_limit:
+                break
+            try:
+                os.remove(os.path.join(self.cache_fp, name))
+            except FileNotFoundError:
+                ### evicted by another process
+                pass
+            total -= size
+
+    def entries(self) -> List[Tuple[str, os.stat_result]]:
+        """
+        Entries on disk, skipping those removed while listing.
+
+        Returns
+        -------
+        List[Tuple[str, os.stat_result]]
+            Names and stats of `.npz` entries.
+        """
+        entries = []
+        for name in os.listdir(self.cache_fp):
+            if not name.endswith(".npz"):
+                continue
+            try:
+                entries.append((name, os.stat(os.path.join(self.cache_fp, name))))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit and miss counters of the cache.
+
+        Returns
+        -------
+        Dict[str, int]
+            Numbers of hits, misses, entries and bytes on disk.
+        """
+        sizes = [stat.st_size for _, stat in self.entries()]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+        }
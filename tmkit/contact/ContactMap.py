@@ -0,0 +1,291 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ContactMap:
+    """
+    Columnar container of residue contacts predicted by a tool.
+
+    Pairs are held as two int32 residue-id arrays (1-based, as in
+    predictor files) and one score array, so that separation windows,
+    top-k selection and region masks are numpy operations rather than
+    DataFrame filters.
+
+    Parameters
+    ----------
+    id_1 : np.ndarray
+        First residue ids of pairs.
+    id_2 : np.ndarray
+        Second residue ids of pairs.
+    score : np.ndarray
+        Scores of pairs.
+    len_seq : int, optional
+        Length of the sequence, by default the largest residue id.
+    dtype : np.dtype, optional
+        Data type of scores, by default np.float32.
+    """
+
+    def __init__(
+        self,
+        id_1: np.ndarray,
+        id_2: np.ndarray,
+        score: np.ndarray,
+        len_seq: Optional[int] = None,
+        dtype: np.dtype = np.float32,
+    ) -> None:
+        self.id_1 = np.ascontiguousarray(id_1, dtype=np.int32)
+        self.id_2 = np.ascontiguousarray(id_2, dtype=np.int32)
+        self.score = np.ascontiguousarray(score, dtype=dtype)
+        if len_seq is None:
+            len_seq = (
+                int(max(self.id_1.max(), self.id_2.max())) if self.id_1.shape[0] else 0
+            )
+        self.len_seq = int(len_seq)
+
+    def __len__(self) -> int:
+        return self.id_1.shape[0]
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_1: str = "id_1",
+        id_2: str = "id_2",
+        score: str = "score",
+        len_seq: Optional[int] = None,
+        dtype: np.dtype = np.float32,
+    ) -> "ContactMap":
+        """
+        Build a contact map from a dataframe.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            A dataframe of predicted contacts.
+        id_1 : str, optional
+            Column of first residue ids, by default "id_1".
+        id_2 : str, optional
+            Column of second residue ids, by default "id_2".
+        score : str, optional
+            Column of scores, by default "score".
+        len_seq : int, optional
+            Length of the sequence, by default None.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+
+        Returns
+        -------
+        ContactMap
+            A contact map.
+        """
+        return cls(
+            id_1=df[id_1].values,
+            id_2=df[id_2].values,
+            score=df[score].values,
+            len_seq=len_seq,
+            dtype=dtype,
+        )
+
+    def to_frame(
+        self,
+        id_1: str = "id_1",
+        id_2: str = "id_2",
+    ) -> pd.DataFrame:
+        """
+        Convert the contact map to a dataframe.
+
+        Parameters
+        ----------
+        id_1 : str, optional
+            Column name of first residue ids, by default "id_1".
+        id_2 : str, optional
+            Column name of second residue ids, by default "id_2".
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe with columns of residue ids and `score`.
+        """
+        return pd.DataFrame(
+            {
+                id_1: self.id_1.astype(np.int64),
+                id_2: self.id_2.astype(np.int64),
+                "score": self.score,
+            }
+        )
+
+    def select(
+        self,
+        ids: np.ndarray,
+    ) -> "ContactMap":
+        """
+        Take pairs by a boolean mask or by positions.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+            A boolean mask or an array of positions.
+
+        Returns
+        -------
+        ContactMap
+            A contact map of the selected pairs.
+        """
+        return ContactMap(
+            id_1=self.id_1[ids],
+            id_2=self.id_2[ids],
+            score=self.score[ids],
+            len_seq=self.len_seq,
+            dtype=self.score.dtype,
+        )
+
+    def separation(
+        self,
+        seq_sep_inferior: Optional[float] = None,
+        seq_sep_superior: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Mask pairs by sequence separation.
+
+        Notes
+        -----
+            It follows tmkit.position.scenario.Separation:
+            1. only seq_sep_inferior: id_2 - id_1 > seq_sep_inferior.
+            2. only seq_sep_superior: id_2 - id_1 < seq_sep_superior.
+            3. both: seq_sep_inferior < id_2 - id_1 < seq_sep_superior.
+            4. neither: id_2 - id_1 > 0.
+
+        Parameters
+        ----------
+        seq_sep_inferior : float, optional
+            The lower bounds of how far any two residues are in pairs.
+        seq_sep_superior : float, optional
+            The upper bounds of how far any two residues are in pairs.
+
+        Returns
+        -------
+        np.ndarray
+            1d boolean mask.
+        """
+        sep = self.id_2 - self.id_1
+        if seq_sep_inferior is not None and seq_sep_superior is None:
+            return sep > seq_sep_inferior
+        elif seq_sep_inferior is None and seq_sep_superior is not None:
+            return sep < seq_sep_superior
+        elif seq_sep_inferior is not None and seq_sep_superior is not None:
+            return (sep > seq_sep_inferior) & (sep < seq_sep_superior)
+        else:
+            return sep > 0
+
+    def region(
+        self,
+        fas_lower: List[int],
+        fas_upper: List[int],
+        is_inter: bool = True,
+    ) -> np.ndarray:
+        """
+        Mask pairs by segments of a sequence (e.g., transmembrane helices).
+
+        Parameters
+        ----------
+        fas_lower : List[int]
+            Lower bounds of segments in fasta ids.
+        fas_upper : List[int]
+            Upper bounds of segments in fasta ids.
+        is_inter : bool, optional
+            If True, keep pairs whose residues fall in two different
+            segments, as tmkit.position.scenario.Segment does; otherwise keep
+            pairs whose residues both fall in any segment. By default True.
+
+        Returns
+        -------
+        np.ndarray
+            1d boolean mask.
+        """
+        len_seg = max(self.len_seq, int(max(fas_upper, default=0))) + 2
+        seg = np.zeros(len_seg, dtype=np.int32)
+        for i, (lower, upper) in enumerate(zip(fas_lower, fas_upper)):
+            seg[int(lower) : int(upper) + 1] = i + 1
+        seg_1 = seg[np.clip(self.id_1, 0, seg.shape[0] - 1)]
+        seg_2 = seg[np.clip(self.id_2, 0, seg.shape[0] - 1)]
+        mask = (seg_1 > 0) & (seg_2 > 0)
+        if is_inter:
+            mask &= seg_1 != seg_2
+        return mask
+
+    def top(
+        self,
+        k: int,
+        mask: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Positions of the k best-scored pairs, in descending order of scores.
+
+        Notes
+        -----
+            Ties are broken by position, the earlier pair first, so the
+            result equals the head of a stable descending sort.
+
+        Parameters
+        ----------
+        k : int
+            Number of pairs.
+        mask : np.ndarray, optional
+            A boolean mask restricting candidate pairs, by default None.
+
+        Returns
+        -------
+        np.ndarray
+            1d array of positions.
+        """
+        cands = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        k = max(0, min(int(k), cands.shape[0]))
+        if k == 0:
+            return cands[:0]
+        scores = self.score[cands]
+        if k < cands.shape[0]:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = scores > kth
+            tie = np.flatnonzero(scores == kth)[: k - int(above.sum())]
+            keep = np.flatnonzero(above)
+            keep = np.sort(np.concatenate([keep, tie]))
+            cands = cands[keep]
+            scores = scores[keep]
+        return cands[np.argsort(-scores, kind="stable")]
+
+    def dense(
+        self,
+        fill: Union[int, float] = 0,
+        is_symmetric: bool = False,
+    ) -> np.ndarray:
+        """
+        Dense L x L matrix view of scores, indexed by 0-based residue ids.
+
+        Parameters
+        ----------
+        fill : Union[int, float], optional
+            Value of pairs not reported, by default 0.
+        is_symmetric : bool, optional
+            If True, mirror pairs to the lower triangle; otherwise only
+            (id_1, id_2) cells are set, which is the upper triangle for
+            pairs sorted as id_1 < id_2. By default False.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of scores.
+        """
+        mat = np.full((self.len_seq, self.len_seq), fill, dtype=self.score.dtype)
+        mat[self.id_1 - 1, self.id_2 - 1] = self.score
+        if is_symmetric:
+            mat[self.id_2 - 1, self.id_1 - 1] = self.score
+        return mat
@@ -0,0 +1,145 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tmkit.contact.Cache import Cache
+from tmkit.contact.Format import Format
+from tmkit.contact.Join import Join
+
+
+class Ensemble:
+    """
+    Align predictions of several tools for one protein chain on a single
+    index of residue pairs.
+
+    The distance dataframe and the pairs of interest are parsed once by the
+    caller and shared by all tools; each tool then costs one file read and
+    one vectorised lookup.
+
+    Parameters
+    ----------
+    dist_df : pd.DataFrame
+        A dataframe of distances of residue pairs (see tmkit.structure.rrc.Label).
+    pair_list : List
+        Pairs of interest whose first two items are residue ids.
+    cache : Cache, optional
+        An on-disk cache of parsed predictor files, by default None.
+    """
+
+    def __init__(
+        self,
+        dist_df: pd.DataFrame,
+        pair_list: List,
+        cache: Optional[Cache] = None,
+    ) -> None:
+        self.join = Join()
+        self.format = Format(cache=cache)
+        self.dist_df = dist_df
+        pair_df = pd.DataFrame(pair_list)
+        if pair_df.shape[0] == 0:
+            self.pairs = np.zeros((0, 2), dtype=np.int32)
+            self.dist_ids = np.zeros(0, dtype=np.int64)
+        else:
+            dist_ids = self.join.index(
+                ref_1=dist_df["fasta_id_1"].values.astype(np.int64),
+                ref_2=dist_df["fasta_id_2"].values.astype(np.int64),
+                query_1=pair_df[0].values,
+                query_2=pair_df[1].values,
+            )
+            hit = dist_ids >= 0
+            self.pairs = pair_df.iloc[:, :2].values[hit].astype(np.int32)
+            self.dist_ids = dist_ids[hit]
+
+    def label(self) -> pd.DataFrame:
+        """
+        Distance rows of the shared pair index.
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of the distance dataframe, one per pair of `pairs`.
+        """
+        dist_df = self.dist_df.iloc[self.dist_ids]
+        dist_df.columns = self.join.dist_columns
+        return dist_df.reset_index(inplace=False, drop=True)
+
+    def score(
+        self,
+        tool: str,
+        fpn: str,
+        fill: Union[int, float] = 0,
+    ) -> np.ndarray:
+        """
+        Scores of a tool on the shared pair index.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor (see tmkit.contact.Format).
+        fpn : str
+            Path to the predictor file.
+        fill : Union[int, float], optional
+            Score of pairs that the predictor does not report, by default 0.
+
+        Returns
+        -------
+        np.ndarray
+            1d float64 array of scores.
+        """
+        cmap = self.format.read(tool, fpn, dtype=np.float64)
+        pred_ids = self.join.index(
+            ref_1=cmap.id_1,
+            ref_2=cmap.id_2,
+            query_1=self.pairs[:, 0],
+            query_2=self.pairs[:, 1],
+        )
+        score = np.full(pred_ids.shape[0], fill, dtype=np.float64)
+        hit = pred_ids >= 0
+        score[hit] = cmap.score[pred_ids[hit]]
+        return score
+
+    def read(
+        self,
+        tools: List[str],
+        tool_fp: str,
+        file_name: str,
+        file_chain: str,
+        fill: Union[int, float] = 0,
+    ) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+        """
+        Read all tools of a protein chain onto the shared pair index.
+
+        Parameters
+        ----------
+        tools : List[str]
+            Names of predictors (see tmkit.contact.Format).
+        tool_fp : str
+            Path where predictor files are placed, named as
+            file_name + file_chain + suffix of the tool (e.g., 1xqfA.membrain2).
+        file_name : str
+            Name of a protein (e.g., 1xqf).
+        file_chain : str
+            Chain of a protein (e.g., A).
+        fill : Union[int, float], optional
+            Score of pairs that a predictor does not report, by default 0.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, pd.DataFrame]
+            A tools x pairs array of scores, a pairs x 2 array of residue
+            ids and the distance rows of the pairs (with `dist` and
+            `is_contact`).
+        """
+        scores = np.empty((len(tools), self.pairs.shape[0]), dtype=np.float64)
+        for i, tool in enumerate(tools):
+            fpn = tool_fp + file_name + file_chain + self.format.spec(tool)["suffix"]
+            scores[i] = self.score(tool, fpn, fill=fill)
+        return scores, self.pairs, self.label()
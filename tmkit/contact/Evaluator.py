@@ -9,8 +9,10 @@ from typing import Dict, List, Union
 
 import numpy as np
 import pandas as pd
-from sklearn import metrics
 
+from tmkit.contact.Join import Join
+from tmkit.contact.Metric import Metric
+from tmkit.contact.ProteinContext import ProteinContext
 from tmkit.contact.Reader import Reader as rrcreader
 
 
@@ -19,14 +21,15 @@ class evaluator:
         self,
         prot_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame,
-        pair_list: List,
+        dist_df: Union[pd.DataFrame, None] = None,
+        pair_list: Union[List, None] = None,
         dist_limit: Union[float, None] = None,
         tool: Union[str, None] = None,
         tool_fp: Union[str, None] = None,
         sort_: Union[int, None] =None,
         seq_sep_inferior: Union[int, None] = None,
         seq_sep_superior: Union[int, None] = None,
+        context: Union[ProteinContext, None] = None,
     ) -> None:
         """
         Initializes the evaluator.
@@ -37,10 +40,10 @@ class evaluator:
             The name of the protein.
         file_chain : str
             The file chain.
-        dist_df : pd.DataFrame
-            The dataframe with distance information.
-        pair_list : list
-            The list of pairs.
+        dist_df : pd.DataFrame or None, optional
+            The dataframe with distance information, by default taken from `context`.
+        pair_list : list or None, optional
+            The list of pairs, by default taken from `context`.
         dist_limit : int or None, optional
             The distance limit, by default None.
         tool : str or None, optional
@@ -53,6 +56,8 @@ class evaluator:
             The inferior sequence separation, by default None.
         seq_sep_superior : int or None, optional
             The superior sequence separation, by default None.
+        context : ProteinContext or None, optional
+            Parsed inputs of the protein chain shared across evaluators, by default None.
         """
         self.tool_fp = tool_fp
         self.prot_name = prot_name
@@ -67,6 +72,17 @@ class evaluator:
             seq_sep_inferior=self.seq_sep_inferior,
             seq_sep_superior=self.seq_sep_superior,
         )
+        self.metric = Metric()
+        self.context = context
+        if self.context is None and (dist_df is None or pair_list is None):
+            raise ValueError("Either `dist_df` and `pair_list` or `context` should be given.")
+        if dist_df is None:
+            dist_df = self.context.dist(
+                seq_sep_inferior=0,
+                seq_sep_superior=self.seq_sep_superior,
+            )
+        if pair_list is None:
+            self.pair_list = self.context.pair_list()
         self.dist_df = dist_df
         self.dist_df.columns = [
             "fasta_id_1",
@@ -121,54 +137,156 @@ class evaluator:
         dict
             The summary of the metrics.
         """
+        metrics_summary = self.compare_cutoffs(target, cut_offs=[cut_off]).iloc[0]
+        metrics_summary = {
+            "precision": metrics_summary["precision"],
+            "recall": metrics_summary["recall"],
+            "f1score": metrics_summary["f1score"],
+            "mcc": metrics_summary["mcc"],
+            "accuracy": metrics_summary["accuracy"],
+        }
+        print(f"=========>precision: {metrics_summary['precision']}")
+        print(f"=========>recall: {metrics_summary['recall']}")
+        print(f"=========>mcc: {metrics_summary['mcc']}")
+        print(f"=========>f1score: {metrics_summary['f1score']}")
+        print(f"=========>accuracy: {metrics_summary['accuracy']}")
+        return metrics_summary
+
+    def compare_cutoffs(
+        self,
+        target: pd.DataFrame,
+        cut_offs: Union[List[Union[int, str]], None] = None,
+        len_seq: Union[int, None] = None,
+    ) -> pd.DataFrame:
+        """
+        Compares the target with several cutoffs in one pass.
+
+        Notes
+        -----
+            Pairs are sorted by `score` once; the top-k pairs are taken as
+            predicted contacts for each cutoff k and their confusion counts
+            are read off cumulative sums of the labels.
+
+        Parameters
+        ----------
+        target : pd.DataFrame
+            The target dataframe (see `fetch`).
+        cut_offs : List[Union[int, str]], optional
+            Numbers of top pairs, either int or a fraction of the sequence
+            length written as "L", "L/2", "L/5", etc., by default
+            ["L/10", "L/5", "L/2", "L"].
+        len_seq : int or None, optional
+            Length of the sequence used by "L" cutoffs, by default the
+            largest Fasta id in the distance dataframe.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row of metrics per cutoff.
+        """
+        if cut_offs is None:
+            cut_offs = ["L/10", "L/5", "L/2", "L"]
         # #/*** block fetch target results ***/
         res_sorted = target.sort_values(["score"], ascending=False)
-        # self.pfwwriter.generic(res_sorted, sv_fpn='./cheers')
-        res_cutoff = res_sorted.iloc[0:cut_off, :]
-        new_index = np.arange(res_cutoff.shape[0])
-        res_cutoff = res_cutoff.set_index(new_index, inplace=False, drop=True)
-        # print(res_cutoff)
-        row_cutoff = res_cutoff.shape[0]
-        row_offset = target.shape[0] - row_cutoff
-        # #/*** block y_true_cutoff ***/
-        y_true_cutoff = []
-        for i in range(row_cutoff):
-            conid1 = self.dist_df["fasta_id_1"] == res_cutoff["fasta_id_1"][i]
-            conid2 = self.dist_df["fasta_id_2"] == res_cutoff["fasta_id_2"][i]
-            juery = (conid1) & (conid2)
-            tmp = self.dist_df.loc[juery]
-            y_true_cutoff.append(tmp["is_contact"].sum())
         # #/*** block y_true_all ***/
-        y_true_all = list(res_sorted["is_contact"])
-        # #/*** block y_pred_all ***/
-        y_pred_all = list(
-            np.concatenate(
-                [np.zeros([row_cutoff]) + 1, np.zeros([row_offset])], axis=0
-            ).astype(np.int64)
+        y_true = self.label(res_sorted).astype(np.float64).astype(np.int64)
+        num = y_true.shape[0]
+        num_pos = int(y_true.sum())
+        tp_cum = np.concatenate([[0], np.cumsum(y_true)])
+        if len_seq is None:
+            len_seq = int(self.dist_df["fasta_id_2"].astype(np.float64).max())
+        summary = []
+        for cut_off in cut_offs:
+            row_cutoff = min(self.topk(cut_off, len_seq), num)
+            tp = int(tp_cum[row_cutoff])
+            fp = row_cutoff - tp
+            fn = num_pos - tp
+            tn = num - row_cutoff - fn
+            summary.append({
+                "cut_off": cut_off,
+                "top": row_cutoff,
+                "tp": tp,
+                "fp": fp,
+                "tn": tn,
+                "fn": fn,
+                **self.metric.binary(tp=tp, fp=fp, tn=tn, fn=fn),
+            })
+        return pd.DataFrame(summary)
+
+    def label(self, target: pd.DataFrame) -> np.ndarray:
+        """
+        Labels of predicted pairs.
+
+        Notes
+        -----
+            Labels are taken from `is_contact` of the target if it exists;
+            otherwise they are looked up in the distance dataframe by one
+            join on residue ids.
+
+        Parameters
+        ----------
+        target : pd.DataFrame
+            The target dataframe.
+
+        Returns
+        -------
+        np.ndarray
+            1d array of labels.
+        """
+        if "is_contact" in target.columns:
+            return target["is_contact"].values
+        dist_ids = Join().index(
+            ref_1=self.dist_df["fasta_id_1"].values.astype(np.int64),
+            ref_2=self.dist_df["fasta_id_2"].values.astype(np.int64),
+            query_1=target["contact_id_1"].values,
+            query_2=target["contact_id_2"].values,
         )
-        # #/*** block precision ***/
-        precision = metrics.precision_score(y_true=y_true_all, y_pred=y_pred_all)
-        print(f"=========>precision: {precision}")
-        # #/*** block recall ***/
-        recall = metrics.recall_score(y_true=y_true_all, y_pred=y_pred_all)
-        print(f"=========>recall: {recall}")
-        # #/*** block mcc ***/
-        mcc = metrics.matthews_corrcoef(y_true=y_true_all, y_pred=y_pred_all)
-        print(f"=========>mcc: {mcc}")
-        # #/*** block f1score ***/
-        f1score = metrics.f1_score(y_true=y_true_all, y_pred=y_pred_all)
-        print(f"=========>f1score: {f1score}")
-        # #/*** block accuracy ***/
-        accuracy = metrics.accuracy_score(y_true=y_true_all, y_pred=y_pred_all)
-        print(f"=========>accuracy: {accuracy}")
-        metrics_summary = {
-            "precision": precision,
-            "recall": recall,
-            "f1score": f1score,
-            "mcc": mcc,
-            "accuracy": accuracy,
-        }
-        return metrics_summary
+        labels = np.zeros(dist_ids.shape[0], dtype=np.float64)
+        labels[dist_ids >= 0] = self.dist_df["is_contact"].values[dist_ids[dist_ids >= 0]]
+        return labels
+
+    def topk(self, cut_off: Union[int, str], len_seq: int) -> int:
+        """
+        Number of top pairs of a cutoff.
+
+        Parameters
+        ----------
+        cut_off : Union[int, str]
+            An int or a fraction of the sequence length such as "L/5".
+        len_seq : int
+            Length of the sequence.
+
+        Returns
+        -------
+        int
+            Number of top pairs.
+        """
+        if isinstance(cut_off, str):
+            num, _, den = cut_off.replace(" ", "").partition("/")
+            if num != "L":
+                raise ValueError(
+                    "`cut_off` has yet to reach there.",
+                    "| It can be an int or one of L, L/2, L/5, L/10, etc.",
+                )
+            return int(len_seq / float(den)) if den else int(len_seq)
+        return int(cut_off)
+
+    def rank(self, target: pd.DataFrame) -> Dict[str, float]:
+        """
+        Ranking metrics of the target over all of its pairs.
+
+        Parameters
+        ----------
+        target : pd.DataFrame
+            The target dataframe (see `fetch`).
+
+        Returns
+        -------
+        dict
+            AUPRC and ROC-AUC.
+        """
+        y_true = self.label(target).astype(np.float64).astype(np.int64)
+        return self.metric.ranking(y_true, target["score"].values)
 
     def psicov(self) -> pd.DataFrame:
         """
@@ -0,0 +1,458 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, Iterator, Optional
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from tmkit.contact.Cache import Cache
+from tmkit.contact.ContactMap import ContactMap
+
+
+class Format:
+    """
+    Adapters parsing files of residue contact predictors into a ContactMap.
+
+    Each predictor is described by where its columns sit rather than by a
+    dedicated parser:
+
+        suffix: file suffix used by tmkit.contact.Reader.
+        usecols: positions of the first residue id, the second residue id
+            and the score, in ascending order.
+        sep: column separator, by default whitespace.
+        header: row of column names, by default None.
+        marker: (position, token) of the line right above the contacts, for
+            files with a free-text preamble.
+        kind: "list" for one pair per line, "matrix" for an L x L matrix.
+    """
+
+    def __init__(
+        self,
+        is_mmap: bool = False,
+        cache: Optional[Cache] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        is_mmap : bool, optional
+            If True, matrix files are cached as memory-mapped `.npy`
+            sidecars (see `load_matrix`), by default False.
+        cache : Cache, optional
+            An on-disk cache of parsed files, by default None.
+        """
+        self.is_mmap = is_mmap
+        self.cache = cache
+        self.specs: Dict[str, Dict] = {
+            "mi": {"suffix": ".evfold", "usecols": [0, 2, 4]},
+            "psicov": {"suffix": ".psicov", "usecols": [0, 1, 4]},
+            "freecontact": {"suffix": ".evfold", "usecols": [0, 2, 5]},
+            "ccmpred": {"suffix": ".ccmpred", "kind": "matrix"},
+            "gremlin": {"suffix": ".gremlin", "usecols": [0, 1, 6], "header": 0},
+            "gdca": {"suffix": ".gdca", "usecols": [0, 1, 2]},
+            "plmc": {"suffix": ".plmc", "usecols": [0, 2, 5]},
+            "memconp": {
+                "suffix": ".memconp",
+                "usecols": [1, 2, 3],
+                "marker": (0, "RESTHRESH"),
+            },
+            "membrain2": {
+                "suffix": ".membrain2",
+                "usecols": [2, 5, 7],
+                "marker": (2, "contacts:"),
+            },
+            "deephelicon": {"suffix": ".tma165", "usecols": [0, 2, 4], "sep": "\t"},
+            "general": {"suffix": "", "usecols": [0, 1, 2]},
+        }
+        self.specs["tma165"] = self.specs["deephelicon"]
+
+    def spec(self, tool: str) -> Dict:
+        """
+        Format specification of a predictor.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor.
+
+        Returns
+        -------
+        Dict
+            Format specification.
+
+        Raises
+        ------
+        ValueError
+            If the predictor is not supported.
+        """
+        if tool not in self.specs:
+            raise ValueError(
+                "`tool` has yet to reach there.",
+                "| It can be one of " + ", ".join([*self.specs.keys()]),
+            )
+        return self.specs[tool]
+
+    def skip(self, fpn: str, marker) -> int:
+        """
+        Number of lines up to and including the marker line of a file.
+
+        Parameters
+        ----------
+        fpn : str
+            Path to a predictor file.
+        marker : Tuple[int, str]
+            Position and token of the marker line.
+
+        Returns
+        -------
+        int
+            Number of lines to skip.
+
+        Raises
+        ------
+        ValueError
+            If no marker line is found.
+        """
+        pos, token = marker
+        with open(fpn) as file:
+            for i, line in enumerate(file):
+                cols = line.split()
+                if len(cols) > pos and cols[pos] == token:
+                    return i + 1
+        raise ValueError(f"No line with {token} is found in {fpn}.")
+
+    def read(
+        self,
+        tool: str,
+        fpn: str,
+        dtype: np.dtype = np.float32,
+        len_seq: Optional[int] = None,
+    ) -> ContactMap:
+        """
+        Read a predictor file into a contact map.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor.
+        fpn : str
+            Path to a predictor file.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+        len_seq : int, optional
+            Length of the sequence, by default None.
+
+        Returns
+        -------
+        ContactMap
+            Predicted contacts.
+        """
+        if self.cache is None:
+            return self.parse(tool, fpn, dtype=dtype, len_seq=len_seq)
+        key = self.cache.key(fpn, tool=tool, dtype=dtype)
+        cmap = self.cache.get(key, len_seq=len_seq)
+        if cmap is None:
+            cmap = self.parse(tool, fpn, dtype=dtype, len_seq=len_seq)
+            self.cache.put(key, cmap)
+        return cmap
+
+    def parse(
+        self,
+        tool: str,
+        fpn: str,
+        dtype: np.dtype = np.float32,
+        len_seq: Optional[int] = None,
+    ) -> ContactMap:
+        """
+        Parse a predictor file into a contact map, bypassing the cache.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor.
+        fpn : str
+            Path to a predictor file.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+        len_seq : int, optional
+            Length of the sequence, by default None.
+
+        Returns
+        -------
+        ContactMap
+            Predicted contacts.
+        """
+        spec = self.spec(tool)
+        if spec.get("kind", "list") == "matrix":
+            cmap = self.matrix(fpn, dtype=dtype)
+            if len_seq is not None:
+                cmap.len_seq = int(len_seq)
+            return cmap
+        df = pd.read_csv(
+            fpn,
+            sep=spec.get("sep", r"\s+"),
+            header=spec.get("header", None),
+            skiprows=self.skip(fpn, spec["marker"]) if "marker" in spec else None,
+            comment=None if "marker" in spec else "#",
+            usecols=spec["usecols"],
+            engine="c",
+        )
+        return ContactMap(
+            id_1=df.iloc[:, 0].values,
+            id_2=df.iloc[:, 1].values,
+            score=df.iloc[:, 2].values,
+            len_seq=len_seq,
+            dtype=dtype,
+        )
+
+    def matrix(
+        self,
+        fpn: str,
+        dtype: np.dtype = np.float32,
+    ) -> ContactMap:
+        """
+        Read an L x L score matrix (e.g., CCMPred) into a contact map of
+        pairs i < j.
+
+        Parameters
+        ----------
+        fpn : str
+            Path to a matrix file.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+
+        Returns
+        -------
+        ContactMap
+            Predicted contacts.
+        """
+        mat = self.load_matrix(fpn, dtype=dtype)
+        id_1, id_2 = np.triu_indices(mat.shape[0], k=1)
+        return ContactMap(
+            id_1=id_1 + 1,
+            id_2=id_2 + 1,
+            score=mat[id_1, id_2],
+            len_seq=mat.shape[0],
+            dtype=dtype,
+        )
+
+    def load_matrix(
+        self,
+        fpn: str,
+        dtype: np.dtype = np.float32,
+    ) -> np.ndarray:
+        """
+        Load an L x L score matrix as an ndarray.
+
+        Notes
+        -----
+            If `is_mmap` is on, the matrix is also saved to a `.npy`
+            sidecar next to the file (i.e., fpn + ".npy") at the first
+            read, and later reads memory-map the sidecar instead of
+            parsing text again. A sidecar older than the file, or with
+            narrower scores than asked for, is rebuilt. A sidecar that
+            cannot be read or written (e.g., in a read-only directory) is
+            skipped and the file is parsed.
+
+        Parameters
+        ----------
+        fpn : str
+            Path to a matrix file.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of scores.
+        """
+        dtype = np.dtype(dtype)
+        sidecar = fpn + ".npy"
+        if (
+            self.is_mmap
+            and os.path.exists(sidecar)
+            and os.path.getmtime(sidecar) >= os.path.getmtime(fpn)
+        ):
+            try:
+                mat = np.load(sidecar, mmap_mode="r")
+            except (OSError, ValueError):
+                ### unreadable sidecar; parse the file instead
+                mat = None
+            if mat is not None and mat.dtype == dtype:
+                return mat
+            if mat is not None and mat.dtype.itemsize > dtype.itemsize:
+                return mat.astype(dtype)
+        mat = pd.read_csv(
+            fpn,
+            sep=r"\s+",
+            header=None,
+            comment="#",
+            dtype=dtype,
+            engine="c",
+        ).to_numpy()
+        if self.is_mmap:
+            ### written aside and renamed, so other processes never open a
+            ### partial sidecar; a read-only directory just skips it
+            try:
+                handle, tmp = tempfile.mkstemp(
+                    suffix=".tmp", dir=os.path.dirname(os.path.abspath(fpn))
+                )
+            except OSError:
+                return mat
+            try:
+                with os.fdopen(handle, "wb") as file:
+                    np.save(file, mat)
+                os.replace(tmp, sidecar)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return mat
+
+    def stream(
+        self,
+        tool: str,
+        fpn: str,
+        k: int,
+        seq_sep_inferior: Optional[float] = None,
+        seq_sep_superior: Optional[float] = None,
+        dtype: np.dtype = np.float32,
+        chunksize: int = 1 << 18,
+        len_seq: Optional[int] = None,
+    ) -> ContactMap:
+        """
+        Scan a predictor file in chunks and keep its k best-scored pairs
+        within a sequence-separation band.
+
+        Notes
+        -----
+            Only the k pairs kept so far and one chunk are held in memory
+            at a time, instead of the whole file. The result is the same
+            as reading the whole file, masking it by `separation` and
+            taking `top(k)`.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor.
+        fpn : str
+            Path to a predictor file.
+        k : int
+            Number of pairs to keep.
+        seq_sep_inferior : float, optional
+            The lower bounds of how far any two residues are in pairs.
+        seq_sep_superior : float, optional
+            The upper bounds of how far any two residues are in pairs.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+        chunksize : int, optional
+            Number of lines per chunk, by default 262144.
+        len_seq : int, optional
+            Length of the sequence, by default None.
+
+        Returns
+        -------
+        ContactMap
+            The k best-scored pairs, in descending order of scores.
+        """
+        spec = self.spec(tool)
+        if spec.get("kind", "list") == "matrix":
+            chunks = self.stream_matrix(fpn, dtype=dtype, chunksize=chunksize)
+        else:
+            chunks = (
+                ContactMap(
+                    id_1=df.iloc[:, 0].values,
+                    id_2=df.iloc[:, 1].values,
+                    score=df.iloc[:, 2].values,
+                    len_seq=None,
+                    dtype=dtype,
+                )
+                for df in pd.read_csv(
+                    fpn,
+                    sep=spec.get("sep", r"\s+"),
+                    header=spec.get("header", None),
+                    skiprows=(
+                        self.skip(fpn, spec["marker"]) if "marker" in spec else None
+                    ),
+                    comment=None if "marker" in spec else "#",
+                    usecols=spec["usecols"],
+                    engine="c",
+                    chunksize=chunksize,
+                )
+            )
+        best = ContactMap(id_1=[], id_2=[], score=[], len_seq=0, dtype=dtype)
+        len_max = 0
+        for chunk in chunks:
+            len_max = max(len_max, chunk.len_seq)
+            chunk = chunk.select(chunk.separation(seq_sep_inferior, seq_sep_superior))
+            ### kept pairs go first so that ties resolve to the earlier line
+            best = ContactMap(
+                id_1=np.concatenate([best.id_1, chunk.id_1]),
+                id_2=np.concatenate([best.id_2, chunk.id_2]),
+                score=np.concatenate([best.score, chunk.score]),
+                len_seq=0,
+                dtype=dtype,
+            )
+            best = best.select(best.top(k))
+        best.len_seq = int(len_max if len_seq is None else len_seq)
+        return best
+
+    def stream_matrix(
+        self,
+        fpn: str,
+        dtype: np.dtype = np.float32,
+        chunksize: int = 1 << 18,
+    ) -> Iterator[ContactMap]:
+        """
+        Yield pairs i < j of an L x L score matrix, a block of rows at a time.
+
+        Parameters
+        ----------
+        fpn : str
+            Path to a matrix file.
+        dtype : np.dtype, optional
+            Data type of scores, by default np.float32.
+        chunksize : int, optional
+            Approximate number of matrix cells per block, by default 262144.
+
+        Yields
+        ------
+        ContactMap
+            Pairs of a block of rows.
+        """
+        with open(fpn) as file:
+            for line in file:
+                if line.strip() and not line.startswith("#"):
+                    len_seq = len(line.split())
+                    break
+            else:
+                return
+        row = 0
+        for df in pd.read_csv(
+            fpn,
+            sep=r"\s+",
+            header=None,
+            comment="#",
+            dtype=dtype,
+            engine="c",
+            chunksize=max(1, chunksize // len_seq),
+        ):
+            block = df.to_numpy()
+            id_1, id_2 = np.nonzero(
+                np.arange(len_seq)[None, :]
+                > np.arange(row, row + block.shape[0])[:, None]
+            )
+            yield ContactMap(
+                id_1=id_1 + row + 1,
+                id_2=id_2 + 1,
+                score=block[id_1, id_2],
+                len_seq=len_seq,
+                dtype=dtype,
+            )
+            row += block.shape[0]
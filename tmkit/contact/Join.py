@@ -0,0 +1,263 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class Join:
+    """
+    Join engine matching residue pairs across tables by int64 pair keys.
+
+    A residue pair (id_1, id_2) is encoded as ``id_1 * base + id_2``, where
+    ``base`` exceeds every residue id involved. Lookups are then resolved by
+    sorting the keys of a reference table once and querying them with
+    ``np.searchsorted`` instead of walking nested dictionaries pair by pair.
+
+    Parameters
+    ----------
+    id_1 : str, optional
+        Column holding the first residue id of a predictor table, by default "contact_id_1".
+    id_2 : str, optional
+        Column holding the second residue id of a predictor table, by default "contact_id_2".
+    """
+
+    def __init__(
+        self,
+        id_1: str = "contact_id_1",
+        id_2: str = "contact_id_2",
+    ) -> None:
+        self.id_1 = id_1
+        self.id_2 = id_2
+        self.dist_columns = [
+            "fasta_id_1",
+            "aa_1",
+            "pdb_id_1",
+            "fasta_id_2",
+            "aa_2",
+            "pdb_id_2",
+            "dist",
+            "is_contact",
+        ]
+
+    def key(
+        self,
+        id_1: np.ndarray,
+        id_2: np.ndarray,
+        base: int,
+    ) -> np.ndarray:
+        """
+        Encode residue pairs as int64 keys.
+
+        Parameters
+        ----------
+        id_1 : np.ndarray
+            First residue ids.
+        id_2 : np.ndarray
+            Second residue ids.
+        base : int
+            A number greater than any residue id.
+
+        Returns
+        -------
+        np.ndarray
+            1d int64 array of pair keys.
+        """
+        return np.asarray(id_1).astype(np.int64) * base + np.asarray(id_2).astype(
+            np.int64
+        )
+
+    def index(
+        self,
+        ref_1: np.ndarray,
+        ref_2: np.ndarray,
+        query_1: np.ndarray,
+        query_2: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Locate query pairs in a reference table.
+
+        Notes
+        -----
+            If a pair occurs more than once in the reference table, its
+            last occurrence is taken, which is what a dictionary built
+            by `tactic1` over the same rows would hold.
+
+        Parameters
+        ----------
+        ref_1 : np.ndarray
+            First residue ids of the reference table.
+        ref_2 : np.ndarray
+            Second residue ids of the reference table.
+        query_1 : np.ndarray
+            First residue ids of the pairs to look up.
+        query_2 : np.ndarray
+            Second residue ids of the pairs to look up.
+
+        Returns
+        -------
+        np.ndarray
+            Row positions in the reference table, -1 for pairs not found.
+        """
+        ref_1 = np.asarray(ref_1).astype(np.int64)
+        ref_2 = np.asarray(ref_2).astype(np.int64)
+        query_1 = np.asarray(query_1).astype(np.int64)
+        query_2 = np.asarray(query_2).astype(np.int64)
+        if ref_1.shape[0] == 0 or query_1.shape[0] == 0:
+            return np.full(query_1.shape[0], -1, dtype=np.int64)
+        base = int(max(ref_1.max(), ref_2.max(), query_1.max(), query_2.max())) + 1
+        ref_key = self.key(ref_1, ref_2, base)
+        query_key = self.key(query_1, query_2, base)
+        order = np.argsort(ref_key, kind="stable")
+        ref_key_sorted = ref_key[order]
+        pos = np.searchsorted(ref_key_sorted, query_key, side="right") - 1
+        pos_ = np.clip(pos, 0, None)
+        hit = (pos >= 0) & (ref_key_sorted[pos_] == query_key)
+        return np.where(hit, order[pos_], -1)
+
+    def sort_1(
+        self,
+        recombine: pd.DataFrame,
+        dist_df: pd.DataFrame,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Fetch the distance rows of all predicted pairs.
+
+        Parameters
+        ----------
+        recombine : pd.DataFrame
+            Results of a predictor.
+        dist_df : pd.DataFrame
+            A dataframe of distances of residue pairs.
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, pd.DataFrame]
+            Results of a predictor and their distances, row by row.
+
+        Raises
+        ------
+        KeyError
+            If a predicted pair is absent from the distance dataframe.
+        """
+        dists_ = dist_df
+        dists_["fasta_id_1"] = dists_["fasta_id_1"].astype(int)
+        dists_["fasta_id_2"] = dists_["fasta_id_2"].astype(int)
+        dist_ids = self.index(
+            ref_1=dists_["fasta_id_1"].values,
+            ref_2=dists_["fasta_id_2"].values,
+            query_1=recombine[self.id_1].values,
+            query_2=recombine[self.id_2].values,
+        )
+        if (dist_ids < 0).any():
+            miss = int(np.argmax(dist_ids < 0))
+            raise KeyError(
+                (recombine[self.id_1].values[miss], recombine[self.id_2].values[miss])
+            )
+        recombine_dist = dists_.iloc[dist_ids]
+        recombine_dist.columns = self.dist_columns
+        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
+        return recombine, recombine_dist
+
+    def sort_2(
+        self,
+        recombine: pd.DataFrame,
+        dist_df: pd.DataFrame,
+        pair_df: pd.DataFrame,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Fetch predictor and distance rows of given pairs of interest.
+
+        Notes
+        -----
+            Pairs are kept in the order of `pair_df` and only when they
+            are found both in the predictor results and in the distance
+            dataframe, so the two outputs stay aligned row by row.
+
+        Parameters
+        ----------
+        recombine : pd.DataFrame
+            Results of a predictor.
+        dist_df : pd.DataFrame
+            A dataframe of distances of residue pairs.
+        pair_df : pd.DataFrame
+            A dataframe of pairs whose first two columns are residue ids.
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, pd.DataFrame]
+            Results of a predictor and distances of the pairs of interest.
+        """
+        query_1 = pair_df[0].values
+        query_2 = pair_df[1].values
+        pred_ids = self.index(
+            ref_1=recombine[self.id_1].values,
+            ref_2=recombine[self.id_2].values,
+            query_1=query_1,
+            query_2=query_2,
+        )
+        dist_ids = self.index(
+            ref_1=dist_df["fasta_id_1"].values,
+            ref_2=dist_df["fasta_id_2"].values,
+            query_1=query_1,
+            query_2=query_2,
+        )
+        hit = (pred_ids >= 0) & (dist_ids >= 0)
+        recombine_pred = recombine.iloc[pred_ids[hit]]
+        recombine_pred.columns = [self.id_1, self.id_2, "score"]
+        recombine_pred = recombine_pred.reset_index(inplace=False, drop=True)
+        recombine_dist = dist_df.iloc[dist_ids[hit]]
+        recombine_dist.columns = self.dist_columns
+        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
+        return recombine_pred, recombine_dist
+
+    def uniform(
+        self,
+        recombine: pd.DataFrame,
+        uniform_df: pd.DataFrame,
+        indicator: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Project predictor scores onto a given list of pairs.
+
+        Parameters
+        ----------
+        recombine : pd.DataFrame
+            Results of a predictor.
+        uniform_df : pd.DataFrame
+            A dataframe of pairs whose first two columns are residue ids.
+        indicator : int, optional
+            Score of pairs that the predictor does not report, by default 0.
+
+        Returns
+        -------
+        pd.DataFrame
+            The pairs of `uniform_df` with their scores.
+        """
+        if uniform_df.shape[0] == 0:
+            return pd.DataFrame(columns=[self.id_1, self.id_2, "score"])
+        query_1 = uniform_df[0].values
+        query_2 = uniform_df[1].values
+        pred_ids = self.index(
+            ref_1=recombine.iloc[:, 0].values,
+            ref_2=recombine.iloc[:, 1].values,
+            query_1=query_1,
+            query_2=query_2,
+        )
+        hit = pred_ids >= 0
+        scores = recombine.iloc[:, 2].values
+        score = np.full(pred_ids.shape[0], indicator, dtype=np.float64)
+        score[hit] = scores[pred_ids[hit]]
+        return pd.DataFrame(
+            {
+                self.id_1: query_1,
+                self.id_2: query_2,
+                "score": score,
+            }
+        )
@@ -0,0 +1,284 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class Metric:
+    """
+    Metrics of residue contact predictions computed from numpy arrays.
+
+    Binary metrics are derived from one set of confusion counts, and ranking
+    metrics from one pass of cumulative counts over scores sorted in
+    descending order, without building a confusion matrix per metric.
+    """
+
+    def counts(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+    ) -> Tuple[int, int, int, int]:
+        """
+        Confusion counts of binary predictions.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels (1 for contacts, 0 otherwise).
+        y_pred : np.ndarray
+            1d array of predictions (1 for contacts, 0 otherwise).
+
+        Returns
+        -------
+        Tuple[int, int, int, int]
+            Numbers of true positives, false positives, true negatives and
+            false negatives.
+        """
+        y_true = np.asarray(y_true).astype(bool)
+        y_pred = np.asarray(y_pred).astype(bool)
+        tp = int(np.count_nonzero(y_true & y_pred))
+        fp = int(np.count_nonzero(y_pred)) - tp
+        fn = int(np.count_nonzero(y_true)) - tp
+        tn = y_true.shape[0] - tp - fp - fn
+        return tp, fp, tn, fn
+
+    def binary(
+        self,
+        tp: int,
+        fp: int,
+        tn: int,
+        fn: int,
+    ) -> Dict[str, float]:
+        """
+        Metrics of binary predictions from their confusion counts.
+
+        Notes
+        -----
+            A metric whose denominator is zero is 0, as sklearn reports
+            with zero_division=0.
+
+        Parameters
+        ----------
+        tp : int
+            Number of true positives.
+        fp : int
+            Number of false positives.
+        tn : int
+            Number of true negatives.
+        fn : int
+            Number of false negatives.
+
+        Returns
+        -------
+        Dict[str, float]
+            Precision, recall, f1score, mcc and accuracy.
+        """
+        num = tp + fp + tn + fn
+        mcc_den = np.sqrt(float(tp + fp) * (tp + fn) * (tn + fp) * (tn + fn))
+        return {
+            "precision": tp / (tp + fp) if tp + fp else 0.0,
+            "recall": tp / (tp + fn) if tp + fn else 0.0,
+            "f1score": 2 * tp / (2 * tp + fp + fn) if tp else 0.0,
+            "mcc": (float(tp) * tn - float(fp) * fn) / mcc_den if mcc_den else 0.0,
+            "accuracy": (tp + tn) / num if num else 0.0,
+        }
+
+    def curve(
+        self,
+        y_true: np.ndarray,
+        y_score: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cumulative true and false positives at each distinct score threshold.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels.
+        y_score : np.ndarray
+            1d array of scores.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            True positives, false positives and thresholds, in descending
+            order of thresholds. Tied scores share one threshold.
+        """
+        y_true = np.asarray(y_true).astype(bool)
+        y_score = np.asarray(y_score, dtype=np.float64)
+        order = np.argsort(-y_score, kind="stable")
+        y_score = y_score[order]
+        y_true = y_true[order]
+        ### last position of each run of tied scores
+        ends = np.r_[np.flatnonzero(np.diff(y_score)), y_true.shape[0] - 1]
+        tps = np.cumsum(y_true)[ends]
+        fps = ends + 1 - tps
+        return tps, fps, y_score[ends]
+
+    def precision_at_k(
+        self,
+        y_true: np.ndarray,
+        y_score: Optional[np.ndarray] = None,
+        ks: Optional[List[int]] = None,
+    ) -> np.ndarray:
+        """
+        Precision of the top-k pairs for several k at once.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels, already ranked if `y_score` is None.
+        y_score : np.ndarray, optional
+            1d array of scores used to rank pairs, by default None.
+        ks : List[int], optional
+            Numbers of top pairs, by default 1, 2, ..., n.
+
+        Returns
+        -------
+        np.ndarray
+            1d array of precisions, one per k.
+        """
+        y_true = np.asarray(y_true).astype(np.int64)
+        if y_score is not None:
+            y_true = y_true[np.argsort(-np.asarray(y_score), kind="stable")]
+        tp_cum = np.cumsum(y_true)
+        if ks is None:
+            return tp_cum / np.arange(1, y_true.shape[0] + 1)
+        ks = np.clip(np.asarray(ks, dtype=np.int64), 0, y_true.shape[0])
+        tp_cum = np.r_[0, tp_cum]
+        return np.divide(
+            tp_cum[ks],
+            ks,
+            out=np.zeros(ks.shape[0], dtype=np.float64),
+            where=ks > 0,
+        )
+
+    def auprc(
+        self,
+        y_true: np.ndarray,
+        y_score: np.ndarray,
+    ) -> float:
+        """
+        Area under the precision-recall curve, as average precision.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels.
+        y_score : np.ndarray
+            1d array of scores.
+
+        Returns
+        -------
+        float
+            Average precision, as sklearn's average_precision_score.
+        """
+        return self.area_pr(*self.curve(y_true, y_score)[:2])
+
+    def roc_auc(
+        self,
+        y_true: np.ndarray,
+        y_score: np.ndarray,
+    ) -> float:
+        """
+        Area under the ROC curve.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels.
+        y_score : np.ndarray
+            1d array of scores.
+
+        Returns
+        -------
+        float
+            ROC-AUC with ties counted as half, or nan if only one class is
+            present.
+        """
+        return self.area_roc(*self.curve(y_true, y_score)[:2])
+
+    def ranking(
+        self,
+        y_true: np.ndarray,
+        y_score: np.ndarray,
+    ) -> Dict[str, float]:
+        """
+        Ranking metrics of scored pairs.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            1d array of labels.
+        y_score : np.ndarray
+            1d array of scores.
+
+        Returns
+        -------
+        Dict[str, float]
+            AUPRC and ROC-AUC.
+        """
+        tps, fps, _ = self.curve(y_true, y_score)
+        return {
+            "auprc": self.area_pr(tps, fps),
+            "roc_auc": self.area_roc(tps, fps),
+        }
+
+    def area_pr(
+        self,
+        tps: np.ndarray,
+        fps: np.ndarray,
+    ) -> float:
+        """
+        Average precision from the output of `curve`.
+
+        Parameters
+        ----------
+        tps : np.ndarray
+            Cumulative true positives per threshold.
+        fps : np.ndarray
+            Cumulative false positives per threshold.
+
+        Returns
+        -------
+        float
+            Average precision, or 0 if there is no positive.
+        """
+        if tps.shape[0] == 0 or tps[-1] == 0:
+            return 0.0
+        precision = tps / (tps + fps)
+        recall = tps / tps[-1]
+        return float(np.sum(np.diff(np.r_[0, recall]) * precision))
+
+    def area_roc(
+        self,
+        tps: np.ndarray,
+        fps: np.ndarray,
+    ) -> float:
+        """
+        Area under the ROC curve from the output of `curve`.
+
+        Parameters
+        ----------
+        tps : np.ndarray
+            Cumulative true positives per threshold.
+        fps : np.ndarray
+            Cumulative false positives per threshold.
+
+        Returns
+        -------
+        float
+            ROC-AUC, or nan if only one class is present.
+        """
+        if tps.shape[0] == 0 or tps[-1] == 0 or fps[-1] == 0:
+            return float("nan")
+        tpr = np.r_[0, tps] / tps[-1]
+        fpr = np.r_[0, fps] / fps[-1]
+        ### trapezoidal rule, as np.trapezoid (numpy >= 2.0 only) does
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
@@ -0,0 +1,190 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from tmkit.id.Fasta import Fasta as idfasta
+from tmkit.id.PDB import PDB as idpdb
+from tmkit.position.scenario.Segment import Segment as ppssegment
+from tmkit.structure.rrc.Label import Label as dlable
+from tmkit.topology.pdbtm.ToFastaId import toFastaId
+from tmkit.util.Kit import chainid
+
+
+class ProteinContext:
+    """
+    Parsed inputs of one protein chain, loaded lazily and kept for reuse.
+
+    The PDB ids, Fasta ids and transmembrane helix segments are parsed once
+    at the first access. Distance tables and pairs of interest are kept per
+    sequence-separation band, so that several tools and several bands of a
+    chain share one parse of the PDB, Fasta, XML and distance files.
+
+    Parameters
+    ----------
+    prot_name : str
+        name of a protein in the prefix of a PDB file name (e.g., 1xqf in 1xqfA.pdb).
+    seq_chain : str
+        chain of a protein in the prefix of a PDB file name (e.g., A in 1xqfA.pdb).
+    fasta_fp : str
+        path where a target Fasta file is placed.
+    pdb_fp : str
+        path where a target PDB file is placed.
+    dist_fp : str
+        path where a file containing real distances between residues is placed.
+    xml_fp : str
+        path where a target XML file is placed.
+    cutoff : float, optional
+        distance cutoff to see whether two residues are in spatial contact, by default 5.5.
+    """
+
+    def __init__(
+        self,
+        prot_name: str,
+        seq_chain: str,
+        fasta_fp: str,
+        pdb_fp: str,
+        dist_fp: str,
+        xml_fp: str,
+        cutoff: float = 5.5,
+    ) -> None:
+        self.prot_name = prot_name
+        self.seq_chain = seq_chain
+        self.file_chain = chainid(seq_chain)
+        self.fasta_fp = fasta_fp
+        self.pdb_fp = pdb_fp
+        self.dist_fp = dist_fp
+        self.xml_fp = xml_fp
+        self.cutoff = cutoff
+        self._pdbids = None
+        self._fasids = None
+        self._tmh = None
+        self._dists: Dict[Tuple, pd.DataFrame] = {}
+        self._pairs: Dict[Tuple, List] = {}
+
+    @property
+    def pdbids(self) -> Dict[int, str]:
+        """
+        PDB residue ids mapped to amino acids.
+
+        Returns
+        -------
+        Dict[int, str]
+            PDB ids of the chain.
+        """
+        if self._pdbids is None:
+            self._pdbids = idpdb(
+                pdb_fp=self.pdb_fp,
+                prot_name=self.prot_name,
+                seq_chain=self.seq_chain,
+                file_chain=self.file_chain,
+            ).chain()
+        return self._pdbids
+
+    @property
+    def fasids(self) -> Dict[int, str]:
+        """
+        Fasta residue ids mapped to amino acids.
+
+        Returns
+        -------
+        Dict[int, str]
+            Fasta ids of the chain.
+        """
+        if self._fasids is None:
+            self._fasids = idfasta().get(
+                fasta_fpn=self.fasta_fp + self.prot_name + self.file_chain + ".fasta"
+            )
+        return self._fasids
+
+    @property
+    def tmh(self) -> Tuple[List[int], List[int]]:
+        """
+        Transmembrane helix segments in Fasta ids.
+
+        Returns
+        -------
+        Tuple[List[int], List[int]]
+            Lower and upper bounds of segments.
+        """
+        if self._tmh is None:
+            self._tmh = toFastaId().tmh(
+                pdbid_map=self.pdbids,
+                fasid_map=self.fasids,
+                xml_fp=self.xml_fp,
+                prot_name=self.prot_name,
+                seq_chain=self.seq_chain,
+            )
+        return self._tmh
+
+    def dist(
+        self,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Labelled distance table within a sequence-separation band.
+
+        Notes
+        -----
+            A copy is returned each time, since readers and evaluators
+            rename and cast columns of the table they are given.
+
+        Parameters
+        ----------
+        seq_sep_inferior : int, optional
+            The lower bounds of how far any two residues are in pairs.
+        seq_sep_superior : int, optional
+            The upper bounds of how far any two residues are in pairs.
+
+        Returns
+        -------
+        pd.DataFrame
+            Distances and labels of residue pairs (see tmkit.structure.rrc.Label).
+        """
+        key = (seq_sep_inferior, seq_sep_superior)
+        if key not in self._dists:
+            self._dists[key] = dlable(
+                dist_path=self.dist_fp,
+                prot_name=self.prot_name,
+                file_chain=self.file_chain,
+                cutoff=self.cutoff,
+                seq_sep_inferior=seq_sep_inferior,
+                seq_sep_superior=seq_sep_superior,
+            ).attach()
+        return self._dists[key].copy()
+
+    def pair_list(
+        self,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+    ) -> List:
+        """
+        Pairs of residues across transmembrane helices.
+
+        Parameters
+        ----------
+        seq_sep_inferior : int, optional
+            The lower bounds of how far any two residues are in pairs.
+        seq_sep_superior : int, optional
+            The upper bounds of how far any two residues are in pairs.
+
+        Returns
+        -------
+        List
+            Residue pairs in Fasta ids.
+        """
+        key = (seq_sep_inferior, seq_sep_superior)
+        if key not in self._pairs:
+            fasta_lower_tmh, fasta_upper_tmh = self.tmh
+            self._pairs[key] = ppssegment(
+                seq_sep_inferior=seq_sep_inferior,
+                seq_sep_superior=seq_sep_superior,
+            ).to_pair(fasta_lower_tmh, fasta_upper_tmh)
+        return self._pairs[key]
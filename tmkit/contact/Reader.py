@@ -10,6 +10,10 @@ from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
+from tmkit.contact.Cache import Cache
+from tmkit.contact.ContactMap import ContactMap
+from tmkit.contact.Format import Format
+from tmkit.contact.Join import Join
 from tmkit.position.scenario.Separation import Separation as ppssep
 from tmkit.util.Kit import tactic1
 from tmkit.util.Reader import Reader as greader
@@ -20,6 +24,8 @@ class Reader:
         self,
         seq_sep_inferior: Optional[int] = None,
         seq_sep_superior: Optional[int] = None,
+        is_mmap: bool = False,
+        cache: Optional[Cache] = None,
     ):
         """
         The reader class.
@@ -30,11 +36,19 @@ class Reader:
             Lower limit of sequence separation, by default None
         seq_sep_superior : int, optional
             Upper limit of sequence separation, by default None
+        is_mmap : bool, optional
+            If True, matrix outputs (e.g., CCMPred) are cached as memory-mapped
+            `.npy` sidecars, by default False
+        cache : Cache, optional
+            An on-disk cache of parsed predictor files (see
+            tmkit.contact.Cache), by default None
         """
         self.__sort_ = -1
         self.seq_sep_inferior = seq_sep_inferior
         self.seq_sep_superior = seq_sep_superior
         self.greader = greader()
+        self.join = Join(id_1="contact_id_1", id_2="contact_id_2")
+        self.format = Format(is_mmap=is_mmap, cache=cache)
 
     @property
     def sort_(self) -> int:
@@ -98,37 +112,7 @@ class Reader:
         Tuple[pd.DataFrame, pd.DataFrame]
             Tuple of resulting dataframes after sorting.
         """
-        dists_ = dist_df
-        recombine_ = recombine
-        len_recombine_ = recombine_.shape[0]
-        dists_["fasta_id_1"] = dists_["fasta_id_1"].astype(int)
-        dists_["fasta_id_2"] = dists_["fasta_id_2"].astype(int)
-        dists__ = pd.DataFrame()
-        dists__[0] = dists_["fasta_id_1"]
-        dists__[1] = dists_["fasta_id_2"]
-        dists__[2] = dists_.index.values
-        dist_dict = self.todict(dists__)
-        dist_ids = []
-        for i in range(len_recombine_):
-            id_1 = recombine_["contact_id_1"][i]
-            id_2 = recombine_["contact_id_2"][i]
-            # print(id_1, id_2)
-            # ### /* block 3.2 */ ###
-            dist_id = dist_dict[id_1][id_2]
-            dist_ids.append(dist_id)
-        recombine_dist = dists_.iloc[dist_ids]
-        recombine_dist.columns = [
-            "fasta_id_1",
-            "aa_1",
-            "pdb_id_1",
-            "fasta_id_2",
-            "aa_2",
-            "pdb_id_2",
-            "dist",
-            "is_contact",
-        ]
-        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
-        return recombine_, recombine_dist
+        return self.join.sort_1(recombine, dist_df)
 
     def sort_2(
         self, recombine: pd.DataFrame, dist_df: pd.DataFrame, pair_df: pd.DataFrame
@@ -150,61 +134,7 @@ class Reader:
         Tuple[pd.DataFrame, pd.DataFrame]
             Tuple of resulting dataframes after sorting.
         """
-        # #/*** block 1 ***/
-        predicts_ = recombine
-        dists_ = dist_df
-        pair_df_ = pair_df
-        pair_df_[2] = 0
-        # print(pair_df_)
-        # #/*** block 2 ***/
-        # #/*** block 2.1 ***/
-        predicts__ = pd.DataFrame()
-        predicts__[0] = predicts_["contact_id_1"]
-        predicts__[1] = predicts_["contact_id_2"]
-        predicts__[2] = predicts_.index.values
-        predict_dict = self.todict(predicts__)
-        # print(predict_dict)
-        # #/*** block 2.2 ***/
-        dists__ = pd.DataFrame()
-        dists__[0] = dists_["fasta_id_1"]
-        dists__[1] = dists_["fasta_id_2"]
-        dists__[2] = dists_.index.values
-        dist_dict = self.todict(dists__)
-        # print(dist_dict)
-        # #/*** block 3 ***/
-        pred_ids = []
-        dist_ids = []
-        len_pairs = pair_df_.shape[0]
-        for i in range(len_pairs):
-            id_1 = pair_df_[0][i]
-            id_2 = pair_df_[1][i]
-            try:
-                # #/*** block 3.1 ***/
-                pred_id = predict_dict[id_1][id_2]
-                pred_ids.append(pred_id)
-                # #/*** block 3.2 ***/
-                dist_id = dist_dict[id_1][id_2]
-                dist_ids.append(dist_id)
-            except KeyError:
-                continue
-        # #/*** block 4 ***/
-        recombine_pred = predicts_.iloc[pred_ids]
-        recombine_pred.columns = ["contact_id_1", "contact_id_2", "score"]
-        recombine_pred = recombine_pred.reset_index(inplace=False, drop=True)
-        # #/*** block 5 ***/
-        recombine_dist = dists_.iloc[dist_ids]
-        recombine_dist.columns = [
-            "fasta_id_1",
-            "aa_1",
-            "pdb_id_1",
-            "fasta_id_2",
-            "aa_2",
-            "pdb_id_2",
-            "dist",
-            "is_contact",
-        ]
-        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
-        return recombine_pred, recombine_dist
+        return self.join.sort_2(recombine, dist_df, pair_df)
 
     def sort_3(
         self,
@@ -245,22 +175,9 @@ class Reader:
         # print(recombine_)
         # # /*** block 1 ***/
         if is_uniform:
-            predict_dict = self.todict(recombine_)
-            uniform_df[2] = indicator
-            # print(uniform_df)
-            uniform_list = uniform_df.values.tolist()
-            uniform_shape = len(uniform_list)
-            for i in range(uniform_shape):
-                id_1 = uniform_list[i][0]
-                id_2 = uniform_list[i][1]
-                try:
-                    uniform_list[i][2] = predict_dict[id_1][id_2]
-                except KeyError:
-                    continue
-            recombine_ = pd.DataFrame(uniform_list)
-            recombine_.columns = ["contact_id_1", "contact_id_2", "score"]
-            # print(recombine_)
-            # self.pfwwriter.generic(recombine_, sv_fpn='./cheer')
+            recombine_ = self.join.uniform(
+                recombine_, uniform_df=uniform_df, indicator=indicator
+            )
         # # /*** block 2 ***/
         recombine_ = ppssep(
             df=recombine_,
@@ -292,145 +209,221 @@ class Reader:
         dicts = tactic1(arr_2d)
         return dicts
 
-    def mi(
+    def dispatch(
         self,
-        mi_path: str,
-        file_name: str,
-        file_chain: str,
+        tool: str,
+        fpn: str,
         dist_df: Optional[pd.DataFrame] = None,
         pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
-    ) -> Union[Tuple[pd.DataFrame, pd.DataFrame], pd.DataFrame]:
+        is_uniform: bool = True,
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
-        Perform the mi operation.
+        Read results of a predictor and arrange them by `sort_`.
 
         Parameters
         ----------
-        mi_path : str
-            The path to the mi file.
-        file_name : str
-            The name of the file.
-        file_chain : str
-            The chain of the file.
+        tool : str
+            Name of a predictor (see tmkit.contact.Format).
+        fpn : str
+            Path to the predictor file.
         dist_df : pd.DataFrame, optional
             The distance dataframe, by default None.
         pair_list : List, optional
             The list of pairs, by default None.
         sort_ : int, optional
-            The sort value, by default 0.
+            0 for raw results, 1 for sort_1, and 2 for sort_2, by default 0.
         is_sort : bool, optional
-            If the output should be sorted, by default False.
+            If the output should be sorted by scores, by default False.
+        is_uniform : bool, optional
+            If results are projected onto `pair_list` before sort_2, by default True.
 
         Returns
         -------
-        Union[Tuple[pd.DataFrame, pd.DataFrame], pd.DataFrame]
-            The result of the mi operation.
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Results of the predictor, with their distances if sort_ is 1 or 2.
         """
         self.__sort_ = sort_
-        results = self.greader.generic(
-            mi_path + file_name + file_chain + ".evfold", df_sep=r"\s+", is_utf8=True
+        recombine = self.contact_map(tool, fpn).to_frame(
+            id_1="contact_id_1",
+            id_2="contact_id_2",
         )
-        results.columns = [
-            "contact_id_1",
-            "aa_1",
-            "contact_id_2",
-            "aa_2",
-            "score",
-            "FC_score",
-        ]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
         if self.__sort_ == 1:
             pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
             recombine = self.sort_3(
                 recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
             )
-            dist_mi, dist_true = self.sort_1(recombine, dist_df)
-            return dist_mi, dist_true
+            return self.sort_1(recombine, dist_df)
         elif self.__sort_ == 2:
             pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mi, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_mi.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_mi), len(dist_true))
-            return dist_mi, dist_true
+            if is_uniform:
+                recombine = self.sort_3(
+                    recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
+                )
+            else:
+                recombine = self.sort_3(recombine, is_sort=is_sort)
+            return self.sort_2(recombine, dist_df, pair_df)
         else:
             return recombine
 
+    def contact_map(
+        self,
+        tool: str,
+        fpn: str,
+    ) -> ContactMap:
+        """
+        Read results of a predictor into a columnar contact map.
+
+        Notes
+        -----
+            Scores are kept in float64 so that dataframes derived from
+            the contact map are identical to the predictor file.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor (see tmkit.contact.Format).
+        fpn : str
+            Path to the predictor file.
+
+        Returns
+        -------
+        ContactMap
+            Predicted contacts.
+        """
+        return self.format.read(tool, fpn, dtype=np.float64)
+
+    def stream(
+        self,
+        tool: str,
+        fpn: str,
+        k: int,
+        chunksize: int = 1 << 18,
+    ) -> pd.DataFrame:
+        """
+        Read only the k best-scored pairs of a predictor within the sequence
+        separation band of the reader, scanning the file in chunks.
+
+        Notes
+        -----
+            Peak memory grows with k and `chunksize` rather than with the
+            size of the file. The result equals the head of `sort_3` with
+            is_sort=True, without ties left to the sort algorithm.
+
+        Parameters
+        ----------
+        tool : str
+            Name of a predictor (see tmkit.contact.Format).
+        fpn : str
+            Path to the predictor file.
+        k : int
+            Number of pairs to keep (e.g., L/5).
+        chunksize : int, optional
+            Number of lines read at a time, by default 262144.
+
+        Returns
+        -------
+        pd.DataFrame
+            Top-k pairs sorted by `score` in descending order.
+        """
+        return self.format.stream(
+            tool,
+            fpn,
+            k=k,
+            seq_sep_inferior=self.seq_sep_inferior,
+            seq_sep_superior=self.seq_sep_superior,
+            dtype=np.float64,
+            chunksize=chunksize,
+        ).to_frame(id_1="contact_id_1", id_2="contact_id_2")
+
+    def mi(
+        self,
+        mi_path: str,
+        file_name: str,
+        file_chain: str,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
+        sort_: int = 0,
+        is_sort: bool = False,
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Process the mutual information (EVfold format) data and returns it in a sorted or unsorted form based on the provided parameters.
+
+        Parameters
+        ----------
+        mi_path : str
+            Path to the mutual information (EVfold format) data file.
+        file_name : str
+            Name of the data file.
+        file_chain : str
+            Chain to be processed in the data file.
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
+            List of pairs to be processed.
+        sort_ : int, optional
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
+        is_sort : bool, optional
+            Whether to sort the data or not (default is False).
+
+        Returns
+        -------
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
+        """
+        return self.dispatch(
+            tool="mi",
+            fpn=mi_path + file_name + file_chain + ".evfold",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
+        )
+
     def psicov(
         self,
         pcv_path: str,
         file_name: str,
         file_chain: str,
         dist_df: Optional[pd.DataFrame] = None,
-        pair_list: Optional[List[Tuple[int, int]]] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
-        Process and return the PSICOV results. The results can be sorted based on sequence separation,
-        and eliminate low scores.
-        psicov result not only sorted by seq_sep>4 but also
-        eliminate tiny score.
-
-        Parameters:
-        -----------
-        pcv_path: str
-            Path to the PSICOV file.
-        file_name: str
-            Name of the PSICOV file.
-        file_chain: str
-            Chain identifier of the PSICOV file.
-        dist_df: Optional[pd.DataFrame]
-            DataFrame containing distance data. Default is None.
-        pair_list: Optional[List[Tuple[int, int]]]
-            List of pairs to be sorted. Default is None.
-        sort_: int
-            Sorting type. 0 for no sorting, 1 for sort_1, and 2 for sort_2. Default is 0.
-        is_sort: bool
-            Whether to sort or not. Default is False.
-
-        Returns:
-        --------
-        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
-            Returns the sorted PSICOV DataFrame. If sort_ is 1 or 2, returns a tuple of DataFrames containing the sorted PSICOV data and the corresponding distance data.
+        Process the PSICOV data and returns it in a sorted or unsorted form based on the provided parameters.
+
+        Parameters
+        ----------
+        pcv_path : str
+            Path to the PSICOV data file.
+        file_name : str
+            Name of the data file.
+        file_chain : str
+            Chain to be processed in the data file.
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
+            List of pairs to be processed.
+        sort_ : int, optional
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
+        is_sort : bool, optional
+            Whether to sort the data or not (default is False).
+
+        Returns
+        -------
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            pcv_path + file_name + file_chain + ".psicov", df_sep=r"\s+", is_utf8=True
+        return self.dispatch(
+            tool="psicov",
+            fpn=pcv_path + file_name + file_chain + ".psicov",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
         )
-        results.columns = [
-            "contact_id_1",
-            "contact_id_2",
-            "dist_inf",
-            "dist_sup",
-            "score",
-        ]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_pcv, dist_true = self.sort_1(recombine, dist_df)
-            return dist_pcv, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_pcv, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_pcv.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_pcv), len(dist_true))
-            return dist_pcv, dist_true
-        else:
-            return recombine
 
     def freecontact(
         self,
@@ -438,43 +431,43 @@ class Reader:
         file_name: str,
         file_chain: str,
         dist_df: Optional[pd.DataFrame] = None,
-        pair_list: Optional[List[Tuple[int, int]]] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            fc_path + file_name + file_chain + ".evfold", df_sep=r"\s+", is_utf8=True
+        """
+        Process the FreeContact data and returns it in a sorted or unsorted form based on the provided parameters.
+
+        Parameters
+        ----------
+        fc_path : str
+            Path to the FreeContact data file.
+        file_name : str
+            Name of the data file.
+        file_chain : str
+            Chain to be processed in the data file.
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
+            List of pairs to be processed.
+        sort_ : int, optional
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
+        is_sort : bool, optional
+            Whether to sort the data or not (default is False).
+
+        Returns
+        -------
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
+        """
+        return self.dispatch(
+            tool="freecontact",
+            fpn=fc_path + file_name + file_chain + ".evfold",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
         )
-        results.columns = [
-            "contact_id_1",
-            "aa_1",
-            "contact_id_2",
-            "aa_2",
-            "MI_score",
-            "score",
-        ]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_fc, dist_true = self.sort_1(recombine, dist_df)
-            return dist_fc, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_fc, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_fc.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_fc), len(dist_true))
-            return dist_fc, dist_true
-        else:
-            return recombine
 
     def ccmpred(
         self,
@@ -482,51 +475,52 @@ class Reader:
         file_name: str,
         file_chain: str,
         dist_df: Optional[pd.DataFrame] = None,
-        pair_list: Optional[List[Tuple[int, int]]] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
-        self.__sort_ = sort_
-        file_results = self.greader.generic(
-            cp_path + file_name + file_chain + ".ccmpred", df_sep=r"\s+", is_utf8=True
+        """
+        Process the CCMPred data and returns it in a sorted or unsorted form based on the provided parameters.
+
+        Parameters
+        ----------
+        cp_path : str
+            Path to the CCMPred data file.
+        file_name : str
+            Name of the data file.
+        file_chain : str
+            Chain to be processed in the data file.
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
+            List of pairs to be processed.
+        sort_ : int, optional
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
+        is_sort : bool, optional
+            Whether to sort the data or not (default is False).
+
+        Returns
+        -------
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
+        """
+        return self.dispatch(
+            tool="ccmpred",
+            fpn=cp_path + file_name + file_chain + ".ccmpred",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
+            is_uniform=False,
         )
-        results = []
-        for i, row in file_results.iterrows():
-            for j in range(file_results.shape[1]):
-                if i < j:
-                    # print(i+1, j+1, row[j])
-                    results.append([i + 1, j + 1, row[j]])
-        results = pd.DataFrame(results)
-        results.columns = ["contact_id_1", "contact_id_2", "score"]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_cp, dist_true = self.sort_1(recombine, dist_df)
-            return dist_cp, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            print(recombine.shape)
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            print(recombine.shape)
-            dist_cp, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_cp.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_cp), len(dist_true))
-            return dist_cp, dist_true
-        else:
-            return recombine
 
     def gremlin(
         self,
         gl_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
@@ -541,70 +535,39 @@ class Reader:
             Name of the data file.
         file_chain : str
             Chain to be processed in the data file.
-        dist_df : pandas.DataFrame, optional
-            DataFrame containing the distribution data.
-        pair_list : list, optional
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
             List of pairs to be processed.
         sort_ : int, optional
-            Determines the type of sorting to be applied. (default is 0, which means no sorting)
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
         is_sort : bool, optional
-            Whether to sort the data or not.
+            Whether to sort the data or not (default is False).
 
         Returns
         -------
-        pandas.DataFrame or Tuple[pandas.DataFrame, pandas.DataFrame]
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
             Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            gl_path + file_name + file_chain + ".gremlin",
-            df_sep=r"\s+",
-            header=0,
-            is_utf8=True,
+        return self.dispatch(
+            tool="gremlin",
+            fpn=gl_path + file_name + file_chain + ".gremlin",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
         )
-        results.columns = [
-            "contact_id_1",
-            "contact_id_2",
-            "aa_1",
-            "aa_2",
-            "r_sco",
-            "s_sco",
-            "score",
-        ]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        # print(recombine)
-        # print(recombine.dtypes)
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gl, dist_true = self.sort_1(recombine, dist_df)
-            return dist_gl, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gl, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_gl.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_gl), len(dist_true))
-            return dist_gl, dist_true
-        else:
-            return recombine
 
     def gdca(
         self,
         gdca_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
-    ) -> Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]:
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
         Process the GDCA data and returns it in a sorted or unsorted form based on the provided parameters.
 
@@ -617,7 +580,7 @@ class Reader:
         file_chain : str
             Chain to be processed in the data file.
         dist_df : pd.DataFrame, optional
-            DataFrame containing the distribution data.
+            DataFrame containing the distance data.
         pair_list : List, optional
             List of pairs to be processed.
         sort_ : int, optional
@@ -627,46 +590,28 @@ class Reader:
 
         Returns
         -------
-        Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
             Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            gdca_path + file_name + file_chain + ".gdca", df_sep=r"\s+", is_utf8=True
+        return self.dispatch(
+            tool="gdca",
+            fpn=gdca_path + file_name + file_chain + ".gdca",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
         )
-        results.columns = ["contact_id_1", "contact_id_2", "score"]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_1(recombine, dist_df)
-            return dist_gdca, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_gdca.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_gdca), len(dist_true))
-            return dist_gdca, dist_true
-        else:
-            return recombine
 
     def plmc(
         self,
         plmc_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
-    ) -> Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]:
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
         Process the PLMC data and returns it in a sorted or unsorted form based on the provided parameters.
 
@@ -679,7 +624,7 @@ class Reader:
         file_chain : str
             Chain to be processed in the data file.
         dist_df : pd.DataFrame, optional
-            DataFrame containing the distribution data.
+            DataFrame containing the distance data.
         pair_list : List, optional
             List of pairs to be processed.
         sort_ : int, optional
@@ -689,144 +634,72 @@ class Reader:
 
         Returns
         -------
-        Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
             Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            plmc_path + file_name + file_chain + ".plmc", df_sep=r"\s+", is_utf8=True
+        return self.dispatch(
+            tool="plmc",
+            fpn=plmc_path + file_name + file_chain + ".plmc",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
         )
-        results.columns = [
-            "contact_id_1",
-            "aa_1",
-            "contact_id_2",
-            "aa_2",
-            "placeholder",
-            "score",
-        ]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_plmc, dist_true = self.sort_1(recombine, dist_df)
-            return dist_plmc, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_plmc, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_plmc.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_plmc), len(dist_true))
-            return dist_plmc, dist_true
-        else:
-            return recombine
 
     def memconp(
         self,
         mcp_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
-    ) -> Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]:
-        """
-                Process the MemconP data and returns it in a sorted or unsorted form based on the provided parameters.
-
-                Parameters
-                ----------
-                mcp_path : str
-                    Path to the MemconI'm sorry, the response was cut off. I'll continue the `memconp` function and add the `membrain2` function.
-
-        ```python
-                mcp_path : str
-                    Path to the MemconP data file.
-                file_name : str
-                    Name of the data file.
-                file_chain : str
-                    Chain to be processed in the data file.
-                dist_df : pd.DataFrame, optional
-                    DataFrame containing the distribution data.
-                pair_list : List, optional
-                    List of pairs to be processed.
-                sort_ : int, optional
-                    Determines the type of sorting to be applied (default is 0, which means no sorting).
-                is_sort : bool, optional
-                    Whether to sort the data or not (default is False).
-
-                Returns
-                -------
-                Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]
-                    Processed data, returned according to the sort_ parameter's value.
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
-        self.__sort_ = sort_
-        file_path = mcp_path + file_name + file_chain + ".memconp"
-        with open(file_path) as file:
-            surface = [[str(digit) for digit in line.split()] for line in file]
-            memconp = pd.DataFrame(surface)
-            # print(memconp)
-        row_mark = memconp.loc[(memconp[0] == "RESTHRESH")].index[0]
-        results = memconp.drop(index=np.arange(row_mark + 1))
-        new_index = np.arange(results.shape[0])
-        results = results.set_index(new_index, inplace=False, drop=True)
-        results.columns = [
-            "Mark",
-            "contact_id_1",
-            "contact_id_2",
-            "score",
-            "isContact",
-            "ph1",
-            "ph2",
-        ]
-        results["contact_id_1"] = results["contact_id_1"].astype(int)
-        results["contact_id_2"] = results["contact_id_2"].astype(int)
-        results["score"] = results["score"].astype(np.float64)
-        # print(results.dtypes)
-        recombine = results[
-            [
-                "contact_id_1",
-                "contact_id_2",
-                "score",
-            ]
-        ]
-        # print(recombine.dtypes)
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mcp, dist_true = self.sort_1(recombine, dist_df)
-            return dist_mcp, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mcp, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_mcp.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_mcp), len(dist_true))
-            return dist_mcp, dist_true
-        else:
-            return recombine
+        Process the MemConP data and returns it in a sorted or unsorted form based on the provided parameters.
+
+        Parameters
+        ----------
+        mcp_path : str
+            Path to the MemConP data file.
+        file_name : str
+            Name of the data file.
+        file_chain : str
+            Chain to be processed in the data file.
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
+            List of pairs to be processed.
+        sort_ : int, optional
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
+        is_sort : bool, optional
+            Whether to sort the data or not (default is False).
+
+        Returns
+        -------
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
+        """
+        return self.dispatch(
+            tool="memconp",
+            fpn=mcp_path + file_name + file_chain + ".memconp",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
+        )
 
     def membrain2(
         self,
         mb_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
-    ) -> Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]:
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
         """
         Process the Membrain2 data and returns it in a sorted or unsorted form based on the provided parameters.
 
@@ -839,7 +712,7 @@ class Reader:
         file_chain : str
             Chain to be processed in the data file.
         dist_df : pd.DataFrame, optional
-            DataFrame containing the distribution data.
+            DataFrame containing the distance data.
         pair_list : List, optional
             List of pairs to be processed.
         sort_ : int, optional
@@ -849,62 +722,25 @@ class Reader:
 
         Returns
         -------
-        Union[pd.DataFrame, dict, Tuple[pd.DataFrame, pd.DataFrame]]
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
             Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        # new_file = re.sub(r'Query(.+?)\)', "", str(results), flags=re.S)
-        file_path = mb_path + file_name + file_chain + ".membrain2"
-        with open(file_path) as file:
-            surface = [[str(digit) for digit in line.split()] for line in file]
-            membrain2 = pd.DataFrame(surface)
-        row_mark = membrain2.loc[(membrain2[2] == "contacts:")].index[0]
-        results = membrain2.drop(index=np.arange(row_mark + 1))
-        new_index = np.arange(results.shape[0])
-        results = results.set_index(new_index, inplace=False, drop=True)
-        results.columns = [
-            "No",
-            "TMH1",
-            "contact_id_1",
-            "aa_1",
-            "TMH2",
-            "contact_id_2",
-            "aa_2",
-            "score",
-        ]
-        results["contact_id_1"] = results["contact_id_1"].astype(int)
-        results["contact_id_2"] = results["contact_id_2"].astype(int)
-        results["score"] = results["score"].astype(np.float64)
-        # print(results.dtypes)
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mb, dist_true = self.sort_1(recombine, dist_df)
-            return dist_mb, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mb, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_mb.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_mb), len(dist_true))
-            return dist_mb, dist_true
-        else:
-            return recombine
+        return self.dispatch(
+            tool="membrain2",
+            fpn=mb_path + file_name + file_chain + ".membrain2",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
+        )
 
     def deephelicon(
         self,
         deephelicon_path: str,
         file_name: str,
         file_chain: str,
-        dist_df: pd.DataFrame = None,
-        pair_list: List = None,
+        dist_df: Optional[pd.DataFrame] = None,
+        pair_list: Optional[List] = None,
         sort_: int = 0,
         is_sort: bool = False,
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
@@ -919,47 +755,26 @@ class Reader:
             Name of the data file.
         file_chain : str
             Chain to be processed in the data file.
-        dist_df : pandas.DataFrame, optional
-            DataFrame containing the distribution data.
-        pair_list : list, optional
+        dist_df : pd.DataFrame, optional
+            DataFrame containing the distance data.
+        pair_list : List, optional
             List of pairs to be processed.
         sort_ : int, optional
-            Determines the type of sorting to be applied. (default is 0, which means no sorting)
+            Determines the type of sorting to be applied (default is 0, which means no sorting).
         is_sort : bool, optional
-            Whether to sort the data or not.
+            Whether to sort the data or not (default is False).
 
         Returns
         -------
-        Union[pandas.DataFrame, Tuple[pandas.DataFrame, pandas.DataFrame]]
-            Processed data, returned as DataFrame when sort_ is not 1 or 2,
-            else returns a tuple of DataFrames.
+        Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+            Processed data, returned according to the sort_ parameter's value.
         """
-        self.__sort_ = sort_
-        results = self.greader.generic(
-            deephelicon_path + file_name + file_chain + ".tma165",
-            df_sep="\t",
-            is_utf8=True,
+        return self.dispatch(
+            tool="deephelicon",
+            fpn=deephelicon_path + file_name + file_chain + ".tma165",
+            dist_df=dist_df,
+            pair_list=pair_list,
+            sort_=sort_,
+            is_sort=is_sort,
+            is_uniform=False,
         )
-        results.columns = ["contact_id_1", "aa_1", "contact_id_2", "aa_2", "score"]
-        recombine = results[["contact_id_1", "contact_id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_tma165, dist_true = self.sort_1(recombine, dist_df)
-            return dist_tma165, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine,
-                is_sort=is_sort,
-                # is_uniform=True,
-                # uniform_df=pair_df
-            )
-            dist_tma165, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            return dist_tma165, dist_true
-        else:
-            return recombine
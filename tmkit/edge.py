@@ -5,13 +5,20 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
-from typing import Optional
+from typing import Dict, List, Optional, Union
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
 
 from tmkit.seqnetrr.Controller import Controller
+from tmkit.seqnetrr.Index import Index
+from tmkit.sequence import Fasta as sfasta
 
 
 def extract(
-    method: str,
+    method: Union[str, List[str]],
     fasta_fpn: str,
     net_fpn: str,
     window_size: int,
@@ -23,13 +30,18 @@ def extract(
     cumu_ratio: float = 1.0,
     sv_fpn: Optional[str] = None,
     is_sv: bool = False,
+    block_size: Optional[int] = None,
+    compression: Optional[str] = None,
+    fill: float = 0.0,
 ):
     """_summary_
 
     Parameters
     ----------
-    method: str
-        name of a contact prediction method. It can be one of PSICOV, FreeContact, CCMPred, Gremlin, GDCA, PlmDCA, MemConP, Membrain2, and DeepHelicon.
+    method: Union[str, List[str]]
+        name of a pipeline: unipartite | bipartite | cumulative | all, or a
+        list of them, whose features come in one output side by side (see
+        tmkit.seqnetrr.Controller.graphs).
     fasta_fpn: str
         path where a target Fasta file is placed.
     net_fpn: str
@@ -45,7 +57,7 @@ def extract(
     pair_mode: str
         mode of global pairs: patch | memconp | cross | unchanged
     assign_mode: str
-        mode of assignment: hash | hash_ori | hash_rl | pandas | numpy
+        mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | window (unipartite only) | sparse
     input_kind: str
         input kind for relationships of a network file: general | simulate | freecontact | gdca | cmmpred | plmc
     list_2d: List
@@ -56,6 +68,15 @@ def extract(
          if save files.
     sv_fpn: str
         path to where you want to save files.
+    block_size: int
+        number of pairs per block in streaming mode (see
+        tmkit.seqnetrr.Controller), by default None.
+    compression: str
+        compression of outputs in .npz, .parquet or .h5 (see
+        tmkit.seqnetrr.Output), by default None.
+    fill: float
+        score of pairs absent from the network with assign_mode sparse
+        (see tmkit.seqnetrr.net.Sparse), by default 0.0.
 
     Returns
     -------
@@ -76,4 +97,206 @@ def extract(
         cumu_ratio=cumu_ratio,
         is_sv=is_sv,
         sv_fpn=sv_fpn,
+        block_size=block_size,
+        compression=compression,
+        fill=fill,
+    )
+
+
+def extract_group(
+    jobs: List[Dict],
+    cache_dir: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Run edge extraction of several chains in one process, one after another.
+
+    Notes
+    -----
+        Pipelines share one tmkit.seqnetrr.Index (see `index_cache` of
+        tmkit.seqnetrr.Controller), so index arrays built for a chain are
+        reused by later chains of the same length. Features are written
+        to each job's sv_fpn and only a report is returned.
+
+    Parameters
+    ----------
+    jobs : List[Dict]
+        keyword arguments of `extract` per chain.
+    cache_dir : str, optional
+        directory where index arrays are persisted, by default None.
+
+    Returns
+    -------
+    List[Dict]
+        One report per chain: fasta_fpn, sv_fpn, method, len_seq, time,
+        status ("ok" or "failed") and error.
+    """
+    index_cache = Index(cache_dir=cache_dir)
+    reports = []
+    for job in jobs:
+        job = dict(job)
+        len_seq = job.pop("len_seq", None)
+        job.pop("is_sv", None)
+        stime = time.time()
+        report = dict(
+            fasta_fpn=job.get("fasta_fpn"),
+            sv_fpn=job.get("sv_fpn"),
+            method=job.get("method"),
+            len_seq=len_seq,
+        )
+        try:
+            Controller(
+                mode="internal",
+                is_sv=True,
+                index_cache=index_cache,
+                **job,
+            )
+            report.update(time=time.time() - stime, status="ok", error="")
+        except Exception as e:
+            report.update(time=time.time() - stime, status="failed", error=repr(e))
+        reports.append(report)
+    return reports
+
+
+def extract_batch(
+    manifest: Union[pd.DataFrame, List[Dict]],
+    num_workers: Optional[int] = None,
+    chunk_size: int = 16,
+    cache_dir: Optional[str] = None,
+    **params,
+) -> pd.DataFrame:
+    """
+    Extract edges of many chains over a process pool.
+
+    Notes
+    -----
+        Chains are grouped by sequence length and each group is split into
+        tasks of at most `chunk_size` chains, so chains of equal length in a
+        task share index arrays (see `extract_group`). Each worker
+        writes features of a chain to its sv_fpn as soon as the chain is
+        finished (in blocks with `block_size`), so the calling process
+        only collects reports. Chains that fail are reported and skipped.
+
+    Parameters
+    ----------
+    manifest : Union[pd.DataFrame, List[Dict]]
+        one entry per chain with fasta_fpn, net_fpn, sv_fpn and method
+        (unipartite | bipartite | cumulative), and optionally any other
+        parameter of `extract` (e.g., window_size).
+    num_workers : int, optional
+        number of worker processes, by default the number of CPUs. With 1,
+        chains are extracted in the calling process.
+    chunk_size : int, optional
+        largest number of chains per task, by default 16.
+    cache_dir : str, optional
+        directory where index arrays are persisted and memory-mapped by
+        all workers (see tmkit.seqnetrr.Index), by default None.
+    params
+        parameters of `extract` for entries that do not set them
+        (e.g., window_size=2, pair_mode="patch", assign_mode="gather").
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per chain: fasta_fpn, sv_fpn, method, len_seq, time,
+        status and error.
+    """
+    if isinstance(manifest, pd.DataFrame):
+        entries = manifest.to_dict("records")
+    else:
+        entries = list(manifest)
+    defaults = dict(
+        window_size=2,
+        pair_mode="patch",
+        seq_sep_inferior=0,
+        seq_sep_superior=None,
+        assign_mode="hash",
+        input_kind="freecontact",
+        cumu_ratio=1.0,
+        block_size=None,
+    )
+    defaults.update(params)
+    reports = []
+    groups = {}
+    for entry in entries:
+        job = dict(defaults)
+        job.update(
+            {
+                k: v
+                for k, v in entry.items()
+                if not (isinstance(v, float) and pd.isna(v))
+            }
+        )
+        try:
+            job["len_seq"] = len(sfasta.get(fasta_fpn=job["fasta_fpn"]))
+        except Exception as e:
+            print(f"======>Failed {job.get('fasta_fpn')}: {e!r}")
+            reports.append(
+                dict(
+                    fasta_fpn=job.get("fasta_fpn"),
+                    sv_fpn=job.get("sv_fpn"),
+                    method=job.get("method"),
+                    len_seq=None,
+                    time=0.0,
+                    status="failed",
+                    error=repr(e),
+                )
+            )
+            continue
+        groups.setdefault(job["len_seq"], []).append(job)
+    tasks = [
+        group[i : i + chunk_size]
+        for _, group in sorted(groups.items())
+        for i in range(0, len(group), chunk_size)
+    ]
+    print(
+        f"======>{sum(len(g) for g in groups.values())} chains of {len(groups)} lengths in {len(tasks)} tasks"
+    )
+
+    def collect(results: List[Dict]) -> None:
+        for report in results:
+            if report["status"] == "failed":
+                print(f"======>Failed {report['fasta_fpn']}: {report['error']}")
+            else:
+                print(f"======>Extracted {report['fasta_fpn']}: {report['time']}s.")
+        reports.extend(results)
+
+    if num_workers == 1:
+        for task in tasks:
+            collect(extract_group(task, cache_dir=cache_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {
+                executor.submit(extract_group, task, cache_dir): task for task in tasks
+            }
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    collect(future.result())
+                except Exception as e:
+                    ### a worker lost as a whole, e.g., killed out of memory
+                    collect(
+                        [
+                            dict(
+                                fasta_fpn=job["fasta_fpn"],
+                                sv_fpn=job.get("sv_fpn"),
+                                method=job.get("method"),
+                                len_seq=job["len_seq"],
+                                time=0.0,
+                                status="failed",
+                                error=repr(e),
+                            )
+                            for job in task
+                        ]
+                    )
+    return pd.DataFrame(
+        reports,
+        columns=[
+            "fasta_fpn",
+            "sv_fpn",
+            "method",
+            "len_seq",
+            "time",
+            "status",
+            "error",
+        ],
     )
@@ -5,18 +5,18 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 import pandas as pd
 
+from tmkit.contact.Ensemble import Ensemble
 from tmkit.contact.Evaluator import evaluator
+from tmkit.contact.ProteinContext import ProteinContext
 from tmkit.contact.Reader import Reader as rrcreader
-from tmkit.id.Fasta import Fasta as idfasta
-from tmkit.id.PDB import PDB as idpdb
-from tmkit.position.scenario.Segment import Segment as ppssegment
-from tmkit.structure.rrc.Label import Label as dlable
-from tmkit.topology.pdbtm.ToFastaId import toFastaId
-from tmkit.util.Kit import chainid
 
 
 def read(
@@ -30,6 +30,7 @@ def read(
     tool_fp: str,
     seq_sep_superior: int,
     seq_sep_inferior: int = 0,
+    context: Optional[ProteinContext] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Read data from files and return a pandas DataFrame.
@@ -60,59 +61,50 @@ def read(
         The upper bounds of how far any two residues are in pairs.
     sort : int, optional
         Sorting method, by default 2.
+    context : ProteinContext, optional
+        parsed inputs of the chain shared across calls, by default built from the paths above.
 
     Returns
     -------
     pd.DataFrame
         A pandas DataFrame containing the data.
     """
+    reader = rrcreader()
     if tool == "psicov":
-        m = rrcreader().psicov
+        m = reader.psicov
     elif tool == "mi":
-        m = rrcreader().mi
+        m = reader.mi
     elif tool == "freecontact":
-        m = rrcreader().freecontact
+        m = reader.freecontact
     elif tool == "ccmpred":
-        m = rrcreader().ccmpred
+        m = reader.ccmpred
     elif tool == "gremlin":
-        m = rrcreader().gremlin
+        m = reader.gremlin
     elif tool == "gdca":
-        m = rrcreader().gdca
+        m = reader.gdca
     elif tool == "plmc":
-        m = rrcreader().plmc
+        m = reader.plmc
     elif tool == "memconp":
-        m = rrcreader().memconp
+        m = reader.memconp
     elif tool == "membrain2":
-        m = rrcreader().membrain2
+        m = reader.membrain2
     else:
-        m = rrcreader().deephelicon
+        m = reader.deephelicon
 
-    dist_df = dlable(
-        dist_path=dist_fp,
-        prot_name=prot_name,
-        file_chain=chainid(seq_chain),
+    if context is None:
+        context = ProteinContext(
+            prot_name=prot_name,
+            seq_chain=seq_chain,
+            fasta_fp=fasta_fp,
+            pdb_fp=pdb_fp,
+            dist_fp=dist_fp,
+            xml_fp=xml_fp,
+        )
+    dist_df = context.dist(
         seq_sep_inferior=seq_sep_inferior,
         seq_sep_superior=seq_sep_superior,
-    ).attach()
-
-    pdbids = idpdb(
-        pdb_fp=pdb_fp,
-        prot_name=prot_name,
-        seq_chain=seq_chain,
-        file_chain=chainid(seq_chain),
-    ).chain()
-
-    fasids = idfasta().get(
-        fasta_fpn=fasta_fp + prot_name + chainid(seq_chain) + ".fasta"
-    )
-    fasta_lower_tmh, fasta_upper_tmh = toFastaId().tmh(
-        pdbid_map=pdbids,
-        fasid_map=fasids,
-        xml_fp=xml_fp,
-        prot_name=prot_name,
-        seq_chain=seq_chain,
     )
-    pair_arr = ppssegment().to_pair(fasta_lower_tmh, fasta_upper_tmh)
+    pair_arr = context.pair_list()
 
     sdist, sdist_true = m(
         tool_fp,
@@ -125,6 +117,82 @@ def read(
     return (sdist, sdist_true)
 
 
+def read_ensemble(
+    prot_name: str,
+    seq_chain: str,
+    fasta_fp: str,
+    pdb_fp: str,
+    dist_fp: str,
+    xml_fp: str,
+    tools: List[str],
+    tool_fp: str,
+    seq_sep_superior: int,
+    seq_sep_inferior: int = 0,
+    context: Optional[ProteinContext] = None,
+) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Read predictions of several tools for one protein chain, aligned on a
+    single index of residue pairs.
+
+    Notes
+    -----
+        The distance file, PDB ids, Fasta ids and PDBTM XML are parsed once
+        and shared by all tools, instead of once per tool as with `read`.
+
+    Parameters
+    ----------
+    prot_name : str
+        name of a protein in the prefix of a PDB file name (e.g., 1xqf in 1xqfA.pdb).
+    seq_chain : str
+        chain of a protein in the prefix of a PDB file name (e.g., A in 1xqfA.pdb). Parameter file_chain will be converted within the function.
+    fasta_fp : str
+        path where a target Fasta file is placed.
+    pdb_fp : str
+        path where a target PDB file is placed.
+    dist_fp : str
+        path where a file containing real distances between residues is placed (please check the file at ./data/rrc in the example dataset).
+    xml_fp : str
+        path where a target XML file is placed.
+    tools : List[str]
+        names of contact prediction tools. Each can be one of mi, psicov, freecontact, ccmpred, gremlin, gdca, plmc, memconp, membrain2, and deephelicon.
+    tool_fp : str
+        path where protein residue contact map files are placed.
+    seq_sep_superior : int
+        The upper bounds of how far any two residues are in pairs.
+    seq_sep_inferior : int
+        The lower bounds of how far any two residues are in pairs.
+    context : ProteinContext, optional
+        parsed inputs of the chain shared across calls, by default built from the paths above.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, pd.DataFrame]
+        A tools x pairs array of scores, a pairs x 2 array of residue ids and
+        the distance rows of the pairs (with `dist` and `is_contact`).
+    """
+    if context is None:
+        context = ProteinContext(
+            prot_name=prot_name,
+            seq_chain=seq_chain,
+            fasta_fp=fasta_fp,
+            pdb_fp=pdb_fp,
+            dist_fp=dist_fp,
+            xml_fp=xml_fp,
+        )
+    dist_df = context.dist(
+        seq_sep_inferior=seq_sep_inferior,
+        seq_sep_superior=seq_sep_superior,
+    )
+    pair_arr = context.pair_list()
+
+    return Ensemble(dist_df=dist_df, pair_list=pair_arr).read(
+        tools=tools,
+        tool_fp=tool_fp,
+        file_name=prot_name,
+        file_chain=seq_chain,
+    )
+
+
 def evaluate(
     prot_name: str,
     seq_chain: str,
@@ -138,6 +206,7 @@ def evaluate(
     seq_sep_inferior: int,
     seq_sep_superior: int,
     sort: int = 2,
+    context: Optional[ProteinContext] = None,
 ) -> None:
     """
     Evaluate the data and print the results.
@@ -168,37 +237,27 @@ def evaluate(
         The upper bounds of how far any two residues are in pairs.
     sort : int, optional
         Sorting method, by default 2.
+    context : ProteinContext, optional
+        parsed inputs of the chain shared across calls, by default built from the paths above.
     """
-    dist_df = dlable(
-        dist_path=dist_fp,
-        prot_name=prot_name,
-        file_chain=chainid(seq_chain),
+    if context is None:
+        context = ProteinContext(
+            prot_name=prot_name,
+            seq_chain=seq_chain,
+            fasta_fp=fasta_fp,
+            pdb_fp=pdb_fp,
+            dist_fp=dist_fp,
+            xml_fp=xml_fp,
+        )
+    dist_df = context.dist(
         seq_sep_inferior=0,
         seq_sep_superior=seq_sep_superior,
-    ).attach()
-
-    pdbids = idpdb(
-        pdb_fp=pdb_fp,
-        prot_name=prot_name,
-        seq_chain=seq_chain,
-        file_chain=chainid(seq_chain),
-    ).chain()
-
-    fasids = idfasta().get(
-        fasta_fpn=fasta_fp + prot_name + chainid(seq_chain) + ".fasta"
-    )
-    fasta_lower_tmh, fasta_upper_tmh = toFastaId().tmh(
-        pdbid_map=pdbids,
-        fasid_map=fasids,
-        xml_fp=xml_fp,
-        prot_name=prot_name,
-        seq_chain=seq_chain,
     )
-    pair_arr = ppssegment().to_pair(fasta_lower_tmh, fasta_upper_tmh)
+    pair_arr = context.pair_list()
 
     p = evaluator(
         prot_name=prot_name,
-        file_chain=chainid(seq_chain),
+        file_chain=context.file_chain,
         dist_df=dist_df,
         pair_list=pair_arr,
         dist_limit=cutoff,
@@ -210,3 +269,214 @@ def evaluate(
     )
     tool_results = p.fetch()
     p.compare(target=tool_results, cut_off=110)
+
+
+def evaluate_chain(
+    prot_name: str,
+    seq_chain: str,
+    fasta_fp: str,
+    pdb_fp: str,
+    dist_fp: str,
+    xml_fp: str,
+    tool_fp: str,
+    tools: List[str],
+    seq_sep_inferior: Optional[int] = None,
+    seq_sep_superior: Optional[int] = None,
+    cutoff: float = 5.5,
+    cut_offs: Optional[List[Union[int, str]]] = None,
+    context: Optional[ProteinContext] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate several tools on one protein chain.
+
+    Notes
+    -----
+        The distance file, PDB ids, Fasta ids and PDBTM XML are parsed once
+        and shared by all tools.
+
+    Parameters
+    ----------
+    prot_name : str
+        name of a protein in the prefix of a PDB file name (e.g., 1xqf in 1xqfA.pdb).
+    seq_chain : str
+        chain of a protein in the prefix of a PDB file name (e.g., A in 1xqfA.pdb).
+    fasta_fp : str
+        path where a target Fasta file is placed.
+    pdb_fp : str
+        path where a target PDB file is placed.
+    dist_fp : str
+        path where a file containing real distances between residues is placed.
+    xml_fp : str
+        path where a target XML file is placed.
+    tool_fp : str
+        path where protein residue contact map files are placed.
+    tools : List[str]
+        names of contact prediction tools (e.g., membrain2).
+    seq_sep_inferior : int, optional
+        The lower bounds of how far any two residues are in pairs.
+    seq_sep_superior : int, optional
+        The upper bounds of how far any two residues are in pairs.
+    cutoff : float, optional
+        distance cutoff to see whether two residues are in spatial contact, by default 5.5.
+    cut_offs : List[Union[int, str]], optional
+        numbers of top pairs to evaluate (see tmkit.contact.Evaluator.compare_cutoffs).
+    context : ProteinContext, optional
+        parsed inputs of the chain shared across calls, by default built from the paths above (its own cutoff is used if given).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row of metrics per tool and cutoff.
+    """
+    if context is None:
+        context = ProteinContext(
+            prot_name=prot_name,
+            seq_chain=seq_chain,
+            fasta_fp=fasta_fp,
+            pdb_fp=pdb_fp,
+            dist_fp=dist_fp,
+            xml_fp=xml_fp,
+            cutoff=cutoff,
+        )
+    dist_df = context.dist(
+        seq_sep_inferior=0,
+        seq_sep_superior=seq_sep_superior,
+    )
+    pair_arr = context.pair_list()
+
+    results = []
+    for tool in tools:
+        p = evaluator(
+            prot_name=prot_name,
+            file_chain=context.file_chain,
+            dist_df=dist_df,
+            pair_list=pair_arr,
+            dist_limit=cutoff,
+            tool_fp=tool_fp,
+            tool=tool,
+            seq_sep_inferior=seq_sep_inferior,
+            seq_sep_superior=seq_sep_superior,
+            sort_=2,
+        )
+        df = p.compare_cutoffs(
+            p.fetch(), cut_offs=cut_offs, len_seq=len(context.fasids)
+        )
+        df.insert(0, "tool", tool)
+        results.append(df)
+    df = pd.concat(results, ignore_index=True)
+    df.insert(0, "chain", seq_chain)
+    df.insert(0, "prot", prot_name)
+    return df
+
+
+def evaluate_batch(
+    prot_df: pd.DataFrame,
+    fasta_fp: str,
+    pdb_fp: str,
+    dist_fp: str,
+    xml_fp: str,
+    tool_fp: str,
+    tools: List[str],
+    sv_fpn: str,
+    seq_sep_inferior: Optional[int] = None,
+    seq_sep_superior: Optional[int] = None,
+    cutoff: float = 5.5,
+    cut_offs: Optional[List[Union[int, str]]] = None,
+    num_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate several tools on a list of protein chains over a process pool.
+
+    Notes
+    -----
+        Metric rows of a chain are appended to `sv_fpn` as soon as the chain
+        is finished. If `sv_fpn` already exists, (prot, chain, tool) triples
+        found in it are skipped, so an interrupted run can be resumed by
+        calling the function again. Chains that fail are reported and left
+        out of the file, so they are retried on the next run.
+
+    Parameters
+    ----------
+    prot_df : pd.DataFrame
+        A dataframe whose first two columns are protein names and chains (e.g., 1xqf and A).
+    fasta_fp : str
+        path where target Fasta files are placed.
+    pdb_fp : str
+        path where target PDB files are placed.
+    dist_fp : str
+        path where files containing real distances between residues are placed.
+    xml_fp : str
+        path where target XML files are placed.
+    tool_fp : str
+        path where protein residue contact map files are placed.
+    tools : List[str]
+        names of contact prediction tools (e.g., membrain2).
+    sv_fpn : str
+        path to a tab-separated results file.
+    seq_sep_inferior : int, optional
+        The lower bounds of how far any two residues are in pairs.
+    seq_sep_superior : int, optional
+        The upper bounds of how far any two residues are in pairs.
+    cutoff : float, optional
+        distance cutoff to see whether two residues are in spatial contact, by default 5.5.
+    cut_offs : List[Union[int, str]], optional
+        numbers of top pairs to evaluate (see tmkit.contact.Evaluator.compare_cutoffs).
+    num_workers : int, optional
+        number of worker processes, by default the number of CPUs. With 1,
+        chains are evaluated in the calling process.
+
+    Returns
+    -------
+    pd.DataFrame
+        All metric rows in `sv_fpn`.
+    """
+    done = set()
+    if os.path.exists(sv_fpn) and os.path.getsize(sv_fpn) > 0:
+        done_df = pd.read_csv(sv_fpn, sep="\t", dtype={"prot": str, "chain": str})
+        done = set(zip(done_df["prot"], done_df["chain"], done_df["tool"]))
+    jobs = []
+    for prot_name, seq_chain in prot_df.iloc[:, :2].astype(str).values.tolist():
+        tools_ = [t for t in tools if (prot_name, seq_chain, t) not in done]
+        if tools_:
+            jobs.append(
+                dict(
+                    prot_name=prot_name,
+                    seq_chain=seq_chain,
+                    fasta_fp=fasta_fp,
+                    pdb_fp=pdb_fp,
+                    dist_fp=dist_fp,
+                    xml_fp=xml_fp,
+                    tool_fp=tool_fp,
+                    tools=tools_,
+                    seq_sep_inferior=seq_sep_inferior,
+                    seq_sep_superior=seq_sep_superior,
+                    cutoff=cutoff,
+                    cut_offs=cut_offs,
+                )
+            )
+    print(
+        f"======>{len(jobs)} chains to evaluate, {len(done)} results found in {sv_fpn}"
+    )
+
+    def save(df: pd.DataFrame) -> None:
+        is_new = not os.path.exists(sv_fpn) or os.path.getsize(sv_fpn) == 0
+        df.to_csv(sv_fpn, sep="\t", mode="a", header=is_new, index=False)
+
+    if num_workers == 1:
+        for job in jobs:
+            try:
+                save(evaluate_chain(**job))
+            except Exception as e:
+                print(f"======>Failed {job['prot_name'] + job['seq_chain']}: {e!r}")
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(evaluate_chain, **job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    save(future.result())
+                except Exception as e:
+                    print(f"======>Failed {job['prot_name'] + job['seq_chain']}: {e!r}")
+    if not os.path.exists(sv_fpn):
+        return pd.DataFrame()
+    return pd.read_csv(sv_fpn, sep="\t", dtype={"prot": str, "chain": str})
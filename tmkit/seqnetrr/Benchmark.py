@@ -0,0 +1,639 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tmkit.seqnetrr.Controller import Controller
+
+
+class Benchmark:
+    """
+    Scaling benchmark of seqnetrr pipelines on synthetic sequences and
+    networks.
+
+    Notes
+    -----
+        For every configuration of the grid (length of a sequence,
+        window_size, pair_mode for bipartite, method), a Controller
+        pipeline is run with its stages (see Controller.stage) timed one
+        by one:
+
+            pairs: fasta ids of pairs (residues for cumulative).
+            position: 2d list of positions (see tmkit.seqnetrr.combo.Position).
+            windows: residues around pairs (see Controller.windows and
+                Controller.singles).
+            index: pair indices of gather and sparse (see
+                tmkit.seqnetrr.Index).
+            network: the network read for the array kernels of gather,
+                window and sparse (see Controller.netload).
+            assign: features of all pairs from the network (read anew
+                for assign modes other than gather, window and sparse).
+            save: features written to a .npy output, if is_sv.
+            stream: with block_size, the streaming pipeline of
+                Controller.stream (Controller.streaming if is_sv) in place
+                of all stages above.
+
+        Each stage gets a row of wall time in seconds, resident memory
+        when it starts (rss) and the peak resident memory while it runs
+        (peak_rss), in bytes. On Linux the peak is reset before every
+        stage (through /proc/self/clear_refs); elsewhere peak_rss is the
+        peak of the process so far, and peak_rss_reset is False.
+
+        Synthetic inputs are written once per length to work_dir: a
+        random sequence and a network of random scores of all pairs (or
+        of the top `net_ratio` of them), generated with numpy.
+
+        Without block_size, features of all pairs are held at once, as
+        in Controller.bipartite; e.g., bipartite with pair_mode patch or
+        memconp at len_seq 1500 and window_size 7 needs about 5 GiB.
+    """
+
+    stages = (
+        "pairs",
+        "position",
+        "windows",
+        "index",
+        "network",
+        "assign",
+        "save",
+        "stream",
+    )
+
+    def __init__(
+        self,
+        len_seqs: Sequence[int] = (100, 300, 600, 1000, 1500),
+        window_sizes: Sequence[int] = (1, 2, 3, 4, 5, 6, 7),
+        pair_modes: Sequence[str] = ("patch", "memconp", "cross", "unchanged"),
+        methods: Sequence[str] = ("unipartite", "bipartite", "cumulative"),
+        assign_mode: str = "gather",
+        seq_sep_inferior: int = 0,
+        seq_sep_superior: Optional[int] = None,
+        cumu_ratio: float = 1.0,
+        net_ratio: float = 1.0,
+        fill: float = 0.0,
+        block_size: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        is_sv: bool = False,
+        seed: int = 0,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        len_seqs : Sequence[int], optional
+            lengths of synthetic sequences.
+        window_sizes : Sequence[int], optional
+            window sizes.
+        pair_modes : Sequence[str], optional
+            modes of global pairs of bipartite: patch | memconp | cross | unchanged.
+        methods : Sequence[str], optional
+            pipelines: unipartite | bipartite | cumulative.
+        assign_mode : str, optional
+            mode of assignment (see tmkit.seqnetrr.Controller), by default "gather".
+        seq_sep_inferior : int, optional
+            the lower bound of how far any two residues are in pairs, by default 0.
+        seq_sep_superior : int, optional
+            the upper bound of how far any two residues are in pairs, by default None.
+        cumu_ratio : float, optional
+            cumulative ratio, by default 1.0.
+        net_ratio : float, optional
+            share of pairs listed in synthetic networks, by default 1.0
+            (all pairs); e.g., 0.05 keeps the top-scoring 5%.
+        fill : float, optional
+            score of pairs absent from networks with assign_mode sparse, by default 0.0.
+        block_size : int, optional
+            number of pairs per block of the streaming pipeline, by
+            default None (stages of the in-memory pipeline).
+        work_dir : str, optional
+            directory of synthetic inputs and outputs, by default a
+            temporary directory.
+        is_sv : bool, optional
+            whether to time saving features, by default False.
+        seed : int, optional
+            seed of synthetic inputs, by default 0.
+        verbose : bool, optional
+            whether to let pipelines print, by default False.
+        """
+        self.len_seqs = list(len_seqs)
+        self.window_sizes = list(window_sizes)
+        self.pair_modes = list(pair_modes)
+        self.methods = list(methods)
+        self.assign_mode = assign_mode
+        self.seq_sep_inferior = seq_sep_inferior
+        self.seq_sep_superior = seq_sep_superior
+        self.cumu_ratio = cumu_ratio
+        self.net_ratio = net_ratio
+        self.fill = fill
+        self.block_size = block_size
+        self.work_dir = work_dir
+        self.is_sv = is_sv
+        self.seed = seed
+        self.verbose = verbose
+
+    def path(self, name: str) -> str:
+        """
+        Path to a file in work_dir, which is made on first use.
+
+        Parameters
+        ----------
+        name : str
+            name of the file.
+
+        Returns
+        -------
+        str
+            path to the file.
+        """
+        if self.work_dir is None:
+            self.work_dir = tempfile.mkdtemp(prefix="seqnetrr_bench_")
+        os.makedirs(self.work_dir, exist_ok=True)
+        return os.path.join(self.work_dir, name)
+
+    def fasta(self, len_seq: int) -> str:
+        """
+        Write a random sequence of `len_seq` amino acids, unless written.
+
+        Parameters
+        ----------
+        len_seq : int
+            length of the sequence.
+
+        Returns
+        -------
+        str
+            path to the Fasta file.
+        """
+        fpn = self.path("seq_" + str(len_seq) + "_" + str(self.seed) + ".fasta")
+        if not os.path.exists(fpn):
+            rng = np.random.default_rng(self.seed)
+            aas = np.array(list("ACDEFGHIKLMNPQRSTVWY"))
+            with open(fpn, "w") as file:
+                file.write(
+                    ">seq_"
+                    + str(len_seq)
+                    + "\n"
+                    + "".join(aas[rng.integers(0, 20, len_seq)])
+                    + "\n"
+                )
+        return fpn
+
+    def net(self, len_seq: int) -> str:
+        """
+        Write a network of random scores of pairs, unless written.
+
+        Parameters
+        ----------
+        len_seq : int
+            length of the sequence.
+
+        Returns
+        -------
+        str
+            path to the network file, in three tab-separated columns of
+            fasta id 1, fasta id 2 and score (input_kind general).
+        """
+        fpn = self.path(
+            "net_"
+            + str(len_seq)
+            + "_"
+            + str(self.net_ratio)
+            + "_"
+            + str(self.seed)
+            + ".net"
+        )
+        if not os.path.exists(fpn):
+            rng = np.random.default_rng(self.seed)
+            id_1, id_2 = np.triu_indices(len_seq, k=1)
+            score = rng.random(id_1.shape[0])
+            if self.net_ratio < 1:
+                num = max(1, int(id_1.shape[0] * self.net_ratio))
+                kept = np.sort(np.argsort(-score, kind="stable")[:num])
+                id_1, id_2, score = id_1[kept], id_2[kept], score[kept]
+            np.savetxt(
+                fpn,
+                np.c_[id_1 + 1, id_2 + 1, score],
+                fmt=["%d", "%d", "%.6f"],
+                delimiter="\t",
+            )
+        return fpn
+
+    @staticmethod
+    def rss() -> Tuple[Optional[int], Optional[int]]:
+        """
+        Resident memory of this process and its peak, in bytes.
+
+        Returns
+        -------
+        Tuple[Optional[int], Optional[int]]
+            current and peak resident memory (None if unknown).
+        """
+        try:
+            with open("/proc/self/status") as file:
+                status = dict(line.split(":", 1) for line in file if ":" in line)
+            return (
+                int(status["VmRSS"].split()[0]) * 1024,
+                int(status["VmHWM"].split()[0]) * 1024,
+            )
+        except (OSError, KeyError, ValueError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None, None
+        ### ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return None, peak if sys.platform == "darwin" else peak * 1024
+
+    @staticmethod
+    def reset_peak() -> bool:
+        """
+        Reset the peak resident memory of this process to its current one.
+
+        Returns
+        -------
+        bool
+            whether the peak could be reset (Linux only).
+        """
+        try:
+            with open("/proc/self/clear_refs", "w") as file:
+                file.write("5")
+            return True
+        except OSError:
+            return False
+
+    def measure(
+        self,
+        stage: str,
+        func: Callable,
+        records: List[Dict],
+    ):
+        """
+        Run a stage and record its wall time and peak resident memory.
+
+        Parameters
+        ----------
+        stage : str
+            name of the stage (see `stages`).
+        func : Callable
+            the stage, taking no arguments.
+        records : List[Dict]
+            records to which that of the stage is appended.
+
+        Returns
+        -------
+            What func returns.
+        """
+        is_reset = self.reset_peak()
+        rss, _ = self.rss()
+        stime = time.perf_counter()
+        if self.verbose:
+            result = func()
+        else:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = func()
+        wall = time.perf_counter() - stime
+        _, peak_rss = self.rss()
+        records.append(
+            {
+                "stage": stage,
+                "time": wall,
+                "rss": rss,
+                "peak_rss": peak_rss,
+                "peak_rss_reset": is_reset,
+            }
+        )
+        return result
+
+    def configs(self) -> Iterator[Tuple[int, int, Optional[str], str]]:
+        """
+        Configurations of the grid. Unipartite and cumulative do not
+        depend on pair_mode, so they come once per window_size with
+        pair_mode None.
+
+        Yields
+        ------
+        Tuple[int, int, Optional[str], str]
+            len_seq, window_size, pair_mode and method.
+        """
+        for len_seq in self.len_seqs:
+            for window_size in self.window_sizes:
+                for method in self.methods:
+                    if method == "bipartite":
+                        for pair_mode in self.pair_modes:
+                            yield len_seq, window_size, pair_mode, method
+                    else:
+                        yield len_seq, window_size, None, method
+
+    def controller(
+        self,
+        len_seq: int,
+        window_size: int,
+        pair_mode: Optional[str],
+        method: str,
+    ) -> List[Dict]:
+        """
+        Stages of a pipeline of one configuration.
+
+        Parameters
+        ----------
+        len_seq : int
+            length of the sequence.
+        window_size : int
+            window size.
+        pair_mode : str
+            mode of global pairs of bipartite (None otherwise).
+        method : str
+            unipartite | bipartite | cumulative.
+
+        Returns
+        -------
+        List[Dict]
+            one record per stage run (see `measure`).
+        """
+        fasta_fpn = self.fasta(len_seq)
+        net_fpn = self.net(len_seq)
+        records = []
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            ### method None (or block_size without is_sv) builds a
+            ### Controller without running a pipeline
+            c = Controller(
+                method=None if self.block_size is None else method,
+                fasta_fpn=fasta_fpn,
+                net_fpn=net_fpn,
+                window_size=window_size,
+                seq_sep_inferior=self.seq_sep_inferior,
+                seq_sep_superior=self.seq_sep_superior,
+                pair_mode=pair_mode or "patch",
+                assign_mode=self.assign_mode,
+                input_kind="general",
+                cumu_ratio=self.cumu_ratio,
+                sv_fpn=self.path("features.npy"),
+                fill=self.fill,
+                block_size=self.block_size,
+            )
+        if self.block_size is not None:
+            self.measure(
+                "stream",
+                lambda: (
+                    c.streaming()
+                    if self.is_sv
+                    else sum(features.shape[0] for _, features in c.stream())
+                ),
+                records,
+            )
+            return self.annotate(records, len_seq, window_size, pair_mode, method)
+        ### stages of the pipeline are timed as Controller runs them
+        c.stage = lambda name, func, *args, **kwargs: self.measure(
+            name, lambda: func(*args, **kwargs), records
+        )
+        c.is_sv = self.is_sv
+        if self.verbose:
+            getattr(c, method)()
+        else:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                getattr(c, method)()
+        return self.annotate(records, len_seq, window_size, pair_mode, method)
+
+    def annotate(
+        self,
+        records: List[Dict],
+        len_seq: int,
+        window_size: int,
+        pair_mode: Optional[str],
+        method: str,
+    ) -> List[Dict]:
+        """
+        Add the configuration to records of its stages.
+
+        Returns
+        -------
+        List[Dict]
+            records.
+        """
+        for record in records:
+            record.update(
+                {
+                    "len_seq": len_seq,
+                    "window_size": window_size,
+                    "pair_mode": pair_mode,
+                    "method": method,
+                    "assign_mode": self.assign_mode,
+                }
+            )
+        return records
+
+    def run(self) -> pd.DataFrame:
+        """
+        Run all configurations of the grid.
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per stage of each configuration, with columns
+            len_seq, window_size, pair_mode, method, assign_mode, stage,
+            time, rss, peak_rss and peak_rss_reset.
+        """
+        records = []
+        for len_seq, window_size, pair_mode, method in self.configs():
+            print(
+                f"===>len_seq: {len_seq}, window_size: {window_size}, pair_mode: {pair_mode}, method: {method}"
+            )
+            stime = time.time()
+            records.extend(self.controller(len_seq, window_size, pair_mode, method))
+            print(f"======>total time: {time.time() - stime}s.")
+        return pd.DataFrame(
+            records,
+            columns=[
+                "len_seq",
+                "window_size",
+                "pair_mode",
+                "method",
+                "assign_mode",
+                "stage",
+                "time",
+                "rss",
+                "peak_rss",
+                "peak_rss_reset",
+            ],
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Run the benchmark from the command line, e.g.,
+
+        python -m tmkit.seqnetrr.Benchmark -l 100,300 -ws 1,2 -o bench.csv
+
+    Parameters
+    ----------
+    argv : List[str], optional
+        arguments, by default those of the command line.
+
+    Returns
+    -------
+    pd.DataFrame
+        records of stages (see `Benchmark.run`).
+    """
+
+    def ints(value):
+        return [int(v) for v in value.split(",")]
+
+    def strs(value):
+        return value.split(",")
+
+    parser = argparse.ArgumentParser(description="The seqnetrr benchmark module")
+    parser.add_argument(
+        "--len_seqs",
+        "-l",
+        metavar="len_seqs",
+        dest="l",
+        default="100,300,600,1000,1500",
+        type=ints,
+        help="int - lengths of synthetic sequences, separated by commas",
+    )
+    parser.add_argument(
+        "--window_sizes",
+        "-ws",
+        metavar="window_sizes",
+        dest="ws",
+        default="1,2,3,4,5,6,7",
+        type=ints,
+        help="int - window sizes, separated by commas",
+    )
+    parser.add_argument(
+        "--pair_modes",
+        "-pmode",
+        metavar="pair_modes",
+        dest="pmode",
+        default="patch,memconp,cross,unchanged",
+        type=strs,
+        help="str - modes of global pairs: patch | memconp | cross | unchanged, separated by commas",
+    )
+    parser.add_argument(
+        "--methods",
+        "-m",
+        metavar="methods",
+        dest="m",
+        default="unipartite,bipartite,cumulative",
+        type=strs,
+        help="str - pipelines: unipartite | bipartite | cumulative, separated by commas",
+    )
+    parser.add_argument(
+        "--assign_mode",
+        "-amode",
+        metavar="assign_mode",
+        dest="amode",
+        default="gather",
+        type=str,
+        help="str - mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | window (unipartite only) | sparse",
+    )
+    parser.add_argument(
+        "--seq_sep_inferior",
+        "-ssinf",
+        metavar="seq_sep_inferior",
+        dest="ssinf",
+        default=0,
+        type=int,
+        help="int - the lower bound of how far any two residues are in pairs",
+    )
+    parser.add_argument(
+        "--seq_sep_superior",
+        "-sssup",
+        metavar="seq_sep_superior",
+        dest="sssup",
+        default=None,
+        type=int,
+        help="int - the upper bound of how far any two residues are in pairs",
+    )
+    parser.add_argument(
+        "--cumu_ratio",
+        "-cr",
+        metavar="cumu_ratio",
+        dest="cr",
+        default=1.0,
+        type=float,
+        help="float - cumulative ratio",
+    )
+    parser.add_argument(
+        "--net_ratio",
+        "-nr",
+        metavar="net_ratio",
+        dest="nr",
+        default=1.0,
+        type=float,
+        help="float - share of pairs listed in synthetic networks",
+    )
+    parser.add_argument(
+        "--block_size",
+        "-bs",
+        metavar="block_size",
+        dest="bs",
+        default=None,
+        type=int,
+        help="int - number of pairs per block of the streaming pipeline",
+    )
+    parser.add_argument(
+        "--work_dir",
+        "-w",
+        metavar="work_dir",
+        dest="w",
+        default=None,
+        type=str,
+        help="str - directory of synthetic inputs",
+    )
+    parser.add_argument(
+        "--is_sv",
+        "-issv",
+        dest="issv",
+        action="store_true",
+        help="bool - time saving features as well",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        metavar="output",
+        dest="o",
+        default=None,
+        type=str,
+        help="str - output records to a CSV file",
+    )
+    args = parser.parse_args(argv)
+    df = Benchmark(
+        len_seqs=args.l,
+        window_sizes=args.ws,
+        pair_modes=args.pmode,
+        methods=args.m,
+        assign_mode=args.amode,
+        seq_sep_inferior=args.ssinf,
+        seq_sep_superior=args.sssup,
+        cumu_ratio=args.cr,
+        net_ratio=args.nr,
+        block_size=args.bs,
+        work_dir=args.w,
+        is_sv=args.issv,
+    ).run()
+    with pd.option_context(
+        "display.max_rows", None, "display.max_columns", None, "display.width", 200
+    ):
+        print(df)
+    if args.o is not None:
+        df.to_csv(args.o, index=False)
+    return df
+
+
+if __name__ == "__main__":
+    main()
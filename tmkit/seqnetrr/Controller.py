@@ -5,16 +5,23 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
-from typing import List
+from typing import Iterator, List, Tuple
 
 import argparse
+import contextlib
+import os
 import time
 
+import numpy as np
+import pandas as pd
+
 from tmkit.seqnetrr.combo.Length import length as plength
 from tmkit.seqnetrr.combo.Position import Position as pfasta
 from tmkit.seqnetrr.graph.Bipartite import Bipartite as bigraph
 from tmkit.seqnetrr.graph.Cumulative import Cumulative as cumugraph
 from tmkit.seqnetrr.graph.Unipartite import Unipartite as unigraph
+from tmkit.seqnetrr.Index import Index
+from tmkit.seqnetrr.Output import Output
 from tmkit.seqnetrr.window.Pair import Pair
 from tmkit.seqnetrr.window.Single import Single
 from tmkit.sequence import Fasta as sfasta
@@ -27,24 +34,32 @@ class Controller:
         method: str,
         fasta_fpn: str,
         net_fpn: str,
-        window_size: int=2,
-        seq_sep_inferior: int=0,
-        seq_sep_superior: int=None,
-        mode: str="internal",
-        pair_mode: str="patch",
-        assign_mode: str="hash",
-        input_kind: str="general",
-        list_2d: List=None,
-        cumu_ratio: float=None,
-        is_sv: bool=False,
-        sv_fpn: str=None,
+        window_size: int = 2,
+        seq_sep_inferior: int = 0,
+        seq_sep_superior: int = None,
+        mode: str = "internal",
+        pair_mode: str = "patch",
+        assign_mode: str = "hash",
+        input_kind: str = "general",
+        list_2d: List = None,
+        cumu_ratio: float = None,
+        is_sv: bool = False,
+        sv_fpn: str = None,
+        block_size: int = None,
+        index_cache: Index = None,
+        compression: str = None,
+        fill: float = 0.0,
     ):
         """
 
         Parameters
         ----------
         method: str
-            name of a contact prediction method. It can be one of PSICOV, FreeContact, CCMPred, Gremlin, GDCA, PlmDCA, MemConP, Membrain2, and DeepHelicon.
+            name of a pipeline: unipartite | bipartite | cumulative | all,
+            or a list of them. With several pipelines (all stands for the
+            three of them), the network is read once and features of each
+            pipeline come as a block of columns of the same pair rows
+            (see `graphs`).
         fasta_fpn: str
             path where a target Fasta file is placed.
         net_fpn: str
@@ -60,7 +75,7 @@ class Controller:
         pair_mode: str
             mode of global pairs: patch | memconp | cross | unchanged
         assign_mode: str
-            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy
+            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | window (unipartite only) | sparse
         input_kind: str
             input kind for relationships of a network file: general | simulate | freecontact | gdca | cmmpred | plmc
         list_2d: List
@@ -71,6 +86,32 @@ class Controller:
              if save files.
         sv_fpn: str
             path to where you want to save files.
+        block_size: int
+            number of pairs per block in streaming mode, by default None
+            (no streaming). In streaming mode, pairs are walked in blocks
+            and features are computed per block with the array kernels
+            (see `stream`), so memory is bounded by the block size rather
+            than the number of pairs. With is_sv, blocks are appended to
+            sv_fpn (see `streaming`); otherwise nothing is computed at
+            construction and the caller iterates `stream`.
+        index_cache: Index
+            a tmkit.seqnetrr.Index shared by pipelines, by default None
+            (index arrays are built for this pipeline only). Pairs,
+            windows around them and pair indices of gather mode depend
+            only on the length of a sequence, window_size, the
+            separation band and pair_mode, so they are built once and
+            looked up from it by later pipelines of the same length.
+        compression: str
+            compression of binary outputs (see tmkit.seqnetrr.Output), by
+            default None. If sv_fpn ends with .npy, .npz, .parquet, .h5 or
+            .hdf5, features are saved as a float32 block with a separate
+            metadata table of fasta ids and amino acids instead of text.
+        fill: float
+            score of pairs absent from the network, by default 0.0. With
+            assign_mode sparse, the network is held as compressed sparse
+            rows of the pairs it lists (see tmkit.seqnetrr.net.Sparse)
+            rather than a dense matrix, which suits networks of only
+            top-scoring pairs of long sequences.
         """
         self.pfwriter = pfwriter()
 
@@ -89,6 +130,12 @@ class Controller:
             self.list_2d = list_2d
             self.is_sv = is_sv
             self.sv_fpn = sv_fpn
+            self.block_size = block_size
+            self.index_cache = (
+                Index(max_bytes=0) if index_cache is None else index_cache
+            )
+            self.compression = compression
+            self.fill = fill
         else:
             self.parser = argparse.ArgumentParser(description="The dedupGene module")
             self.parser.add_argument(
@@ -98,7 +145,7 @@ class Controller:
                 dest="m",
                 required=True,
                 type=str,
-                help="str - a method can be: unipartite | bipartite | cumulative",
+                help="str - a method can be: unipartite | bipartite | cumulative | all, or several separated by commas",
             )
             self.parser.add_argument(
                 "--fasta_fpn",
@@ -161,7 +208,7 @@ class Controller:
                 dest="amode",
                 default="hash",
                 type=str,
-                help="str - mode of assignment: hash | hash_ori | hash_rl | pandas | numpy",
+                help="str - mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | window (unipartite only) | sparse",
             )
             self.parser.add_argument(
                 "--input_kind",
@@ -190,6 +237,33 @@ class Controller:
                 type=bool,
                 help="bool - to make sure if save to a file",
             )
+            self.parser.add_argument(
+                "--block_size",
+                "-bs",
+                metavar="block_size",
+                dest="bs",
+                default=None,
+                type=int,
+                help="int - number of pairs per block in streaming mode",
+            )
+            self.parser.add_argument(
+                "--compression",
+                "-cp",
+                metavar="compression",
+                dest="cp",
+                default=None,
+                type=str,
+                help="str - compression of .npz | .parquet | .h5 outputs",
+            )
+            self.parser.add_argument(
+                "--fill",
+                "-fill",
+                metavar="fill",
+                dest="fill",
+                default=0.0,
+                type=float,
+                help="float - score of pairs absent from a sparse network",
+            )
             self.parser.add_argument(
                 "--output_net",
                 "-o",
@@ -200,7 +274,7 @@ class Controller:
                 help="str - output net to a file.",
             )
             args = self.parser.parse_args()
-            self.method = args.m
+            self.method = args.m.split(",") if "," in args.m else args.m
             self.fasta_fpn = args.mol_f
             self.net_fpn = args.net_f
             self.window_size = args.ws
@@ -212,7 +286,21 @@ class Controller:
             self.cumu_ratio = args.cr
             self.is_sv = args.issv
             self.sv_fpn = args.o
+            self.block_size = args.bs
             self.list_2d = None
+            self.index_cache = Index(max_bytes=0)
+            self.compression = args.cp
+            self.fill = args.fill
+
+        if self.method == "all":
+            self.methods = ["unipartite", "bipartite", "cumulative"]
+        elif isinstance(self.method, (list, tuple)):
+            self.methods = list(self.method)
+        else:
+            self.methods = [self.method]
+        if len(self.methods) == 1:
+            self.method = self.methods[0]
+        self.columns = {}
 
         self.sequence = sfasta.get(fasta_fpn=self.fasta_fpn)
         self.len_seq = len(self.sequence)
@@ -225,7 +313,13 @@ class Controller:
         print(f"===>Mode: {mode}")
         print(f"===>Input kind: {self.input_kind}")
 
-        if self.method == "unipartite":
+        if self.block_size is not None:
+            print(f"===>Block size: {self.block_size}")
+            if self.is_sv:
+                self.streaming()
+        elif len(self.methods) > 1:
+            self.graphs()
+        elif self.method == "unipartite":
             self.unipartite()
         elif self.method == "bipartite":
             self.bipartite()
@@ -245,50 +339,59 @@ class Controller:
         """
         stime = time.time()
         # /* scenario of position */
-        pos_list = plength(
-            seq_sep_superior=self.seq_sep_superior,
-            seq_sep_inferior=self.seq_sep_inferior,
-        ).to_pair(self.len_seq)
+        pos_list = self.stage("pairs", self.pairs)
         # print(pos_list[:10])
 
         print(f"===>pair number: {len(pos_list)}")
 
         # /* position */
-        position = pfasta(self.sequence).pair(pos_list=pos_list)
+        position = self.stage("position", pfasta(self.sequence).pair, pos_list=pos_list)
         # print(position[:10])
 
         # /* window */
-        window_m_ids = Pair(
-            sequence=self.sequence,
-            position=position,
-            window_size=self.window_size,
-        ).mid()
+        window_m_ids = self.stage(
+            "windows", self.windows, position=position, pos_list=pos_list
+        )
         # print(window_m_ids[:10])
 
+        index = None
+        if self.assign_mode in ("gather", "sparse"):
+            index = self.stage(
+                "index",
+                self.index_cache.unipartite,
+                self.len_seq,
+                self.window_size,
+                seq_sep_inferior=self.seq_sep_inferior,
+                seq_sep_superior=self.seq_sep_superior,
+            )
         p = unigraph(
             sequence=self.sequence,
             window_size=self.window_size,
             window_m_ids=window_m_ids,
             input_kind=self.input_kind,
+            index=index,
         )
         # /* local ec scores */
         list_2d = position if self.list_2d == None else self.list_2d
-        p.assign(
+        width = len(list_2d[0]) if len(list_2d) else 0
+        mat = None
+        if self.assign_mode in ("gather", "window", "sparse"):
+            mat = self.stage("network", self.netload, p)
+        self.stage(
+            "assign",
+            p.assign,
             fpn=self.net_fpn,
             list_2d=list_2d,
             mode=self.assign_mode,
+            fill=self.fill,
+            mat=mat,
         )
         # print(list_2d[:10])
         print(f"===>total time: {time.time() - stime}s.")
         if self.is_sv:
-            print("===>saving...")
-            self.pfwriter.generic(
-                df=list_2d,
-                sv_fpn=self.sv_fpn,
-                header=None,
-                index=None,
+            self.stage(
+                "save", self.save, list_2d=list_2d, pos_list=pos_list, width=width
             )
-            print("===>saved!")
         return list_2d
 
     def bipartite(
@@ -305,22 +408,29 @@ class Controller:
         stime = time.time()
         print(f"===>Pair mode: {self.pair_mode}")
         # /* scenario of position */
-        pos_list = plength(
-            seq_sep_superior=self.seq_sep_superior,
-            seq_sep_inferior=self.seq_sep_inferior,
-        ).to_pair(self.len_seq)
+        pos_list = self.stage("pairs", self.pairs)
         print(f"===>pair number: {len(pos_list)}")
 
         # /* position */
-        position = pfasta(self.sequence).pair(pos_list=pos_list)
+        position = self.stage("position", pfasta(self.sequence).pair, pos_list=pos_list)
 
         # /* window */
-        window_m_ids = Pair(
-            sequence=self.sequence,
-            position=position,
-            window_size=self.window_size,
-        ).mid()
+        window_m_ids = self.stage(
+            "windows", self.windows, position=position, pos_list=pos_list
+        )
 
+        index = None
+        if self.assign_mode in ("gather", "sparse"):
+            index = self.stage(
+                "index",
+                self.index_cache.bipartite,
+                self.len_seq,
+                self.window_size,
+                seq_sep_inferior=self.seq_sep_inferior,
+                seq_sep_superior=self.seq_sep_superior,
+                pair_mode=self.pair_mode,
+                patch_size=2,
+            )
         p = bigraph(
             sequence=self.sequence,
             window_size=self.window_size,
@@ -328,28 +438,170 @@ class Controller:
             kind=self.pair_mode,
             patch_size=2,
             input_kind=self.input_kind,
+            index=index,
         )
         # /* global ec scores */
         list_2d = position if self.list_2d == None else self.list_2d
-        p.assign(
+        width = len(list_2d[0]) if len(list_2d) else 0
+        mat = None
+        if self.assign_mode in ("gather", "sparse"):
+            mat = self.stage("network", self.netload, p)
+        self.stage(
+            "assign",
+            p.assign,
             fpn=self.net_fpn,
             list_2d=list_2d,
             mode=self.assign_mode,
+            fill=self.fill,
+            mat=mat,
         )
         # print(list_2d[-5:])
 
         print(f"===>total time: {time.time() - stime}s.")
         if self.is_sv:
-            print("===>saving...")
-            self.pfwriter.generic(
-                df=list_2d,
-                sv_fpn=self.sv_fpn,
-                header=None,
-                index=None,
+            self.stage(
+                "save", self.save, list_2d=list_2d, pos_list=pos_list, width=width
             )
-            print("===>saved!")
         return list_2d
 
+    def pairs(
+        self,
+    ) -> np.ndarray:
+        """
+        Fasta ids of pairs within the separation band.
+
+        Returns
+        -------
+        np.ndarray
+            read-only 2d int32 array (see tmkit.seqnetrr.Index.pairs).
+
+        """
+        return self.index_cache.pairs(
+            self.len_seq,
+            seq_sep_inferior=self.seq_sep_inferior,
+            seq_sep_superior=self.seq_sep_superior,
+        )
+
+    def windows(
+        self,
+        position: List,
+        pos_list: np.ndarray,
+    ):
+        """
+        Residues around central residues of pairs.
+
+        Parameters
+        ----------
+        position: List
+            2d list of positions of pairs.
+        pos_list: np.ndarray
+            fasta ids of pairs (see `pairs`).
+
+        Returns
+        -------
+            With assign_mode gather, window or sparse, a read-only 3d int32
+            array (see tmkit.seqnetrr.Index.windows); otherwise, a 3d
+            list (see tmkit.seqnetrr.window.Pair.mid).
+
+        """
+        if self.assign_mode in ("gather", "window", "sparse"):
+            return self.index_cache.windows(
+                self.len_seq,
+                self.window_size,
+                seq_sep_inferior=self.seq_sep_inferior,
+                seq_sep_superior=self.seq_sep_superior,
+            )
+        return Pair(
+            sequence=self.sequence,
+            position=position,
+            window_size=self.window_size,
+        ).mid()
+
+    def singles(
+        self,
+        position: List,
+    ):
+        """
+        Residues around every residue.
+
+        Parameters
+        ----------
+        position: List
+            2d list of positions of residues.
+
+        Returns
+        -------
+            With assign_mode gather or sparse, a read-only 2d int32 array
+            (see tmkit.seqnetrr.Index.singles); otherwise, a 2d list (see
+            tmkit.seqnetrr.window.Single.mid).
+
+        """
+        if self.assign_mode in ("gather", "sparse"):
+            return self.index_cache.singles(self.len_seq, self.window_size)
+        return Single(
+            sequence=self.sequence,
+            position=position,
+            window_size=self.window_size,
+        ).mid()
+
+    def netload(
+        self,
+        p,
+    ):
+        """
+        Load the network for the array kernels of a graph.
+
+        Parameters
+        ----------
+        p
+            a tmkit.seqnetrr.graph.Unipartite or Bipartite.
+
+        Returns
+        -------
+            The padded dense matrix of the network (see
+            tmkit.seqnetrr.window.base.Pair.netmat), or with assign_mode
+            sparse, tmkit.seqnetrr.net.Sparse.
+
+        """
+        if self.assign_mode == "sparse":
+            return p.netsparse(fpn=self.net_fpn, fill=self.fill)
+        return p.netmat(fpn=self.net_fpn)
+
+    def stage(
+        self,
+        name: str,
+        func,
+        *args,
+        **kwargs,
+    ):
+        """
+        Run a stage of a pipeline.
+
+        Notes
+        -----
+            Pipelines run each of their stages (pairs, position, windows,
+            index, network, assign, features and save) through this
+            method, so a caller can time or trace them by replacing it on
+            an instance (see tmkit.seqnetrr.Benchmark).
+
+        Parameters
+        ----------
+        name: str
+            name of the stage.
+        func
+            the stage.
+        *args
+            positional arguments of func.
+        **kwargs
+            keyword arguments of func.
+
+        Returns
+        -------
+            What func returns.
+
+        """
+        return func(*args, **kwargs)
+
     def cumulative(
         self,
     ) -> List:
@@ -364,21 +616,20 @@ class Controller:
         print(f"cumulative ratio: {self.cumu_ratio}")
         stime = time.time()
         # /* scenario of position */
-        pos_list = plength(
-            seq_sep_superior=None,
-            seq_sep_inferior=None,
-        ).tosgl(self.len_seq)
+        pos_list = self.stage(
+            "pairs",
+            plength(seq_sep_superior=None, seq_sep_inferior=None).tosgl,
+            self.len_seq,
+        )
         print(f"===>pair number: {len(pos_list)}")
 
         # /* position */
-        position = pfasta(self.sequence).single(pos_list=pos_list)
+        position = self.stage(
+            "position", pfasta(self.sequence).single, pos_list=pos_list
+        )
 
         # /* window */
-        window_m_ids = Single(
-            sequence=self.sequence,
-            position=position,
-            window_size=self.window_size,
-        ).mid()
+        window_m_ids = self.stage("windows", self.singles, position=position)
 
         p = cumugraph(
             sequence=self.sequence,
@@ -388,21 +639,498 @@ class Controller:
         )
         # /* global ec scores */
         list_2d = position if self.list_2d == None else self.list_2d
-        p.assign(
+        width = len(list_2d[0]) if len(list_2d) else 0
+        cmap = None
+        if self.assign_mode in ("gather", "sparse"):
+            cmap = self.stage("network", p.file_initiator, fpn=self.net_fpn, sort_=8)
+        self.stage(
+            "assign",
+            p.assign,
             list_2d=list_2d,
             fpn=self.net_fpn,
             L=int(self.len_seq * self.cumu_ratio),
             simu_seq_len=None,
+            mode=self.assign_mode,
+            cmap=cmap,
         )
 
         print(f"===>total time: {time.time() - stime}s.")
         if self.is_sv:
-            print("===>saving...")
+            self.stage(
+                "save", self.save, list_2d=list_2d, pos_list=pos_list, width=width
+            )
+        return list_2d
+
+    def network(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the network once for all pipelines of `methods`.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The padded dense matrix of the network (see
+            tmkit.seqnetrr.window.base.Pair.netmat; with assign_mode
+            sparse, tmkit.seqnetrr.net.Sparse) and, if cumulative is
+            one of `methods`, cumulative features of all residues
+            (otherwise None).
+
+        """
+        p = unigraph(
+            sequence=self.sequence,
+            window_size=self.window_size,
+            window_m_ids=[],
+            input_kind=self.input_kind,
+        )
+        cmap = p.network(fpn=self.net_fpn)
+        if self.assign_mode == "sparse":
+            mat = p.netsparse(cmap=cmap, fill=self.fill)
+        else:
+            mat = p.netmat(cmap=cmap)
+        cumu = None
+        if "cumulative" in self.methods:
+            cumu = cumugraph(
+                sequence=self.sequence,
+                window_size=self.window_size,
+                window_m_ids=self.index_cache.singles(self.len_seq, self.window_size),
+                input_kind=self.input_kind,
+            ).features(cmap, L=int(self.len_seq * self.cumu_ratio))
+        return mat, cumu
+
+    def families(
+        self,
+        pos_list: np.ndarray,
+        window_m_ids: np.ndarray,
+        mat: np.ndarray,
+        cumu: np.ndarray = None,
+        is_cached: bool = False,
+    ) -> np.ndarray:
+        """
+        Features of pairs of every pipeline of `methods`, side by side.
+
+        Parameters
+        ----------
+        pos_list: np.ndarray
+            fasta ids of pairs.
+        window_m_ids: np.ndarray
+            windows around pairs (see tmkit.seqnetrr.window.Pair.mid_array).
+        mat: np.ndarray
+            padded dense matrix of the network (see `network`).
+        cumu: np.ndarray
+            cumulative features of all residues (see `network`).
+        is_cached: bool
+            whether pos_list holds all pairs of the separation band, so
+            pair indices are taken from index_cache.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of features; columns of each pipeline are recorded
+            in `columns`.
+
+        """
+        blocks = []
+        for method in self.methods:
+            if method == "unipartite":
+                is_window = self.assign_mode == "window"
+                p = unigraph(
+                    sequence=self.sequence,
+                    window_size=self.window_size,
+                    window_m_ids=window_m_ids,
+                    input_kind=self.input_kind,
+                    index=(
+                        self.index_cache.unipartite(
+                            self.len_seq,
+                            self.window_size,
+                            seq_sep_inferior=self.seq_sep_inferior,
+                            seq_sep_superior=self.seq_sep_superior,
+                        )
+                        if is_cached and not is_window
+                        else None
+                    ),
+                )
+                blocks.append(p.features(mat, mode="window" if is_window else "gather"))
+            elif method == "bipartite":
+                p = bigraph(
+                    sequence=self.sequence,
+                    window_size=self.window_size,
+                    window_m_ids=window_m_ids,
+                    kind=self.pair_mode,
+                    patch_size=2,
+                    input_kind=self.input_kind,
+                    index=(
+                        self.index_cache.bipartite(
+                            self.len_seq,
+                            self.window_size,
+                            seq_sep_inferior=self.seq_sep_inferior,
+                            seq_sep_superior=self.seq_sep_superior,
+                            pair_mode=self.pair_mode,
+                            patch_size=2,
+                        )
+                        if is_cached
+                        else None
+                    ),
+                )
+                blocks.append(p.features(mat))
+            elif method == "cumulative":
+                ### features of both residues of a pair
+                pairs = np.asarray(pos_list, dtype=np.int64).reshape(-1, 2)
+                blocks.append(
+                    np.concatenate(
+                        [cumu[pairs[:, 0] - 1], cumu[pairs[:, 1] - 1]], axis=1
+                    )
+                )
+            else:
+                raise ValueError(
+                    "`method` has yet to reach there.",
+                    "| unipartite | bipartite | cumulative | all",
+                )
+        start = 0
+        for method, block in zip(self.methods, blocks):
+            self.columns[method] = (start, start + block.shape[1])
+            start += block.shape[1]
+        return np.concatenate(blocks, axis=1).astype(np.float32, copy=False)
+
+    def graphs(
+        self,
+    ) -> List:
+        """
+        Pipelines of several methods in one pass.
+
+        Notes
+        -----
+            The network is read once into a dense matrix and pairs and
+            windows are built once, then features of each method are
+            computed with the array kernels (assign_mode window for
+            unipartite if it is set, gather otherwise). Cumulative
+            features of the two residues of a pair follow one another.
+            Column ranges of features of each method are in `columns`.
+
+        Returns
+        -------
+        2D list
+
+        """
+        stime = time.time()
+        print(f"===>Methods: {self.methods}")
+        print(f"===>Pair mode: {self.pair_mode}")
+        # /* scenario of position */
+        pos_list = self.stage("pairs", self.pairs)
+        print(f"===>pair number: {len(pos_list)}")
+
+        # /* position */
+        position = self.stage("position", pfasta(self.sequence).pair, pos_list=pos_list)
+
+        # /* window */
+        window_m_ids = self.stage(
+            "windows",
+            self.index_cache.windows,
+            self.len_seq,
+            self.window_size,
+            seq_sep_inferior=self.seq_sep_inferior,
+            seq_sep_superior=self.seq_sep_superior,
+        )
+
+        # /* ec scores of all methods */
+        mat, cumu = self.stage("network", self.network)
+        features = self.stage(
+            "features", self.families, pos_list, window_m_ids, mat, cumu, is_cached=True
+        )
+        for method, (start, stop) in self.columns.items():
+            print(f"===>{method} features: columns {start} to {stop - 1}")
+        list_2d = position if self.list_2d == None else self.list_2d
+        width = len(list_2d[0]) if len(list_2d) else 0
+        self.stage("assign", self.extend, list_2d, features)
+
+        print(f"===>total time: {time.time() - stime}s.")
+        if self.is_sv:
+            self.stage(
+                "save",
+                self.save,
+                list_2d=list_2d,
+                pos_list=pos_list,
+                width=width,
+                features=features,
+            )
+        return list_2d
+
+    def extend(
+        self,
+        list_2d: List,
+        features: np.ndarray,
+    ) -> List:
+        """
+        Append features to rows of positions.
+
+        Parameters
+        ----------
+        list_2d: List
+            2d list of positions.
+        features: np.ndarray
+            2d features, one row per row of list_2d.
+
+        Returns
+        -------
+        List
+            list_2d.
+
+        """
+        for row, feature in zip(list_2d, features.tolist()):
+            row.extend(feature)
+        return list_2d
+
+    def meta(
+        self,
+        pos_list,
+    ) -> dict:
+        """
+        Metadata columns of rows of features.
+
+        Parameters
+        ----------
+        pos_list
+            fasta ids of pairs (2 columns) or residues (1 column).
+
+        Returns
+        -------
+        dict
+            fasta ids and amino acids, as fasta_id and aa for residues,
+            or fasta_id_1, aa_1, fasta_id_2 and aa_2 for pairs.
+
+        """
+        seq = np.array(list(self.sequence))
+        ids = np.asarray(pos_list, dtype=np.int32)
+        ids = ids.reshape(ids.shape[0], -1)
+        if ids.shape[1] == 1:
+            return {"fasta_id": ids[:, 0], "aa": seq[ids[:, 0] - 1]}
+        return {
+            "fasta_id_1": ids[:, 0],
+            "aa_1": seq[ids[:, 0] - 1],
+            "fasta_id_2": ids[:, 1],
+            "aa_2": seq[ids[:, 1] - 1],
+        }
+
+    def save(
+        self,
+        list_2d: List,
+        pos_list,
+        width: int,
+        features: np.ndarray = None,
+    ) -> None:
+        """
+        Save results of a pipeline to sv_fpn.
+
+        Parameters
+        ----------
+        list_2d: List
+            2d list of positions followed by features.
+        pos_list
+            fasta ids of pairs or residues of rows of list_2d.
+        width: int
+            number of columns of list_2d before features.
+        features: np.ndarray
+            features of rows of list_2d, by default None (taken from
+            list_2d).
+
+        """
+        print("===>saving...")
+        if Output.is_binary(self.sv_fpn):
+            if features is None:
+                features = np.array([row[width:] for row in list_2d], dtype=np.float32)
+            Output(self.sv_fpn, compression=self.compression).write(
+                self.meta(pos_list),
+                features.reshape(len(list_2d), -1),
+            )
+        else:
             self.pfwriter.generic(
                 df=list_2d,
                 sv_fpn=self.sv_fpn,
                 header=None,
                 index=None,
             )
-            print("===>saved!")
-        return list_2d
+        print("===>saved!")
+
+    def stream(
+        self,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Streaming pipeline.
+
+        Notes
+        -----
+            The network is loaded once into a dense matrix (compressed
+            sparse rows with assign_mode sparse). Pairs are then
+            walked in blocks of `block_size` (see
+            tmkit.seqnetrr.combo.Length.blocks) and windows and features
+            are built per block as arrays, so neither the pair list nor
+            the position list nor the features of all pairs are held at
+            once. Unipartite features use assign_mode window if it is
+            set and gather otherwise; bipartite and cumulative features
+            use gather. Cumulative features come in one block of all
+            residues, unless with other methods (see `graphs`).
+
+        Yields
+        ------
+        Tuple[np.ndarray, np.ndarray]
+            fasta ids of pairs (2d int32 array; 1 column for cumulative)
+            and their features (2d array), block by block.
+
+        """
+        block_size = 1 << 16 if self.block_size is None else self.block_size
+        if len(self.methods) > 1:
+            window = Pair(
+                sequence=self.sequence, position=[], window_size=self.window_size
+            )
+            mat, cumu = self.network()
+            for pairs in plength(
+                seq_sep_superior=self.seq_sep_superior,
+                seq_sep_inferior=self.seq_sep_inferior,
+            ).blocks(self.len_seq, block_size=block_size):
+                yield pairs, self.families(pairs, window.mid_array(pairs), mat, cumu)
+            return
+        if self.method == "cumulative":
+            p = cumugraph(
+                sequence=self.sequence,
+                window_size=self.window_size,
+                window_m_ids=self.index_cache.singles(self.len_seq, self.window_size),
+                input_kind=self.input_kind,
+            )
+            yield np.arange(1, self.len_seq + 1, dtype=np.int32)[:, None], p.assign(
+                list_2d=None,
+                fpn=self.net_fpn,
+                L=int(self.len_seq * self.cumu_ratio),
+                simu_seq_len=None,
+                mode="gather",
+            )
+            return
+        if self.method == "unipartite":
+            graph, kwargs = unigraph, {}
+        else:
+            graph, kwargs = bigraph, {"kind": self.pair_mode, "patch_size": 2}
+        window = Pair(sequence=self.sequence, position=[], window_size=self.window_size)
+        mat = None
+        for pairs in plength(
+            seq_sep_superior=self.seq_sep_superior,
+            seq_sep_inferior=self.seq_sep_inferior,
+        ).blocks(self.len_seq, block_size=block_size):
+            p = graph(
+                sequence=self.sequence,
+                window_size=self.window_size,
+                window_m_ids=window.mid_array(pairs),
+                input_kind=self.input_kind,
+                **kwargs,
+            )
+            if mat is None and self.assign_mode == "sparse":
+                mat = p.netsparse(fpn=self.net_fpn, fill=self.fill)
+            elif mat is None:
+                mat = p.netmat(fpn=self.net_fpn)
+            if self.method == "unipartite":
+                yield pairs, p.features(
+                    mat, mode="window" if self.assign_mode == "window" else "gather"
+                )
+            else:
+                yield pairs, p.features(mat)
+
+    def rows(
+        self,
+        pairs: np.ndarray,
+        features: np.ndarray,
+        seq: np.ndarray,
+    ) -> pd.DataFrame:
+        """
+        Rows of a block in the text layout of the other pipelines.
+
+        Parameters
+        ----------
+        pairs: np.ndarray
+            2d array of fasta ids of a block (one column for cumulative).
+        features: np.ndarray
+            2d features of the block.
+        seq: np.ndarray
+            1d array of residues of the sequence.
+
+        Returns
+        -------
+        pd.DataFrame
+            fasta id, residue and pdb id per residue of a pair, a column of
+            zeros and then features.
+
+        """
+        columns = []
+        for k in range(pairs.shape[1]):
+            columns += [pairs[:, k], seq[pairs[:, k] - 1], pairs[:, k]]
+        columns.append(np.zeros(pairs.shape[0], dtype=np.int64))
+        return pd.concat(
+            [pd.DataFrame(dict(enumerate(columns))), pd.DataFrame(features)],
+            axis=1,
+        )
+
+    def streaming(
+        self,
+    ) -> int:
+        """
+        Streaming pipeline writing blocks to sv_fpn as they come.
+
+        Notes
+        -----
+            If sv_fpn ends with .npy, .npz, .parquet, .h5 or .hdf5,
+            blocks of float32 features and of their metadata are written
+            by tmkit.seqnetrr.Output as they come. Otherwise, rows are
+            appended to a tab-separated text file in the layout of the
+            other pipelines, i.e., position columns followed by features.
+
+        Returns
+        -------
+        int
+            number of rows written.
+
+        """
+        stime = time.time()
+        seq = np.array(list(self.sequence))
+        is_binary = Output.is_binary(self.sv_fpn)
+        if self.method == "cumulative":
+            num_rows = self.len_seq
+        else:
+            num_rows = plength(
+                seq_sep_superior=self.seq_sep_superior,
+                seq_sep_inferior=self.seq_sep_inferior,
+            ).count(self.len_seq)
+        print(f"===>pair number: {num_rows}")
+        start = 0
+        out = Output(self.sv_fpn, compression=self.compression) if is_binary else None
+        try:
+            with (
+                contextlib.nullcontext() if is_binary else open(self.sv_fpn, "w")
+            ) as file:
+                for pairs, features in self.stream():
+                    if is_binary:
+                        meta = self.meta(pairs)
+                        if start == 0:
+                            out.open(
+                                num_rows, features.shape[1], Output.records(meta).dtype
+                            )
+                        out.append(meta, features)
+                    else:
+                        self.rows(pairs, features, seq).to_csv(
+                            file, sep="\t", header=False, index=False
+                        )
+                    start += pairs.shape[0]
+                    print(
+                        f"======>{start}/{num_rows} rows streamed: "
+                        f"{time.time() - stime}s."
+                    )
+            if is_binary:
+                if start == 0:
+                    meta = self.meta(np.zeros((0, 2), dtype=np.int32))
+                    out.open(0, 0, Output.records(meta).dtype)
+                out.close()
+        except BaseException:
+            ### no partial output is left behind
+            if is_binary:
+                out.discard()
+            elif os.path.exists(self.sv_fpn):
+                os.remove(self.sv_fpn)
+            raise
+        print(f"===>total time: {time.time() - stime}s.")
+        return start
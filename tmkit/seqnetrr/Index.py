@@ -0,0 +1,247 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Callable, Optional, Tuple
+
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from tmkit.seqnetrr.combo.Length import length as plength
+from tmkit.seqnetrr.graph.Bipartite import Bipartite as bigraph
+from tmkit.seqnetrr.graph.Unipartite import Unipartite as unigraph
+from tmkit.seqnetrr.window.Pair import Pair
+
+
+class Index:
+    """
+    Factory of index arrays of seqnetrr pipelines, memoized by what they
+    depend on: the length of a sequence, window_size, the separation band
+    and the pair mode, but neither the sequence nor the network.
+
+    Notes
+    -----
+        Arrays are int32 and read-only, so one array can be handed to any
+        number of pipelines. The most recently used arrays are kept in
+        memory up to `max_bytes`. With `cache_dir`, arrays are also saved
+        as .npy files and later opened by memory map, so processes
+        pointed at the same directory build each array only once.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 1 << 30,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_bytes : int, optional
+            memory budget of arrays kept, by default 1 GiB. With 0, no
+            array is kept in memory.
+        cache_dir : str, optional
+            directory of .npy files of arrays, by default None (memory only).
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.nbytes = 0
+        self.cache = OrderedDict()
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(
+        self,
+        key: Tuple,
+        build: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Look up an array by key, or build it.
+
+        Parameters
+        ----------
+        key : Tuple
+            name of the array followed by its parameters.
+        build : Callable[[], np.ndarray]
+            function building the array.
+
+        Returns
+        -------
+        np.ndarray
+            read-only int32 array.
+        """
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        arr = None
+        fpn = None
+        if self.cache_dir is not None:
+            fpn = os.path.join(self.cache_dir, "_".join(str(k) for k in key) + ".npy")
+            if os.path.exists(fpn):
+                arr = np.load(fpn, mmap_mode="r")
+        if arr is None:
+            arr = np.ascontiguousarray(build(), dtype=np.int32)
+            arr.flags.writeable = False
+            if fpn is not None:
+                ### written aside and renamed, so other processes never
+                ### open a partial file
+                handle, tmp_fpn = tempfile.mkstemp(suffix=".npy", dir=self.cache_dir)
+                with os.fdopen(handle, "wb") as file:
+                    np.save(file, arr)
+                os.replace(tmp_fpn, fpn)
+        if arr.nbytes <= self.max_bytes:
+            self.cache[key] = arr
+            self.nbytes += arr.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self.cache.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return arr
+
+    def clear(self) -> None:
+        """
+        Drop arrays kept in memory; files in cache_dir are left.
+        """
+        self.cache.clear()
+        self.nbytes = 0
+
+    def pairs(
+        self,
+        len_seq: int,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Fasta ids of pairs within the separation band.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (num_pairs, 2) (see
+            tmkit.seqnetrr.combo.Length.to_array).
+        """
+        return self.get(
+            ("pairs", len_seq, seq_sep_inferior, seq_sep_superior),
+            lambda: plength(
+                seq_sep_inferior=seq_sep_inferior,
+                seq_sep_superior=seq_sep_superior,
+            ).to_array(len_seq),
+        )
+
+    def windows(
+        self,
+        len_seq: int,
+        window_size: int,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Residues around central residues of pairs, 0 beyond the sequence.
+
+        Returns
+        -------
+        np.ndarray
+            3d array of shape (num_pairs, 2, 2 * window_size + 1) (see
+            tmkit.seqnetrr.window.Pair.mid_array).
+        """
+        return self.get(
+            ("windows", len_seq, window_size, seq_sep_inferior, seq_sep_superior),
+            lambda: Pair(
+                sequence=" " * len_seq,
+                position=[],
+                window_size=window_size,
+            ).mid_array(self.pairs(len_seq, seq_sep_inferior, seq_sep_superior)),
+        )
+
+    def singles(
+        self,
+        len_seq: int,
+        window_size: int,
+    ) -> np.ndarray:
+        """
+        Residues around every residue, 0 beyond the sequence.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (len_seq, 2 * window_size + 1), laid out as
+            tmkit.seqnetrr.window.Single.mid.
+        """
+
+        def build():
+            ids = (
+                np.arange(1, len_seq + 1)[:, None]
+                + np.arange(-window_size, window_size + 1)[None, :]
+            )
+            ids[(ids < 1) | (ids > len_seq)] = 0
+            return ids
+
+        return self.get(("singles", len_seq, window_size), build)
+
+    def unipartite(
+        self,
+        len_seq: int,
+        window_size: int,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Residue pairs of window combinations of all pairs.
+
+        Returns
+        -------
+        np.ndarray
+            3d array (see tmkit.seqnetrr.graph.Unipartite.pairindex).
+        """
+        return self.get(
+            ("unipartite", len_seq, window_size, seq_sep_inferior, seq_sep_superior),
+            lambda: unigraph(
+                sequence=" " * len_seq,
+                window_size=window_size,
+                window_m_ids=self.windows(
+                    len_seq, window_size, seq_sep_inferior, seq_sep_superior
+                ),
+            ).pairindex(),
+        )
+
+    def bipartite(
+        self,
+        len_seq: int,
+        window_size: int,
+        seq_sep_inferior: Optional[int] = None,
+        seq_sep_superior: Optional[int] = None,
+        pair_mode: str = "patch",
+        patch_size: int = 2,
+    ) -> np.ndarray:
+        """
+        Global pairs of all pairs.
+
+        Returns
+        -------
+        np.ndarray
+            3d array (see tmkit.seqnetrr.graph.Bipartite.pairindex).
+        """
+        return self.get(
+            (
+                "bipartite",
+                len_seq,
+                window_size,
+                seq_sep_inferior,
+                seq_sep_superior,
+                pair_mode,
+                patch_size,
+            ),
+            lambda: bigraph(
+                sequence=" " * len_seq,
+                window_size=window_size,
+                window_m_ids=self.windows(
+                    len_seq, window_size, seq_sep_inferior, seq_sep_superior
+                ),
+                kind=pair_mode,
+                patch_size=patch_size,
+            ).pairindex(),
+        )
@@ -0,0 +1,381 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, Optional
+
+import os
+import zipfile
+
+import numpy as np
+
+
+class Output:
+    """
+    Numeric outputs of seqnetrr pipelines: a float32 feature block and a
+    separate metadata table of the residues (pairs) it describes.
+
+    Layout
+    ------
+        The format follows the suffix of sv_fpn.
+
+            .npy: features in sv_fpn and metadata as a structured array in
+                `meta_fpn(sv_fpn)` (e.g., x.meta.npy for x.npy), both
+                readable with np.load(..., mmap_mode="r").
+            .npz: arrays "features" and "meta" in one archive, deflated
+                if `compression` is set.
+            .parquet: features in sv_fpn as columns f0, f1, ... and
+                metadata in `meta_fpn(sv_fpn)`; `compression` is a codec
+                of pyarrow (e.g., "zstd"). Needs pyarrow.
+            .h5 and .hdf5: dataset "features" and one dataset per column
+                in group "meta"; `compression` is a filter of h5py (e.g.,
+                "gzip" or "lzf"). Needs h5py.
+
+        Metadata columns are fasta ids (int32) and amino acids (one
+        letter) of residues, e.g., fasta_id_1, aa_1, fasta_id_2 and aa_2
+        for pairs.
+
+        Rows are written block by block (see `open`, `append` and
+        `close`, or `discard` on failure), so a file can be filled
+        without holding all features.
+    """
+
+    suffixes = (".npy", ".npz", ".parquet", ".h5", ".hdf5")
+
+    def __init__(
+        self,
+        sv_fpn: str,
+        compression: Optional[str] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        sv_fpn : str
+            path to the output file; its suffix selects the format.
+        compression : str, optional
+            compression of the format, by default None (none).
+        """
+        self.sv_fpn = str(sv_fpn)
+        self.compression = compression
+        self.suffix = os.path.splitext(self.sv_fpn)[1].lower()
+        if self.suffix not in self.suffixes:
+            raise ValueError(
+                "`sv_fpn` has yet to reach there.",
+                "| .npy: float32 features and a .meta.npy metadata table",
+                "| .npz: features and metadata in one archive",
+                "| .parquet: features and a .meta.parquet metadata table",
+                "| .h5 or .hdf5: features and metadata in one HDF5 file",
+            )
+
+    @classmethod
+    def is_binary(cls, sv_fpn: str) -> bool:
+        """
+        Whether sv_fpn is written by `Output` rather than as text.
+
+        Parameters
+        ----------
+        sv_fpn : str
+            path to the output file.
+
+        Returns
+        -------
+        bool
+            True if its suffix is one of `suffixes`.
+        """
+        return os.path.splitext(str(sv_fpn))[1].lower() in cls.suffixes
+
+    @staticmethod
+    def meta_fpn(sv_fpn: str) -> str:
+        """
+        Path to the metadata table of a .npy or .parquet output.
+
+        Parameters
+        ----------
+        sv_fpn : str
+            path to the output file.
+
+        Returns
+        -------
+        str
+            sv_fpn with ".meta" before its suffix.
+        """
+        stem, suffix = os.path.splitext(str(sv_fpn))
+        return stem + ".meta" + suffix
+
+    @staticmethod
+    def records(meta: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Metadata columns as a structured array.
+
+        Parameters
+        ----------
+        meta : Dict[str, np.ndarray]
+            columns of metadata.
+
+        Returns
+        -------
+        np.ndarray
+            1d structured array with one field per column.
+        """
+        columns = {name: np.asarray(col) for name, col in meta.items()}
+        num_rows = len(next(iter(columns.values()))) if columns else 0
+        records = np.empty(
+            num_rows, dtype=[(name, col.dtype) for name, col in columns.items()]
+        )
+        for name, col in columns.items():
+            records[name] = col
+        return records
+
+    def open(
+        self,
+        num_rows: int,
+        num_features: int,
+        meta_dtype: np.dtype,
+    ) -> "Output":
+        """
+        Start writing an output.
+
+        Parameters
+        ----------
+        num_rows : int
+            number of rows to be appended in total.
+        num_features : int
+            number of features per row.
+        meta_dtype : np.dtype
+            structured dtype of metadata (see `records`).
+
+        Returns
+        -------
+        Output
+            itself, ready for `append`.
+        """
+        self.num_rows = int(num_rows)
+        self.num_features = int(num_features)
+        self.meta_dtype = np.dtype(meta_dtype)
+        self.start = 0
+        if self.suffix == ".npy":
+            self.file = open(self.sv_fpn, "wb")
+            self.meta_file = open(self.meta_fpn(self.sv_fpn), "wb")
+            self.header(
+                self.file, np.dtype(np.float32), (self.num_rows, self.num_features)
+            )
+            self.header(self.meta_file, self.meta_dtype, (self.num_rows,))
+        elif self.suffix == ".npz":
+            ### members of a zip file are written one at a time, so metadata
+            ### (a few bytes per row) is kept until features are done
+            self.file = zipfile.ZipFile(
+                self.sv_fpn,
+                "w",
+                compression=(
+                    zipfile.ZIP_DEFLATED if self.compression else zipfile.ZIP_STORED
+                ),
+                allowZip64=True,
+            )
+            self.member = self.file.open("features.npy", "w", force_zip64=True)
+            self.header(
+                self.member, np.dtype(np.float32), (self.num_rows, self.num_features)
+            )
+            self.meta_blocks = []
+        elif self.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self.schema = pa.schema(
+                [("f" + str(k), pa.float32()) for k in range(self.num_features)]
+            )
+            self.meta_schema = pa.schema(
+                [
+                    (
+                        name,
+                        (
+                            pa.string()
+                            if self.meta_dtype[name].kind == "U"
+                            else pa.from_numpy_dtype(self.meta_dtype[name])
+                        ),
+                    )
+                    for name in self.meta_dtype.names
+                ]
+            )
+            compression = self.compression or "none"
+            self.file = pq.ParquetWriter(
+                self.sv_fpn, self.schema, compression=compression
+            )
+            self.meta_file = pq.ParquetWriter(
+                self.meta_fpn(self.sv_fpn), self.meta_schema, compression=compression
+            )
+        else:
+            import h5py
+
+            self.file = h5py.File(self.sv_fpn, "w")
+            self.file.create_dataset(
+                "features",
+                shape=(self.num_rows, self.num_features),
+                dtype=np.float32,
+                chunks=True if self.compression and self.num_rows else None,
+                compression=self.compression if self.num_rows else None,
+            )
+            for name in self.meta_dtype.names:
+                dtype = self.meta_dtype[name]
+                self.file.create_dataset(
+                    "meta/" + name,
+                    shape=(self.num_rows,),
+                    dtype=(
+                        "S" + str(dtype.itemsize // 4) if dtype.kind == "U" else dtype
+                    ),
+                )
+        return self
+
+    def header(self, file, dtype: np.dtype, shape: tuple) -> None:
+        """
+        Write the header of a .npy array whose data follow block by block.
+
+        Parameters
+        ----------
+        file
+            binary file object.
+        dtype : np.dtype
+            data type of the array.
+        shape : tuple
+            shape of the array.
+        """
+        np.lib.format.write_array_header_1_0(
+            file,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": shape,
+            },
+        )
+
+    def append(
+        self,
+        meta: Dict[str, np.ndarray],
+        features: np.ndarray,
+    ) -> int:
+        """
+        Write a block of rows.
+
+        Parameters
+        ----------
+        meta : Dict[str, np.ndarray]
+            columns of metadata of the block.
+        features : np.ndarray
+            2d features of the block.
+
+        Returns
+        -------
+        int
+            number of rows written so far.
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        records = self.records(meta).astype(self.meta_dtype, copy=False)
+        stop = self.start + features.shape[0]
+        if self.suffix == ".npy":
+            self.file.write(features.tobytes())
+            self.meta_file.write(records.tobytes())
+        elif self.suffix == ".npz":
+            self.member.write(features.tobytes())
+            self.meta_blocks.append(records)
+        elif self.suffix == ".parquet":
+            import pyarrow as pa
+
+            self.file.write_table(
+                pa.Table.from_arrays(
+                    [pa.array(features[:, k]) for k in range(self.num_features)],
+                    schema=self.schema,
+                )
+            )
+            self.meta_file.write_table(
+                pa.Table.from_arrays(
+                    [pa.array(records[name]) for name in self.meta_dtype.names],
+                    schema=self.meta_schema,
+                )
+            )
+        else:
+            self.file["features"][self.start : stop] = features
+            for name in self.meta_dtype.names:
+                col = records[name]
+                if col.dtype.kind == "U":
+                    col = np.char.encode(col, "ascii")
+                self.file["meta/" + name][self.start : stop] = col
+        self.start = stop
+        return self.start
+
+    def close(self) -> str:
+        """
+        Finish writing an output.
+
+        Returns
+        -------
+        str
+            path to the output file.
+        """
+        if self.suffix == ".npz":
+            self.member.close()
+            with self.file.open("meta.npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(
+                    member,
+                    (
+                        np.concatenate(self.meta_blocks)
+                        if self.meta_blocks
+                        else np.empty(0, dtype=self.meta_dtype)
+                    ),
+                )
+            self.meta_blocks = []
+        elif self.suffix == ".npy":
+            self.meta_file.close()
+        elif self.suffix == ".parquet":
+            self.meta_file.close()
+        self.file.close()
+        if self.start != self.num_rows:
+            raise ValueError(
+                f"{self.start} rows written to {self.sv_fpn}, {self.num_rows} declared."
+            )
+        return self.sv_fpn
+
+    def discard(self) -> None:
+        """
+        Stop writing an output after a failure: close its open files and
+        remove what was written.
+        """
+        for name in ("member", "meta_file", "file"):
+            handle = getattr(self, name, None)
+            if handle is not None:
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+        fpns = [self.sv_fpn]
+        if self.suffix in (".npy", ".parquet"):
+            fpns.append(self.meta_fpn(self.sv_fpn))
+        for fpn in fpns:
+            if os.path.exists(fpn):
+                os.remove(fpn)
+
+    def write(
+        self,
+        meta: Dict[str, np.ndarray],
+        features: np.ndarray,
+    ) -> str:
+        """
+        Write all rows at once.
+
+        Parameters
+        ----------
+        meta : Dict[str, np.ndarray]
+            columns of metadata.
+        features : np.ndarray
+            2d features, one row per row of metadata.
+
+        Returns
+        -------
+        str
+            path to the output file.
+        """
+        features = np.asarray(features, dtype=np.float32)
+        self.open(features.shape[0], features.shape[1], self.records(meta).dtype)
+        self.append(meta, features)
+        return self.close()
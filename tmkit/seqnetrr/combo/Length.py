@@ -5,12 +5,13 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
-from typing import List
+from typing import Iterator, List, Tuple
 
-import pandas as pd
+import math
+
+import numpy as np
 
 from tmkit.seqnetrr.combo.Param import Param
-from tmkit.seqnetrr.combo.Separation import Separation
 
 
 class length(Param):
@@ -45,23 +46,129 @@ class length(Param):
         List
             2d list
         """
-        df_ = pd.DataFrame(self.computlib.num2arr(length))
         if kind == "standard":
-            return (
-                Separation(
-                    df=df_,
-                    first=0,
-                    second=1,
-                    is_sort=False,
-                    seq_sep_inferior=self.seq_sep_inferior,
-                    seq_sep_superior=self.seq_sep_superior,
-                ).extract().values.tolist()
-            )
+            return self.to_array(length).tolist()
         elif kind == "triangular":
             return self.computlib.num2triangular(length)
         elif kind == "under_triangular":
             return self.computlib.num2arr(length)
 
+    def to_array(self, length: int) -> np.ndarray:
+        """
+        Fasta ids of residue pairs of `to_pair` as an array.
+
+        Notes
+        -----
+            Only pairs within the separation band are enumerated, by
+            np.triu_indices from the smallest separation on, so all L^2
+            pairs are never built and filtered.
+
+        Parameters
+        ----------
+        length : int
+            the length of a molecular sequence
+
+        Returns
+        -------
+        np.ndarray
+            2d int32 array of fasta ids of pairs, of shape (n, 2), in the
+            order of `to_pair`.
+        """
+        sep_min, sep_max = self.band(length)
+        if sep_min > sep_max:
+            return np.zeros((0, 2), dtype=np.int32)
+        id_1, id_2 = np.triu_indices(length, k=sep_min)
+        if sep_max < length - 1:
+            keep = (id_2 - id_1) <= sep_max
+            id_1 = id_1[keep]
+            id_2 = id_2[keep]
+        pairs = np.empty((id_1.shape[0], 2), dtype=np.int32)
+        pairs[:, 0] = id_1 + 1
+        pairs[:, 1] = id_2 + 1
+        return pairs
+
+    def band(self, length: int) -> Tuple[int, int]:
+        """
+        Smallest and largest separations j - i of pairs kept by
+        seq_sep_inferior and seq_sep_superior (both exclusive), as
+        Separation.extract keeps them.
+
+        Parameters
+        ----------
+        length : int
+            the length of a molecular sequence
+
+        Returns
+        -------
+        Tuple[int, int]
+            The smallest and largest separations; the band is empty if
+            the first is larger than the second.
+        """
+        sep_min = 1
+        sep_max = length - 1
+        if self.seq_sep_inferior is not None:
+            sep_min = max(sep_min, math.floor(self.seq_sep_inferior) + 1)
+        if self.seq_sep_superior is not None:
+            sep_max = min(sep_max, math.ceil(self.seq_sep_superior) - 1)
+        return sep_min, sep_max
+
+    def blocks(self, length: int, block_size: int = 1 << 16) -> Iterator[np.ndarray]:
+        """
+        Lazily walk the pairs of `to_pair` in blocks.
+
+        Notes
+        -----
+            Pairs come in the order of `to_pair` (by the first and then
+            the second residue). Each block is computed from its range of
+            positions in that order, so memory is bounded by
+            `block_size` rather than the number of pairs.
+
+        Parameters
+        ----------
+        length : int
+            the length of a molecular sequence
+        block_size : int, optional
+            number of pairs per block, by default 65536
+
+        Yields
+        ------
+        np.ndarray
+            2d int32 array of fasta ids of pairs, of shape (<= block_size, 2).
+        """
+        sep_min, sep_max = self.band(length)
+        id_1 = np.arange(1, length + 1, dtype=np.int64)
+        counts = np.clip(
+            np.minimum(length, id_1 + sep_max) - (id_1 + sep_min) + 1,
+            0,
+            None,
+        )
+        offsets = np.r_[0, np.cumsum(counts)]
+        for start in range(0, int(offsets[-1]), block_size):
+            ids = np.arange(start, min(start + block_size, int(offsets[-1])))
+            rows = np.searchsorted(offsets, ids, side="right") - 1
+            block = np.empty((ids.shape[0], 2), dtype=np.int32)
+            block[:, 0] = id_1[rows]
+            block[:, 1] = id_1[rows] + sep_min + (ids - offsets[rows])
+            yield block
+
+    def count(self, length: int) -> int:
+        """
+        Number of pairs of `to_pair`.
+
+        Parameters
+        ----------
+        length : int
+            the length of a molecular sequence
+
+        Returns
+        -------
+        int
+            number of pairs.
+        """
+        sep_min, sep_max = self.band(length)
+        seps = np.arange(sep_min, sep_max + 1, dtype=np.int64)
+        return int((length - seps).sum())
+
     def tosgl(self, length: int) -> List:
         """
         Given length of a protein sequence, it gets fasta
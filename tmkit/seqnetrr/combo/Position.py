@@ -7,6 +7,10 @@ __maintainer__ = "Jianfeng Sun"
 
 from typing import List, Tuple
 
+import itertools
+
+import numpy as np
+
 
 class Position:
     def __init__(self, sequence: str):
@@ -59,31 +63,29 @@ class Position:
         Parameters
         ----------
         pos_list : List[Tuple[int, int]]
-            A list of tuples representing pairs of positions.
+            A list of tuples representing pairs of positions, or a 2d int
+            array of them (see tmkit.seqnetrr.combo.Length.to_array).
 
         Returns
         -------
         List[List[int]]
             A list of lists representing the distance matrix.
         """
-        seq_dict = self.todict(self.sequence)
-        len_pairs = len(pos_list)
-        dist_matrix = []
-        for id in range(len_pairs):
-            fas_id1 = pos_list[id][0]
-            fas_id2 = pos_list[id][1]
-            dist_matrix.append(
-                [
-                    fas_id1,
-                    seq_dict[fas_id1],
-                    fas_id1,
-                    fas_id2,
-                    seq_dict[fas_id2],
-                    fas_id2,
-                    0,
-                ]
+        pairs = np.asarray(pos_list, dtype=np.int64).reshape(-1, 2)
+        seq = np.array([""] + list(self.sequence), dtype=object)
+        fas_id1 = pairs[:, 0].tolist()
+        fas_id2 = pairs[:, 1].tolist()
+        return [
+            list(row) for row in zip(
+                fas_id1,
+                seq[pairs[:, 0]].tolist(),
+                fas_id1,
+                fas_id2,
+                seq[pairs[:, 1]].tolist(),
+                fas_id2,
+                itertools.repeat(0),
             )
-        return dist_matrix
+        ]
 
     def todict(self, seq: str) -> dict:
         """
@@ -24,6 +24,7 @@ class Bipartite(ecabPair.Pair):
         kind="memconp",
         patch_size=None,
         input_kind="general",
+        index=None,
     ):
         """
 
@@ -37,8 +38,10 @@ class Bipartite(ecabPair.Pair):
             list contains ids of residues in windows
         input_kind
             residue contact prediction method
+        index
+            precomputed `pairindex`, by default None
         """
-        super().__init__(sequence, window_size, window_m_ids)
+        super().__init__(sequence, window_size, window_m_ids, index=index)
         self.prrcreader = prrcreader(seq_sep_inferior=None, seq_sep_superior=None)
         if kind == "memconp":
             self.bigraph = [
@@ -191,7 +194,63 @@ class Bipartite(ecabPair.Pair):
         # print(global_pair_ids[0][0])
         return global_pair_ids
 
-    def assign(self, list_2d, fpn=None, simu_seq_len=100, mode="hash"):
+    def pairindex(self):
+        """
+        Global pairs of all pairs as an array.
+
+        Notes
+        -----
+            The index tensor is laid out as `pairids`: for each pair and
+            each position of the windows, one global pair per offset of
+            `self.bigraph`, sorted as (inf, sup). Offsets are broadcast
+            over windows of all pairs at once. Global pairs with a
+            residue beyond the sequence, or with two identical residues,
+            are masked to (0, 0).
+
+        Returns
+        -------
+        np.ndarray
+            3d int32 array of shape (num_pairs, num_to_dos_in_window, 2).
+
+        """
+        if self.index is not None:
+            return self.index
+        n = len(self.sequence)
+        windows = self.windows()
+        bigraph = np.asarray(self.bigraph, dtype=np.int32).reshape(-1, 2)
+        left = windows[:, 0, :, None] - bigraph[None, None, :, 0]
+        right = windows[:, 1, :, None] - bigraph[None, None, :, 1]
+        mask = (left >= 1) & (left <= n) & (right >= 1) & (right <= n)
+        mask &= (windows[:, 0, :, None] > 0) & (windows[:, 1, :, None] > 0)
+        mask &= left != right
+        index = np.empty(left.shape + (2,), dtype=np.int32)
+        np.minimum(left, right, out=index[..., 0])
+        np.maximum(left, right, out=index[..., 1])
+        index[~mask] = 0
+        return index.reshape(self.num_pairs, self.num_to_dos_in_window, 2)
+
+    def features(self, mat):
+        """
+        Features of all pairs from a dense network matrix.
+
+        Parameters
+        ----------
+        mat
+            padded dense matrix of a network (see `netmat`), or the
+            network in compressed sparse rows (see `netsparse`)
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (num_pairs, num_to_dos_in_window).
+
+        """
+        index = self.pairindex()
+        return mat[index[..., 0], index[..., 1]]
+
+    def assign(
+        self, list_2d, fpn=None, simu_seq_len=100, mode="hash", fill=0.0, mat=None
+    ):
         """
 
         Parameters
@@ -203,15 +262,44 @@ class Bipartite(ecabPair.Pair):
         simu_seq_len
             length of a simulated FASTA sequence
         mode
-            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy
+            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | sparse.
+            gather loads the network into a dense float32 matrix (see
+            `netmat`) and fills features of all pairs with one fancy-index
+            gather over `pairindex`. Pairs absent from the network are 0.
+            sparse gathers as gather does but from the pairs reported
+            only (see `netsparse`), and pairs absent get `fill`.
+        fill
+            score of pairs absent from the network in mode sparse, by
+            default 0.0
+        mat
+            the network already loaded by `netmat` (or `netsparse` in mode
+            sparse) for the array modes, by default None (read from fpn)
 
         Returns
         -------
-            2d array - list
+            2d array - list. With mode gather or sparse, a 2d float32 ndarray of
+            shape (num_pairs, num_to_dos_in_window) if list_2d is None;
+            otherwise, features are appended to rows of list_2d.
 
         """
         start_time = time.time()
         list_2d_ = list_2d
+        if mode in ("gather", "sparse"):
+            if mat is None and mode == "sparse":
+                mat = self.netsparse(fpn=fpn, simu_seq_len=simu_seq_len, fill=fill)
+            elif mat is None:
+                mat = self.netmat(fpn=fpn, simu_seq_len=simu_seq_len)
+            features = self.features(mat)
+            print(
+                "======>bipartite pair assignment: {time}s.".format(
+                    time=time.time() - start_time
+                )
+            )
+            if list_2d_ is None:
+                return features
+            for row, feature in zip(list_2d_, features.tolist()):
+                row.extend(feature)
+            return list_2d_
         if mode == "hash_rl":
             global_pair_ids = self.pairids()
             pairs_left = []
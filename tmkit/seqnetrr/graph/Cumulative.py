@@ -78,6 +78,37 @@ class Cumulative(ecabSgl.Single):
         """
         return 1 / (1 + np.exp(-value))
 
+    def features(
+        self,
+        cmap,
+        L: int,
+        is_activate: bool = False,
+    ) -> np.ndarray:
+        """
+        Cumulative scores of windows of all residues from a network.
+
+        Parameters
+        ----------
+        cmap : tmkit.contact.ContactMap
+            a network read with sort_=8.
+        L : int
+            number of top pairs per residue.
+        is_activate : bool, optional
+            whether to activate scores by the sigmoid function, by default False.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (num_aas, 2 * window_size + 1).
+        """
+        mm_ave = cmap.score[cmap.id_2 - cmap.id_1 > 0].sum() / self.len_seq
+        table = self.prrcreader.topsum(cmap, L=L, len_seq=self.len_seq) / mm_ave
+        if is_activate:
+            table = self.sigmoid(table)
+        ### residues beyond the sequence are 0
+        table[0] = 0
+        return table[self.windows()]
+
     def assign(
         self,
         list_2d: List[List[float]],
@@ -85,7 +116,9 @@ class Cumulative(ecabSgl.Single):
         simu_seq_len: int = 100,
         fpn: str = None,
         is_activate: bool = False,
-    ) -> List[List[float]]:
+        mode: str = "hash",
+        cmap=None,
+    ) -> Union[List[List[float]], np.ndarray]:
         """
         Assigns cumulative scores to a 2D list of floats.
 
@@ -101,14 +134,42 @@ class Cumulative(ecabSgl.Single):
             A string representing the file path name, by default None.
         is_activate : bool, optional
             A boolean value representing whether to activate the sigmoid function, by default False.
+        mode : str, optional
+            "gather" reads the network once and computes the top-L sums of
+            all residues at once (see tmkit.seqnetrr.net.Reader.topsum);
+            any other mode reads it twice and sums residue by residue. By
+            default "hash". "sparse" is the same as "gather", which only
+            holds pairs reported in the network.
+        cmap : tmkit.contact.ContactMap, optional
+            the network already read with sort_=8 for mode gather, by
+            default None (read from fpn).
 
         Returns
         -------
-        List[List[float]]
-            A 2D list.
+        Union[List[List[float]], np.ndarray]
+            A 2D list. With mode gather, a 2d ndarray of shape
+            (num_aas, 2 * window_size + 1) if list_2d is None; otherwise,
+            scores are appended to rows of list_2d.
         """
         start_time = time.time()
         list_2d_ = list_2d
+        if mode in ("gather", "sparse"):
+            if cmap is None:
+                cmap = self.file_initiator(
+                    fpn=simu_seq_len if self.input_kind == "simulate" else fpn,
+                    sort_=8,
+                )
+            features = self.features(cmap, L=L, is_activate=is_activate)
+            print(
+                "======>cumulative assignment: {time}s.".format(
+                    time=time.time() - start_time
+                )
+            )
+            if list_2d_ is None:
+                return features
+            for row, feature in zip(list_2d_, features.tolist()):
+                row.extend(feature)
+            return list_2d_
         mm_sum = self.file_initiator(
             fpn=simu_seq_len if self.input_kind == "simulate" else fpn,
             sort_=3,
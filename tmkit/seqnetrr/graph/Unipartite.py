@@ -23,6 +23,7 @@ class Unipartite(ecabPair.Pair):
         window_size: int,
         window_m_ids: list,
         input_kind: str="general",
+        index: np.ndarray=None,
     ):
         """
 
@@ -37,8 +38,10 @@ class Unipartite(ecabPair.Pair):
             list contains ids of residues in windows
         input_kind
             residue contact prediction method
+        index
+            precomputed `pairindex`, by default None
         """
-        super().__init__(sequence, window_size, window_m_ids)
+        super().__init__(sequence, window_size, window_m_ids, index=index)
         self.prrcreader = prrcreader(seq_sep_inferior=None, seq_sep_superior=None)
         self.input_kind = input_kind
         if self.input_kind == "general":
@@ -148,6 +151,96 @@ class Unipartite(ecabPair.Pair):
         )
         return local_pairs
 
+    def pairindex(self):
+        """
+        Residue pairs of window combinations of all pairs as an array.
+
+        Notes
+        -----
+            The index tensor is laid out as `pairids`: for each pair, the
+            2-combinations of the first window followed by those of the
+            second window, in the order of itertools.combinations, with
+            each combination sorted as (inf, sup). Residues beyond the
+            sequence are 0, so any combination holding one has 0 as inf.
+
+        Returns
+        -------
+        np.ndarray
+            3d int32 array of shape (num_pairs, 2 * stretch_window, 2).
+
+        """
+        if self.index is not None:
+            return self.index
+        windows = self.windows()
+        combo_1, combo_2 = np.triu_indices(self.aa_in_window_size, k=1)
+        ids_1 = windows[:, :, combo_1]
+        ids_2 = windows[:, :, combo_2]
+        ### min with 0 is 0, so a combination with a residue beyond the
+        ### sequence falls on the zero row of the padded matrix
+        index = np.empty(ids_1.shape + (2,), dtype=np.int32)
+        np.minimum(ids_1, ids_2, out=index[..., 0])
+        np.maximum(ids_1, ids_2, out=index[..., 1])
+        return index.reshape(self.num_pairs, 2 * self.stretch_window, 2)
+
+    def windowtable(self, mat):
+        """
+        Scores of window combinations of every residue, computed once.
+
+        Notes
+        -----
+            The combinations within the window of residue i are the same
+            for every pair holding i, so they are looked up once per
+            residue, in O(L * w^2), instead of once per pair. Windows are
+            residues i - window_size to i + window_size, as built by
+            tmkit.seqnetrr.window.Pair.mid.
+
+        Parameters
+        ----------
+        mat
+            padded dense matrix of a network (see `netmat`)
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (L + 1, stretch_window); row i holds the
+            scores of residue i and row 0 is unused.
+
+        """
+        len_seq = len(self.sequence)
+        ids = np.arange(len_seq + 1)[:, None] + np.arange(
+            -self.window_size, self.window_size + 1
+        )[None, :]
+        ids[(ids < 1) | (ids > len_seq)] = 0
+        combo_1, combo_2 = np.triu_indices(self.aa_in_window_size, k=1)
+        ids_1 = ids[:, combo_1]
+        ids_2 = ids[:, combo_2]
+        return mat[np.minimum(ids_1, ids_2), np.maximum(ids_1, ids_2)]
+
+    def features(self, mat, mode="gather"):
+        """
+        Features of all pairs from a dense network matrix.
+
+        Parameters
+        ----------
+        mat
+            padded dense matrix of a network (see `netmat`), or the
+            network in compressed sparse rows (see `netsparse`)
+        mode
+            gather (see `pairindex`) or window (see `windowtable`)
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (num_pairs, 2 * stretch_window).
+
+        """
+        if mode == "window":
+            table = self.windowtable(mat)
+            centers = self.centers()
+            return np.concatenate([table[centers[:, 0]], table[centers[:, 1]]], axis=1)
+        index = self.pairindex()
+        return mat[index[..., 0], index[..., 1]]
+
     def combo2x2(self, array):
         """
         Non-repeated 2x2 combination of elements of an array.
@@ -169,7 +262,9 @@ class Unipartite(ecabPair.Pair):
             combo.append(list(i))
         return combo
 
-    def assign(self, list_2d, fpn=None, simu_seq_len=100, mode="hash"):
+    def assign(
+        self, list_2d, fpn=None, simu_seq_len=100, mode="hash", fill=0.0, mat=None
+    ):
         """
         It uses a fast algorithm to generate CI features for given reflexive pairs.
 
@@ -243,15 +338,46 @@ class Unipartite(ecabPair.Pair):
         simu_seq_len
             length of a simulated FASTA sequence
         mode
-            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy
+            mode of assignment: hash | hash_ori | hash_rl | pandas | numpy | gather | window | sparse.
+            gather loads the network into a dense float32 matrix (see
+            `netmat`) and fills features of all pairs with one fancy-index
+            gather over `pairindex`. window concatenates two rows of the
+            per-residue table of `windowtable` for each pair. Pairs absent
+            from the network are 0 in both. sparse gathers as gather does
+            but from the pairs reported only (see `netsparse`), and pairs
+            absent get `fill`.
+        fill
+            score of pairs absent from the network in mode sparse, by
+            default 0.0
+        mat
+            the network already loaded by `netmat` (or `netsparse` in mode
+            sparse) for the array modes, by default None (read from fpn)
 
         Returns
         -------
-            2d array - list
+            2d array - list. With mode gather, window or sparse, a 2d float32 ndarray of
+            shape (num_pairs, 2 * stretch_window) if list_2d is None;
+            otherwise, features are appended to rows of list_2d.
 
         """
         start_time = time.time()
         list_2d_ = list_2d
+        if mode in ("gather", "window", "sparse"):
+            if mat is None and mode == "sparse":
+                mat = self.netsparse(fpn=fpn, simu_seq_len=simu_seq_len, fill=fill)
+            elif mat is None:
+                mat = self.netmat(fpn=fpn, simu_seq_len=simu_seq_len)
+            features = self.features(mat, mode="window" if mode == "window" else "gather")
+            print(
+                "======>unipartite pair assignment: {time}s.".format(
+                    time=time.time() - start_time
+                )
+            )
+            if list_2d_ is None:
+                return features
+            for row, feature in zip(list_2d_, features.tolist()):
+                row.extend(feature)
+            return list_2d_
         if mode == "hash_rl":
             local_pair_ids = self.pairids()
             # print(local_pair_ids[0])
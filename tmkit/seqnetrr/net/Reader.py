@@ -8,20 +8,34 @@ __maintainer__ = "Jianfeng Sun"
 import numpy as np
 import pandas as pd
 
+from tmkit.contact.ContactMap import ContactMap
+from tmkit.contact.Format import Format
+from tmkit.contact.Join import Join
 from tmkit.seqnetrr.combo.Separation import Separation as ppssep
+from tmkit.seqnetrr.net.Sparse import Sparse
 from tmkit.seqnetrr.ComputLib import ComputLib
 from tmkit.util.Reader import Reader as pfrreader
 from tmkit.util.Writer import Writer as pfwwriter
 
 
 class Reader:
-    def __init__(self, seq_sep_inferior=None, seq_sep_superior=None):
+    def __init__(
+        self,
+        seq_sep_inferior=None,
+        seq_sep_superior=None,
+        is_mmap=False,
+        cache=None,
+        fill=0.0,
+    ):
         self.__sort_ = -1
+        self.fill = fill
         self.seq_sep_inferior = seq_sep_inferior
         self.seq_sep_superior = seq_sep_superior
         self.pfrreader = pfrreader()
         self.pfwwriter = pfwwriter()
         self.computlib = ComputLib()
+        self.join = Join(id_1="id_1", id_2="id_2")
+        self.format = Format(is_mmap=is_mmap, cache=cache)
 
     @property
     def sort_(self):
@@ -30,7 +44,7 @@ class Reader:
     @sort_.setter
     def sort_(self, value):
         print("Please note that you are attempting externally.")
-        if value > 7 or value < 0:
+        if value > 9 or value < 0:
             raise ValueError(
                 "`sort_` has yet to reach there.",
                 "| 1: return results for entire-chain residue contacts.",
@@ -40,6 +54,8 @@ class Reader:
                 "| 5: return dict results of a predictor",
                 "| 6: return results of a residue of a predictor",
                 "| 7: return cumulative dict results of a predictor",
+                "| 8: return columnar results (ContactMap) of a predictor",
+                "| 9: return sparse results (Sparse) of a predictor, absent pairs as `fill`",
                 "| else: return raw results of a predictor",
                 "| beyond: you need to choose one of opts above.",
             )
@@ -62,37 +78,7 @@ class Reader:
         :param is_sort: False or True
         :return:
         """
-        dists_ = dist_df
-        recombine_ = recombine
-        len_recombine_ = recombine_.shape[0]
-        dists_["fasta_id_1"] = dists_["fasta_id_1"].astype(np.int)
-        dists_["fasta_id_2"] = dists_["fasta_id_2"].astype(np.int)
-        dists__ = pd.DataFrame()
-        dists__[0] = dists_["fasta_id_1"]
-        dists__[1] = dists_["fasta_id_2"]
-        dists__[2] = dists_.index.values
-        dist_dict = self.todict(dists__)
-        dist_ids = []
-        for i in range(len_recombine_):
-            id_1 = recombine_["id_1"][i]
-            id_2 = recombine_["id_2"][i]
-            # print(id_1, id_2)
-            # ### /* block 3.2 */ ###
-            dist_id = dist_dict[id_1][id_2]
-            dist_ids.append(dist_id)
-        recombine_dist = dists_.iloc[dist_ids]
-        recombine_dist.columns = [
-            "fasta_id_1",
-            "aa_1",
-            "pdb_id_1",
-            "fasta_id_2",
-            "aa_2",
-            "pdb_id_2",
-            "dist",
-            "is_contact",
-        ]
-        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
-        return recombine_, recombine_dist
+        return self.join.sort_1(recombine, dist_df)
 
     def sort_2(self, recombine, dist_df, pair_df):
         """
@@ -108,15 +94,12 @@ class Reader:
                                     |
                                     |
                                     ---> dist in fasta id (juery)
-            block 1.    clear variables
+            block 1.    encode pairs as int64 keys (see tmkit.contact.Join)
             block 2.
-                |---> block 2.1  predict dictionary
-                |---> block 2.2  distance dictionary
-            block 3.
-                |---> block 3.1  find dist ids
-                |---> block 3.2  find predict ids
-            block 4.    query predict ids
-            block 5.    query dist ids
+                |---> block 2.1  find predict ids by searchsorted
+                |---> block 2.2  find dist ids by searchsorted
+            block 3.    query predict ids
+            block 4.    query dist ids
             return:
             recombine of predictor in thm, recombine of distance in thm
 
@@ -125,61 +108,7 @@ class Reader:
         :param pair_df: a df of pairs
         :return: two dfs
         """
-        # #/*** block 1 ***/
-        predicts_ = recombine
-        dists_ = dist_df
-        pair_df_ = pair_df
-        pair_df_[2] = 0
-        # print(pair_df_)
-        # #/*** block 2 ***/
-        # #/*** block 2.1 ***/
-        predicts__ = pd.DataFrame()
-        predicts__[0] = predicts_["id_1"]
-        predicts__[1] = predicts_["id_2"]
-        predicts__[2] = predicts_.index.values
-        predict_dict = self.todict(predicts__)
-        # print(predict_dict)
-        # #/*** block 2.2 ***/
-        dists__ = pd.DataFrame()
-        dists__[0] = dists_["fasta_id_1"]
-        dists__[1] = dists_["fasta_id_2"]
-        dists__[2] = dists_.index.values
-        dist_dict = self.todict(dists__)
-        # print(dist_dict)
-        # #/*** block 3 ***/
-        pred_ids = []
-        dist_ids = []
-        len_pairs = pair_df_.shape[0]
-        for i in range(len_pairs):
-            id_1 = pair_df_[0][i]
-            id_2 = pair_df_[1][i]
-            try:
-                # #/*** block 3.1 ***/
-                pred_id = predict_dict[id_1][id_2]
-                pred_ids.append(pred_id)
-                # #/*** block 3.2 ***/
-                dist_id = dist_dict[id_1][id_2]
-                dist_ids.append(dist_id)
-            except KeyError:
-                continue
-        # #/*** block 4 ***/
-        recombine_pred = predicts_.iloc[pred_ids]
-        recombine_pred.columns = ["id_1", "id_2", "score"]
-        recombine_pred = recombine_pred.reset_index(inplace=False, drop=True)
-        # #/*** block 5 ***/
-        recombine_dist = dists_.iloc[dist_ids]
-        recombine_dist.columns = [
-            "fasta_id_1",
-            "aa_1",
-            "pdb_id_1",
-            "fasta_id_2",
-            "aa_2",
-            "pdb_id_2",
-            "dist",
-            "is_contact",
-        ]
-        recombine_dist = recombine_dist.reset_index(inplace=False, drop=True)
-        return recombine_pred, recombine_dist
+        return self.join.sort_2(recombine, dist_df, pair_df)
 
     def sort_3(
         self, recombine, is_sort=False, is_uniform=False, uniform_df=None, indicator=0
@@ -200,22 +129,9 @@ class Reader:
         # print(recombine_)
         # # /*** block 1 ***/
         if is_uniform:
-            predict_dict = self.todict(recombine_)
-            uniform_df[2] = indicator
-            # print(uniform_df)
-            uniform_list = uniform_df.values.tolist()
-            uniform_shape = len(uniform_list)
-            for i in range(uniform_shape):
-                id_1 = uniform_list[i][0]
-                id_2 = uniform_list[i][1]
-                try:
-                    uniform_list[i][2] = predict_dict[id_1][id_2]
-                except KeyError:
-                    continue
-            recombine_ = pd.DataFrame(uniform_list)
-            recombine_.columns = ["id_1", "id_2", "score"]
-            # print(recombine_)
-            # self.pfwwriter.generic(recombine_, sv_fpn='./cheer')
+            recombine_ = self.join.uniform(
+                recombine_, uniform_df=uniform_df, indicator=indicator
+            )
         # # /*** block 2 ***/
         recombine_ = ppssep(
             df=recombine_,
@@ -254,6 +170,31 @@ class Reader:
             cumu_dict[i + 1] = self.addition(recombine_cumu)
         return cumu_dict
 
+    def topsum(self, cmap, L, len_seq=0):
+        """
+        ..  @summary:
+            ---------
+            sums of the top L scores of pairs led by each residue, as
+            `cumulative` does, for all residues at once. Pairs are sorted
+            once by (id_1, score) so that each residue's pairs form one
+            run in descending order of scores, as the rows of a CSR
+            matrix; the first L of each run are summed by np.bincount.
+
+        :param cmap: results of a predictor in a ContactMap
+        :param L: number of top pairs per residue
+        :param len_seq: length of a sequence
+        :return: 1d array of sums indexed by residue id (0 unused)
+        """
+        id_1 = np.asarray(cmap.id_1, dtype=np.int64)
+        score = np.asarray(cmap.score, dtype=np.float64)
+        order = np.lexsort((-score, id_1))
+        id_1 = id_1[order]
+        score = score[order]
+        rank = np.arange(id_1.shape[0]) - np.searchsorted(id_1, id_1, side="left")
+        keep = rank < L
+        num = max(len_seq, int(id_1.max()) if id_1.shape[0] else 0)
+        return np.bincount(id_1[keep], weights=score[keep], minlength=num + 1)
+
     def addition(self, recombine):
         recombine_ = recombine
         cumu = recombine_["score"].sum()
@@ -265,59 +206,90 @@ class Reader:
         dicts = self.computlib.tactic1(arr_2d)
         return dicts
 
-    def mi(
+    def dispatch(
         self,
-        fpn,
+        cmap,
         dist_df=None,
         pair_list=None,
-        sort_=0,
         is_sort=False,
+        is_uniform=True,
         id=0,
         L=50,
         len_seq=50,
     ):
-        self.__sort_ = sort_
-        results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results.columns = ["id_1", "aa_1", "id_2", "aa_2", "score", "FC_score"]
-        recombine = results[["id_1", "id_2", "score"]]
+        """
+        ..  @description:
+            -------------
+            arrange results of a predictor by `sort_`.
+            block 1.    sort_ 1 and 2: results with distances
+            block 2.    sort_ 3 and 4: results in a separation window
+            block 3.    sort_ 5, 6 and 7: dict, per-residue and cumulative results
+            block 4.    sort_ 8: columnar results (tmkit.contact.ContactMap)
+            block 5.    sort_ 9: compressed sparse rows (tmkit.seqnetrr.net.Sparse)
+                        whose absent pairs are self.fill
+
+        :param cmap: results of a predictor in a ContactMap
+        :param is_uniform: if results are projected onto pair_list before sort_2
+        :return:
+        """
+        if self.__sort_ == 8:
+            return cmap
+        if self.__sort_ == 9:
+            return Sparse.from_cmap(cmap, fill=self.fill)
+        recombine = cmap.to_frame(id_1="id_1", id_2="id_2")
+        # #/*** block 1 ***/
         if self.__sort_ == 1:
             pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
             recombine = self.sort_3(
                 recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
             )
-            dist_mi, dist_true = self.sort_1(recombine, dist_df)
-            return dist_mi, dist_true
+            return self.sort_1(recombine, dist_df)
         elif self.__sort_ == 2:
             pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_mi, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_mi.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_mi), len(dist_true))
-            return dist_mi, dist_true
+            if is_uniform:
+                recombine = self.sort_3(
+                    recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
+                )
+            else:
+                recombine = self.sort_3(recombine, is_sort=is_sort)
+            return self.sort_2(recombine, dist_df, pair_df)
+        # #/*** block 2 ***/
         elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
+            return self.sort_3(recombine, is_sort=is_sort)
         elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
+            return self.sort_3(recombine, is_sort=False)
+        # #/*** block 3 ***/
         elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
+            return self.todict(recombine)
         elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
+            return self.sort_6(recombine, id=id, L=L)
         elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
+            return self.cumulative(recombine, L=L, len_seq=len_seq)
         else:
             return recombine
 
+    def mi(
+        self,
+        fpn,
+        dist_df=None,
+        pair_list=None,
+        sort_=0,
+        is_sort=False,
+        id=0,
+        L=50,
+        len_seq=50,
+    ):
+        self.__sort_ = sort_
+        return self.dispatch(
+            self.format.read("mi", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
+
     def freecontact(
         self,
         fpn,
@@ -330,46 +302,15 @@ class Reader:
         len_seq=50,
     ):
         self.__sort_ = sort_
-        results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results.columns = ["id_1", "aa_1", "id_2", "aa_2", "MI_score", "score"]
-        recombine = results[["id_1", "id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_fc, dist_true = self.sort_1(recombine, dist_df)
-            return dist_fc, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_fc, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_fc.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_fc), len(dist_true))
-            return dist_fc, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            self.format.read("freecontact", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
 
     def ccmpred(
         self,
@@ -383,53 +324,16 @@ class Reader:
         len_seq=50,
     ):
         self.__sort_ = sort_
-        file_results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results = []
-        for i, row in file_results.iterrows():
-            for j in range(file_results.shape[1]):
-                if i < j:
-                    # print(i+1, j+1, row[j])
-                    results.append([i + 1, j + 1, row[j]])
-        results = pd.DataFrame(results)
-        results.columns = ["id_1", "id_2", "score"]
-        recombine = results[["id_1", "id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_cp, dist_true = self.sort_1(recombine, dist_df)
-            return dist_cp, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            print(recombine.shape)
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            print(recombine.shape)
-            dist_cp, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_cp.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_cp), len(dist_true))
-            return dist_cp, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            self.format.read("ccmpred", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            is_uniform=False,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
 
     def gdca(
         self,
@@ -443,46 +347,15 @@ class Reader:
         len_seq=50,
     ):
         self.__sort_ = sort_
-        results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results.columns = ["id_1", "id_2", "score"]
-        recombine = results[["id_1", "id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_1(recombine, dist_df)
-            return dist_gdca, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_gdca.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_gdca), len(dist_true))
-            return dist_gdca, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            self.format.read("gdca", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
 
     def plmc(
         self,
@@ -496,46 +369,15 @@ class Reader:
         len_seq=50,
     ):
         self.__sort_ = sort_
-        results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results.columns = ["id_1", "aa_1", "id_2", "aa_2", "placeholder", "score"]
-        recombine = results[["id_1", "id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_plmc, dist_true = self.sort_1(recombine, dist_df)
-            return dist_plmc, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_plmc, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_plmc.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_plmc), len(dist_true))
-            return dist_plmc, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            self.format.read("plmc", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
 
     def general(
         self,
@@ -549,46 +391,15 @@ class Reader:
         len_seq=50,
     ):
         self.__sort_ = sort_
-        results = self.pfrreader.generic(fpn, df_sep=r"\s+", is_utf8=True)
-        results.columns = ["id_1", "id_2", "score"]
-        recombine = results[["id_1", "id_2", "score"]]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_1(recombine, dist_df)
-            return dist_gdca, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine, is_sort=is_sort, is_uniform=True, uniform_df=pair_df
-            )
-            dist_gdca, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_gdca.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_gdca), len(dist_true))
-            return dist_gdca, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            self.format.read("general", fpn, dtype=np.float64),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
 
     def simulate(
         self,
@@ -603,60 +414,22 @@ class Reader:
     ):
         self.__sort_ = sort_
         simu_seq_len = fpn
-        results = pd.DataFrame(self.computlib.numTo3cols(length=simu_seq_len))
+        ### all pairs (i < j) scored 1, in the order of ComputLib.numTo3cols
+        id_1, id_2 = np.triu_indices(simu_seq_len, k=1)
+        results = np.c_[id_1 + 1, id_2 + 1, np.ones(id_1.shape[0], dtype=np.int64)]
         print(results)
-        results.columns = [
-            "id_1",
-            "id_2",
-            "score",
-        ]
-        recombine = results[
-            [
-                "id_1",
-                "id_2",
-                "score",
-            ]
-        ]
-        if self.__sort_ == 1:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine,
-                is_sort=is_sort,
-                is_uniform=True,
-                uniform_df=pair_df,
-            )
-            dist_fc, dist_true = self.sort_1(recombine, dist_df)
-            return dist_fc, dist_true
-        elif self.__sort_ == 2:
-            pair_df = pd.DataFrame(pair_list)
-            # print(pair_df)
-            recombine = self.sort_3(
-                recombine,
-                is_sort=is_sort,
-                is_uniform=True,
-                uniform_df=pair_df,
-            )
-            dist_fc, dist_true = self.sort_2(recombine, dist_df, pair_df)
-            # dist_fc.to_csv('3rvy_helices.txt', sep='\t', header=None, index=False)
-            # print(len(dist_fc), len(dist_true))
-            return dist_fc, dist_true
-        elif self.__sort_ == 3:
-            recombine = self.sort_3(recombine, is_sort=is_sort)
-            return recombine
-        elif self.__sort_ == 4:
-            recombine = self.sort_3(recombine, is_sort=False)
-            return recombine
-        elif self.__sort_ == 5:
-            recombine_dict = self.todict(recombine)
-            return recombine_dict
-        elif self.__sort_ == 6:
-            recombine = self.sort_6(recombine, id=id, L=L)
-            return recombine
-        elif self.__sort_ == 7:
-            cumu_dict = self.cumulative(recombine, L=L, len_seq=len_seq)
-            return cumu_dict
-        elif self.__sort_ == 8:
-            pass
-        else:
-            return recombine
+        return self.dispatch(
+            ContactMap(
+                id_1=results[:, 0],
+                id_2=results[:, 1],
+                score=results[:, 2],
+                len_seq=simu_seq_len,
+                dtype=np.float64,
+            ),
+            dist_df=dist_df,
+            pair_list=pair_list,
+            is_sort=is_sort,
+            id=id,
+            L=L,
+            len_seq=len_seq,
+        )
@@ -0,0 +1,155 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Tuple
+
+import numpy as np
+
+
+class Sparse:
+    """
+    Scores of a network in compressed sparse rows, for networks that
+    list only some pairs (e.g., top-scoring ones).
+
+    Notes
+    -----
+        Pairs are sorted by (id_1, id_2) and held as int64 keys
+        id_1 * (len_seq + 1) + id_2 next to their scores, so memory
+        scales with the number of pairs reported rather than L^2.
+        `indptr` marks where pairs led by each residue start, as the rows
+        of a CSR matrix. It is indexed as the padded dense matrix of
+        tmkit.seqnetrr.window.base.Pair.netmat, i.e., sparse[id_1, id_2]
+        with arrays of ids: pairs absent from the network get `fill`,
+        and residue 0 (beyond the sequence) gets 0.
+    """
+
+    def __init__(
+        self,
+        id_1: np.ndarray,
+        id_2: np.ndarray,
+        score: np.ndarray,
+        len_seq: int,
+        fill: float = 0.0,
+        dtype: np.dtype = np.float32,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        id_1 : np.ndarray
+            first residue ids of pairs.
+        id_2 : np.ndarray
+            second residue ids of pairs.
+        score : np.ndarray
+            scores of pairs.
+        len_seq : int
+            length of the sequence.
+        fill : float, optional
+            score of pairs absent from the network, by default 0.0.
+        dtype : np.dtype, optional
+            data type of scores, by default np.float32.
+        """
+        self.len_seq = int(len_seq)
+        self.fill = fill
+        self.dtype = np.dtype(dtype)
+        keys = np.asarray(id_1, dtype=np.int64) * (self.len_seq + 1) + np.asarray(
+            id_2, dtype=np.int64
+        )
+        ### a pair reported twice keeps its last score, as in netmat
+        keys_rev = keys[::-1]
+        self.keys, first = np.unique(keys_rev, return_index=True)
+        self.data = np.asarray(score, dtype=self.dtype)[::-1][first]
+        self.indices = (self.keys % (self.len_seq + 1)).astype(np.int32)
+        self.indptr = np.searchsorted(
+            self.keys // (self.len_seq + 1),
+            np.arange(self.len_seq + 2),
+            side="left",
+        )
+
+    @classmethod
+    def from_cmap(
+        cls,
+        cmap,
+        len_seq: int = 0,
+        fill: float = 0.0,
+        dtype: np.dtype = np.float32,
+    ) -> "Sparse":
+        """
+        Build from a network read in columns.
+
+        Parameters
+        ----------
+        cmap : tmkit.contact.ContactMap
+            a network read with sort_=8.
+        len_seq : int, optional
+            length of the sequence, by default that of cmap if larger.
+        fill : float, optional
+            score of pairs absent from the network, by default 0.0.
+        dtype : np.dtype, optional
+            data type of scores, by default np.float32.
+
+        Returns
+        -------
+        Sparse
+            The network in compressed sparse rows.
+        """
+        return cls(
+            id_1=cmap.id_1,
+            id_2=cmap.id_2,
+            score=cmap.score,
+            len_seq=max(len_seq, cmap.len_seq),
+            fill=fill,
+            dtype=dtype,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.len_seq + 1, self.len_seq + 1
+
+    @property
+    def nnz(self) -> int:
+        return self.keys.shape[0]
+
+    def __getitem__(self, ids: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """
+        Scores of pairs, as fancy indexing of a dense matrix does.
+
+        Parameters
+        ----------
+        ids : Tuple[np.ndarray, np.ndarray]
+            first and second residue ids of pairs, of the same shape.
+
+        Returns
+        -------
+        np.ndarray
+            scores of the shape of ids.
+        """
+        id_1, id_2 = ids
+        id_1 = np.asarray(id_1, dtype=np.int64)
+        id_2 = np.asarray(id_2, dtype=np.int64)
+        keys = id_1 * (self.len_seq + 1) + id_2
+        pos = np.searchsorted(self.keys, keys)
+        pos[pos == self.nnz] = 0
+        found = self.keys[pos] == keys if self.nnz else np.zeros(keys.shape, dtype=bool)
+        scores = np.full(keys.shape, self.fill, dtype=self.dtype)
+        scores[found] = self.data[pos[found]]
+        scores[(id_1 == 0) | (id_2 == 0)] = 0
+        return scores
+
+    def todense(self) -> np.ndarray:
+        """
+        The padded dense matrix, with `fill` for pairs absent.
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (len_seq + 1, len_seq + 1).
+        """
+        mat = np.full(self.shape, self.fill, dtype=self.dtype)
+        mat[0, :] = 0
+        mat[:, 0] = 0
+        mat[self.keys // (self.len_seq + 1), self.indices] = self.data
+        return mat
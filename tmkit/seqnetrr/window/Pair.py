@@ -7,6 +7,8 @@ __maintainer__ = "Jianfeng Sun"
 
 import time
 
+import numpy as np
+
 
 class Pair:
     """
@@ -111,6 +113,33 @@ class Pair:
         )
         return window_m_ids
 
+    def mid_array(self, pairs=None):
+        """
+        Gets all of residues around central residues with a window size,
+        as an array.
+
+        Parameters
+        ----------
+        pairs
+            2d array of fasta ids of central residue pairs, by default
+            taken from columns 0 and 3 of position.
+
+        Returns
+        -------
+        np.ndarray
+            3d int32 array of shape (num_pairs, 2, 2 * window_size + 1),
+            laid out as `mid`, where residues beyond the sequence are 0
+            instead of None.
+
+        """
+        if pairs is None:
+            pairs = np.array([[pos[0], pos[3]] for pos in self.m_pairs], dtype=np.int32)
+        pairs = np.asarray(pairs, dtype=np.int32).reshape(-1, 2)
+        offsets = np.arange(-self.window_size, self.window_size + 1, dtype=np.int32)
+        window_m_ids = pairs[:, :, None] + offsets[None, None, :]
+        window_m_ids[(window_m_ids < 1) | (window_m_ids > self.len_seq)] = 0
+        return window_m_ids
+
     def mname(self, window_m_ids):
         """
         Gets all residues names corresponding to mid().
@@ -5,11 +5,15 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
+import numpy as np
+
+from tmkit.seqnetrr.net.Sparse import Sparse
+
 from tmkit.seqnetrr.ComputLib import ComputLib
 
 
 class Pair:
-    def __init__(self, sequence, window_size, window_m_ids):
+    def __init__(self, sequence, window_size, window_m_ids, index=None):
         """
 
         Notes
@@ -29,9 +33,14 @@ class Pair:
         window_size
             a window size
         window_m_ids
-            molecular ids in a window
+            molecular ids in a window, as a 3d list (None beyond the
+            sequence) or a 3d int array (0 beyond the sequence)
+        index
+            precomputed `pairindex` of window_m_ids, by default None
+            (see tmkit.seqnetrr.Index)
         """
         self.sequence = sequence
+        self.index = index
         self.window_size = window_size
         self.aa_in_window_size = 2 * window_size + 1
         self.window_m_ids = window_m_ids
@@ -40,3 +49,148 @@ class Pair:
             (self.window_size * 2 + 1) * (self.window_size * 2) / 2
         )
         self.computlib = ComputLib()
+
+    def windows(self):
+        """
+        Residue ids of windows as an array.
+
+        Returns
+        -------
+        np.ndarray
+            3d int32 array of shape (num_pairs, 2, 2 * window_size + 1),
+            where residues beyond the sequence (None in window_m_ids)
+            are 0.
+
+        """
+        if isinstance(self.window_m_ids, np.ndarray):
+            return self.window_m_ids.astype(np.int32, copy=False)
+        if self.num_pairs == 0:
+            return np.zeros((0, 2, self.aa_in_window_size), dtype=np.int32)
+        ids = np.fromiter(
+            (
+                0 if m_id is None else m_id
+                for pair in self.window_m_ids
+                for window in pair
+                for m_id in window
+            ),
+            dtype=np.int32,
+            count=self.num_pairs * 2 * self.aa_in_window_size,
+        )
+        return ids.reshape(self.num_pairs, 2, self.aa_in_window_size)
+
+    def centers(self):
+        """
+        Central residues of pairs.
+
+        Returns
+        -------
+        np.ndarray
+            2d int64 array of shape (num_pairs, 2).
+
+        """
+        if isinstance(self.window_m_ids, np.ndarray):
+            return self.window_m_ids[:, :, self.window_size].astype(np.int64)
+        return np.fromiter(
+            (window[self.window_size] for pair in self.window_m_ids for window in pair),
+            dtype=np.int64,
+            count=2 * self.num_pairs,
+        ).reshape(-1, 2)
+
+    def network(self, fpn=None, simu_seq_len=100):
+        """
+        Scores of a network in columns.
+
+        Parameters
+        ----------
+        fpn
+            path to a protein residue contact map file
+        simu_seq_len
+            length of a simulated FASTA sequence
+
+        Returns
+        -------
+        tmkit.contact.ContactMap
+            id_1, id_2 and score arrays of pairs as in the file.
+
+        """
+        return self.file_initiator(
+            fpn=simu_seq_len if self.input_kind == "simulate" else fpn,
+            sort_=8,
+        )
+
+    def netmat(self, fpn=None, simu_seq_len=100, dtype=np.float32, cmap=None):
+        """
+        Scores of a network as a dense matrix padded with a zero row and
+        column at 0.
+
+        Notes
+        -----
+            Cell [id_1, id_2] holds the score of pair (id_1, id_2) as
+            reported in the file, i.e., what evfold_dict[id_1][id_2] of
+            sort_=5 holds. Residue 0 stands for positions beyond the
+            sequence, so gathering with 0 yields 0 without masking.
+            Pairs absent from the file are 0.
+
+        Parameters
+        ----------
+        fpn
+            path to a protein residue contact map file
+        simu_seq_len
+            length of a simulated FASTA sequence
+        dtype
+            data type of scores, by default np.float32
+        cmap
+            a network already read by `network`, by default None (read
+            from fpn)
+
+        Returns
+        -------
+        np.ndarray
+            2d array of shape (L + 1, L + 1).
+
+        """
+        if cmap is None:
+            cmap = self.network(fpn=fpn, simu_seq_len=simu_seq_len)
+        num = max(len(self.sequence), cmap.len_seq)
+        mat = np.zeros((num + 1, num + 1), dtype=dtype)
+        mat[cmap.id_1, cmap.id_2] = cmap.score
+        return mat
+
+    def netsparse(
+        self, fpn=None, simu_seq_len=100, fill=0.0, dtype=np.float32, cmap=None
+    ):
+        """
+        Scores of a network in compressed sparse rows, indexed as the
+        matrix of `netmat`.
+
+        Notes
+        -----
+            Only pairs reported in the file are held, so networks listing
+            top-scoring pairs need not be inflated to all L^2 pairs.
+            Pairs absent from the file get `fill`.
+
+        Parameters
+        ----------
+        fpn
+            path to a protein residue contact map file
+        simu_seq_len
+            length of a simulated FASTA sequence
+        fill
+            score of pairs absent from the file, by default 0.0
+        dtype
+            data type of scores, by default np.float32
+        cmap
+            a network already read by `network`, by default None (read
+            from fpn)
+
+        Returns
+        -------
+        tmkit.seqnetrr.net.Sparse
+            The network.
+
+        """
+        if cmap is None:
+            cmap = self.network(fpn=fpn, simu_seq_len=simu_seq_len)
+        return Sparse.from_cmap(
+            cmap, len_seq=len(self.sequence), fill=fill, dtype=dtype
+        )
@@ -5,6 +5,8 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
+import numpy as np
+
 from tmkit.seqnetrr.ComputLib import ComputLib
 
 
@@ -40,3 +42,28 @@ class Single:
             (self.window_size * 2 + 1) * (self.window_size * 2) / 2
         )
         self.computlib = ComputLib()
+
+    def windows(self):
+        """
+        Residue ids of windows as an array.
+
+        Returns
+        -------
+        np.ndarray
+            2d int32 array of shape (num_pairs, 2 * window_size + 1),
+            where residues beyond the sequence (None in window_m_ids)
+            are 0.
+
+        """
+        if isinstance(self.window_m_ids, np.ndarray):
+            return self.window_m_ids.astype(np.int32, copy=False)
+        ids = np.fromiter(
+            (
+                0 if m_id is None else m_id
+                for window in self.window_m_ids
+                for m_id in window
+            ),
+            dtype=np.int32,
+            count=self.num_pairs * self.aa_in_window_size,
+        )
+        return ids.reshape(self.num_pairs, self.aa_in_window_size)
@@ -0,0 +1,285 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import Dict, Optional, Tuple
+
+import json
+
+import numpy as np
+
+from tmkit.util.Reader import Reader
+
+
+class Binary:
+    """
+    Compact binary layout of distance tables (`.distb`), opened by memory map.
+
+    Layout
+    ------
+        magic b"TMKDIST1", a little-endian uint32 header length, a JSON
+        header and then the arrays, each aligned to 64 bytes:
+
+            fasta_id: int16, one per residue.
+            aa: uint8 ASCII codes of amino acids, one per residue.
+            pdb_id: int16, one per residue.
+            dist: float16 or float32.
+            idx_1, idx_2: int16 residue positions of pairs, only for
+                residue-pair tables not stored as an upper triangle.
+
+        kind "rrc" holds residue pairs. With `is_triu`, pairs are all i < j
+        of the residues in row-major order, so only `dist` is stored.
+        kind "ppi" holds a residues x partner-chains matrix in `dist`.
+    """
+
+    magic = b"TMKDIST1"
+    align = 64
+
+    def write(
+        self,
+        sv_fpn: str,
+        kind: str,
+        arrays: Dict[str, np.ndarray],
+        meta: Optional[Dict] = None,
+    ) -> str:
+        """
+        Write arrays in the binary layout.
+
+        Parameters
+        ----------
+        sv_fpn : str
+            path to the binary file.
+        kind : str
+            "rrc" or "ppi".
+        arrays : Dict[str, np.ndarray]
+            arrays to store.
+        meta : Dict, optional
+            extra items of the header, by default None.
+
+        Returns
+        -------
+        str
+            path to the binary file.
+        """
+        header = {"kind": kind, "arrays": {}, **(meta or {})}
+        offset = 0
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            header["arrays"][name] = {
+                "dtype": arr.dtype.str,
+                "shape": list(arr.shape),
+                "offset": offset,
+            }
+            offset += -(-arr.nbytes // self.align) * self.align
+        head = json.dumps(header).encode()
+        start = len(self.magic) + 4 + len(head)
+        start = -(-start // self.align) * self.align
+        with open(sv_fpn, "wb") as file:
+            file.write(self.magic)
+            file.write(np.uint32(len(head)).tobytes())
+            file.write(head)
+            for name, arr in arrays.items():
+                file.seek(start + header["arrays"][name]["offset"])
+                file.write(np.ascontiguousarray(arr).tobytes())
+            file.truncate(start + offset)
+        return sv_fpn
+
+    def open(self, fpn: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """
+        Open a binary file by memory map.
+
+        Parameters
+        ----------
+        fpn : str
+            path to the binary file.
+
+        Returns
+        -------
+        Tuple[Dict, Dict[str, np.ndarray]]
+            The header and read-only memory-mapped arrays.
+        """
+        with open(fpn, "rb") as file:
+            if file.read(len(self.magic)) != self.magic:
+                raise ValueError(f"{fpn} is not a binary distance table.")
+            len_head = int(np.frombuffer(file.read(4), dtype="<u4")[0])
+            header = json.loads(file.read(len_head))
+        start = len(self.magic) + 4 + len_head
+        start = -(-start // self.align) * self.align
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            shape = tuple(spec["shape"])
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.zeros(shape, dtype=spec["dtype"])
+                continue
+            arrays[name] = np.memmap(
+                fpn,
+                dtype=spec["dtype"],
+                mode="r",
+                offset=start + spec["offset"],
+                shape=shape,
+            )
+        return header, arrays
+
+    def residues(
+        self,
+        fasta_id: np.ndarray,
+        aa: np.ndarray,
+        pdb_id: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Residue arrays in the binary layout.
+
+        Parameters
+        ----------
+        fasta_id : np.ndarray
+            Fasta ids of residues.
+        aa : np.ndarray
+            amino acids of residues.
+        pdb_id : np.ndarray
+            PDB ids of residues.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            fasta_id, aa and pdb_id arrays.
+        """
+        return {
+            "fasta_id": np.asarray(fasta_id, dtype=np.int16),
+            "aa": np.frombuffer("".join(aa).encode("ascii"), dtype=np.uint8).copy(),
+            "pdb_id": np.asarray(pdb_id, dtype=np.int16),
+        }
+
+    def from_rrc(
+        self,
+        dist_fpn: str,
+        sv_fpn: Optional[str] = None,
+        dtype: str = "float32",
+        is_triu: bool = True,
+    ) -> str:
+        """
+        Convert a residue-pair `.dist` text file (see tmkit.structure.rrc.Label).
+
+        Parameters
+        ----------
+        dist_fpn : str
+            path to the text file.
+        sv_fpn : str, optional
+            path to the binary file, by default dist_fpn with suffix `.distb`.
+        dtype : str, optional
+            "float32" or "float16" distances, by default "float32".
+        is_triu : bool, optional
+            store only distances if pairs are exactly all i < j of the
+            residues in row-major order; otherwise, or if False, pairs are
+            stored explicitly. By default True.
+
+        Returns
+        -------
+        str
+            path to the binary file.
+        """
+        df = Reader().generic(dist_fpn)
+        ### residues in either column of pairs, one row per Fasta id
+        ids = np.r_[df[0].values, df[3].values].astype(np.int64)
+        fasta_id, first = np.unique(ids, return_index=True)
+        aas = np.r_[df[1].values, df[4].values][first]
+        pdb_ids = np.r_[df[2].values, df[5].values][first]
+        idx_1 = np.searchsorted(fasta_id, df[0].values.astype(np.int64))
+        idx_2 = np.searchsorted(fasta_id, df[3].values.astype(np.int64))
+        arrays = self.residues(fasta_id, aas, pdb_ids)
+        num_res = fasta_id.shape[0]
+        triu_1, triu_2 = np.triu_indices(num_res, k=1)
+        is_triu = (
+            is_triu
+            and idx_1.shape[0] == triu_1.shape[0]
+            and (idx_1 == triu_1).all()
+            and (idx_2 == triu_2).all()
+        )
+        if not is_triu:
+            arrays["idx_1"] = idx_1.astype(np.int16)
+            arrays["idx_2"] = idx_2.astype(np.int16)
+        arrays["dist"] = df[6].values.astype(dtype)
+        if sv_fpn is None:
+            sv_fpn = (
+                dist_fpn[: -len(".dist")] if dist_fpn.endswith(".dist") else dist_fpn
+            )
+            sv_fpn += ".distb"
+        return self.write(
+            sv_fpn, kind="rrc", arrays=arrays, meta={"is_triu": bool(is_triu)}
+        )
+
+    def from_ppi(
+        self,
+        dist_fpn: str,
+        sv_fpn: Optional[str] = None,
+        dtype: str = "float32",
+    ) -> str:
+        """
+        Convert a per-residue `.dist` text file (see tmkit.structure.ppi.Label).
+
+        Parameters
+        ----------
+        dist_fpn : str
+            path to the text file.
+        sv_fpn : str, optional
+            path to the binary file, by default dist_fpn with suffix `.distb`.
+        dtype : str, optional
+            "float32" or "float16" distances, by default "float32".
+
+        Returns
+        -------
+        str
+            path to the binary file.
+        """
+        df = Reader().generic(dist_fpn)
+        arrays = self.residues(df[0].values, df[1].values, df[2].values)
+        arrays["dist"] = df.iloc[:, 3:].values.astype(dtype)
+        if sv_fpn is None:
+            sv_fpn = (
+                dist_fpn[: -len(".dist")] if dist_fpn.endswith(".dist") else dist_fpn
+            )
+            sv_fpn += ".distb"
+        return self.write(sv_fpn, kind="ppi", arrays=arrays)
+
+    def pairs(
+        self, header: Dict, arrays: Dict[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Residue positions of the pairs of a residue-pair table.
+
+        Parameters
+        ----------
+        header : Dict
+            header of the binary file.
+        arrays : Dict[str, np.ndarray]
+            arrays of the binary file.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            positions of the first and second residues of pairs.
+        """
+        if header.get("is_triu", False):
+            return np.triu_indices(arrays["fasta_id"].shape[0], k=1)
+        return (
+            np.asarray(arrays["idx_1"], dtype=np.int64),
+            np.asarray(arrays["idx_2"], dtype=np.int64),
+        )
+
+    def aa(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Amino acids from their uint8 ASCII codes.
+
+        Parameters
+        ----------
+        codes : np.ndarray
+            uint8 codes of amino acids.
+
+        Returns
+        -------
+        np.ndarray
+            1d object array of one-letter amino acids.
+        """
+        return np.asarray(codes, dtype=np.uint8).view("S1").astype("U1").astype(object)
@@ -0,0 +1,215 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tmkit.structure.rrc.Distance import Distance as rrcdistance
+
+
+class Distance(rrcdistance):
+    def __init__(
+        self,
+        pdb_fp: str,
+        prot_name: str,
+        seq_chain: str,
+        file_chain: str = "",
+        kind: str = "heavy",
+        radius: Optional[float] = None,
+        block: int = 4096,
+    ) -> None:
+        """
+        Distances from residues of a focus chain to every other chain of a
+        complex, in the format of `.dist` files read by
+        tmkit.structure.ppi.Label.
+
+        Notes
+        -----
+            The complex is parsed once and a KD-tree is built per partner
+            chain with scipy.spatial.cKDTree. scipy is an optional
+            dependency (pip install tmkit[ppi]); without it, atoms are
+            compared in blocks of `block` with numpy, which gives the same
+            distances more slowly. The distance of a residue to a chain is
+            the minimum distance of their atoms. With `radius`, chains whose
+            bounding boxes are farther than `radius` from the focus chain
+            are skipped and distances beyond `radius` are reported as inf,
+            which is enough for labelling interaction sites.
+
+        Parameters
+        ----------
+        pdb_fp : str
+            path where a target PDB file is placed.
+        prot_name : str
+            name of a protein in the prefix of a PDB file name (e.g., 1xqf in 1xqf.pdb).
+        seq_chain : str
+            focus chain of the complex (e.g., A).
+        file_chain : str, optional
+            chain of a protein in a PDB file name, by default "".
+        kind : str, optional
+            atoms taken for distances, "heavy", "cb" or "ca", by default "heavy".
+        radius : float, optional
+            distance cap in angstrom, by default None.
+        block : int, optional
+            number of focus atoms compared at a time without scipy, by default 4096.
+        """
+        super().__init__(
+            pdb_fp,
+            prot_name,
+            seq_chain,
+            file_chain=file_chain,
+            kind=kind,
+            block=block,
+        )
+        self.radius = radius
+
+    def partners(self) -> List[str]:
+        """
+        Chains of the complex other than the focus chain.
+
+        Returns
+        -------
+        List[str]
+            Chain ids in the order of the PDB file.
+        """
+        return [chain.id for chain in self.model if chain.id != self.seq_chain]
+
+    def nearest(
+        self,
+        coords: np.ndarray,
+        coords_partner: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Distance from each atom to its nearest atom of a partner chain.
+
+        Parameters
+        ----------
+        coords : np.ndarray
+            coordinates of atoms of the focus chain.
+        coords_partner : np.ndarray
+            coordinates of atoms of a partner chain.
+
+        Returns
+        -------
+        np.ndarray
+            1d float64 array of distances, inf beyond `radius`.
+        """
+        cap = np.inf if self.radius is None else float(self.radius)
+        if coords_partner.shape[0] == 0:
+            return np.full(coords.shape[0], np.inf)
+        if np.isfinite(cap):
+            ### bounding boxes farther apart than the cap: no query needed
+            gap = np.maximum(
+                0,
+                np.maximum(
+                    coords.min(0) - coords_partner.max(0),
+                    coords_partner.min(0) - coords.max(0),
+                ),
+            )
+            if np.sqrt((gap.astype(np.float64) ** 2).sum()) > cap:
+                return np.full(coords.shape[0], np.inf)
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            cKDTree = None
+        if cKDTree is not None:
+            dist, _ = cKDTree(coords_partner).query(
+                coords, k=1, distance_upper_bound=cap
+            )
+            return dist
+        coords = coords.astype(np.float64)
+        coords_partner = coords_partner.astype(np.float64)
+        norms_partner = np.einsum("ij,ij->i", coords_partner, coords_partner)
+        dist = np.empty(coords.shape[0], dtype=np.float64)
+        for i in range(0, coords.shape[0], self.block):
+            block = coords[i : i + self.block]
+            sq = np.einsum("ij,ij->i", block, block)[:, None] + norms_partner[None, :]
+            sq -= 2 * block @ coords_partner.T
+            dist[i : i + self.block] = np.sqrt(np.maximum(sq.min(1), 0))
+        dist[dist > cap] = np.inf
+        return dist
+
+    def extract(
+        self,
+        fasta_fpn: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Minimum distances of residues of the focus chain to each partner
+        chain in the `.dist` format.
+
+        Parameters
+        ----------
+        fasta_fpn : str, optional
+            path to the Fasta file of the focus chain, by default None.
+
+        Returns
+        -------
+        pd.DataFrame
+            fasta_id, aa and pdb_id of residues followed by one distance
+            column per partner chain.
+        """
+        pdb_ids, aas, coords, starts = self.atoms()
+        fas_ids, aas, pdb_ids = self.tofas(pdb_ids, aas, fasta_fpn=fasta_fpn)
+        num_res = fas_ids.shape[0]
+        df = pd.DataFrame({0: fas_ids, 1: aas, 2: pdb_ids})
+        ### residues without atoms of `kind` stay at inf
+        is_atom = np.r_[starts[1:], coords.shape[0]] > starts
+        for k, chain_id in enumerate(self.partners()):
+            _, _, coords_partner, _ = self.atoms(chain=self.model[chain_id])
+            dist = np.full(starts.shape[0], np.inf)
+            if is_atom.any():
+                dist[is_atom] = np.minimum.reduceat(
+                    self.nearest(coords, coords_partner), starts[is_atom]
+                )
+            df[k + 3] = dist[:num_res]
+        return df
+
+    def write(
+        self,
+        sv_fp: str,
+        fasta_fpn: Optional[str] = None,
+        is_binary: bool = False,
+    ) -> str:
+        """
+        Write distances to sv_fp + prot_name + file_chain + ".dist", or to
+        ".distb" if `is_binary`.
+
+        Parameters
+        ----------
+        sv_fp : str
+            path to save the file.
+        fasta_fpn : str, optional
+            path to the Fasta file of the focus chain, by default None.
+        is_binary : bool, optional
+            if True, write the binary layout of tmkit.structure.Binary with
+            float32 distances and partner chain ids, by default False.
+
+        Returns
+        -------
+        str
+            path to the written file.
+        """
+        df = self.extract(fasta_fpn=fasta_fpn)
+        sv_fpn = sv_fp + self.prot_name + self.file_chain + ".dist"
+        if is_binary:
+            from tmkit.structure.Binary import Binary
+
+            binary = Binary()
+            arrays = binary.residues(df[0].values, df[1].values, df[2].values)
+            arrays["dist"] = (
+                df.iloc[:, 3:].values.astype(np.float32).reshape(df.shape[0], -1)
+            )
+            sv_fpn = binary.write(
+                sv_fpn + "b",
+                kind="ppi",
+                arrays=arrays,
+                meta={"chains": self.partners()},
+            )
+        else:
+            df.to_csv(sv_fpn, sep="\t", header=False, index=False)
+        return sv_fpn
@@ -9,8 +9,10 @@ from typing import List
 
 import time
 
+import numpy as np
 import pandas as pd
 
+from tmkit.structure.Binary import Binary
 from tmkit.util.Reader import Reader
 
 
@@ -28,6 +30,8 @@ class Label:
         The chain of the protein.
     cutoff : int, optional
         The distance cutoff for labeling interactions, by default 6.
+    is_binary : bool, optional
+        Whether to open the binary `.distb` variant, by default False.
 
     Attributes
     ----------
@@ -50,7 +54,12 @@ class Label:
     """
 
     def __init__(
-        self, dist_path: str, prot_name: str, file_chain: str, cutoff: int = 6
+        self,
+        dist_path: str,
+        prot_name: str,
+        file_chain: str,
+        cutoff: int = 6,
+        is_binary: bool = False,
     ) -> None:
         """
         Parameters
@@ -63,11 +72,17 @@ class Label:
             The chain of the protein.
         cutoff : int, optional
             The distance cutoff for labeling interactions, by default 6.
+        is_binary : bool, optional
+            Whether to open the binary `.distb` variant by memory map
+            (see tmkit.structure.Binary), by default False.
         """
         self.prot_name: str = prot_name
         self.file_chain: str = file_chain
         self.dist_fpn: str = dist_path + self.prot_name + self.file_chain + ".dist"
         self.cutoff: int = cutoff
+        self.is_binary: bool = is_binary
+        if self.is_binary:
+            self.dist_fpn += "b"
         self.read = Reader()
 
     def attach(self) -> pd.DataFrame:
@@ -80,7 +95,20 @@ class Label:
             The labeled distance data.
         """
         start_time: float = time.time()
-        dist_df: pd.DataFrame = self.read.generic(self.dist_fpn)
+        if self.is_binary:
+            binary = Binary()
+            _, arrays = binary.open(self.dist_fpn)
+            dist_df = pd.DataFrame(
+                {
+                    0: np.asarray(arrays["fasta_id"], dtype=np.int64),
+                    1: binary.aa(arrays["aa"]),
+                    2: np.asarray(arrays["pdb_id"], dtype=np.int64),
+                }
+            )
+            for i in range(arrays["dist"].shape[1]):
+                dist_df[i + 3] = np.asarray(arrays["dist"][:, i], dtype=np.float64)
+        else:
+            dist_df = self.read.generic(self.dist_fpn)
         dists: pd.DataFrame = dist_df.iloc[:, 3:]
         dist_mins: pd.Series = dists.min(axis=1)
         inter_ids: List[int] = dist_mins.loc[dist_mins < self.cutoff].index.tolist()
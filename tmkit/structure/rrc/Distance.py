@@ -0,0 +1,306 @@
+__author__ = "Jianfeng Sun"
+__version__ = "v1.0"
+__copyright__ = "Copyright 2023"
+__license__ = "GPL v3.0"
+__email__ = "jianfeng.sunmt@gmail.com"
+__maintainer__ = "Jianfeng Sun"
+
+from typing import List, Optional, Tuple
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from tmkit.base import PDB as bpdb
+
+
+class Distance(bpdb.ID):
+    def __init__(
+        self,
+        pdb_fp: str,
+        prot_name: str,
+        seq_chain: str,
+        file_chain: str = "",
+        kind: str = "heavy",
+        block: int = 128,
+    ) -> None:
+        """
+        Distances between residues of a protein chain, computed from its
+        PDB file in the format of `.dist` files read by
+        tmkit.structure.rrc.Label.
+
+        Notes
+        -----
+            The distance of two residues is the minimum distance of their
+            atoms; residues without the atoms of `kind` (e.g., without
+            CA for kind ca) keep their place in the chain, and their
+            distances are inf. Residues are processed in blocks of `block` residues, so
+            memory holds one block of atom pairs at a time rather than all
+            atom pairs of the chain. Squared distances of a block come from
+            one matrix product in float64.
+
+        Parameters
+        ----------
+        pdb_fp : str
+            path where a target PDB file is placed.
+        prot_name : str
+            name of a protein in the prefix of a PDB file name (e.g., 1xqf in 1xqfA.pdb).
+        seq_chain : str
+            chain of a protein in the prefix of a PDB file name (e.g., A in 1xqfA.pdb).
+        file_chain : str, optional
+            chain of a protein in a PDB file name, by default "".
+        kind : str, optional
+            atoms taken for distances: "heavy" for all heavy atoms, "cb" for
+            C-beta (C-alpha of glycine) or "ca" for C-alpha, by default "heavy".
+        block : int, optional
+            number of residues per block, by default 128.
+        """
+        if kind not in ("heavy", "cb", "ca"):
+            raise ValueError(
+                "`kind` has yet to reach there.",
+                "| It can be one of heavy, cb and ca.",
+            )
+        from Bio import BiopythonWarning
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonWarning)
+            super().__init__(pdb_fp, prot_name, seq_chain, file_chain)
+        self.kind = kind
+        self.block = block
+
+    def atoms(
+        self,
+        chain=None,
+    ) -> Tuple[List[int], List[str], np.ndarray, np.ndarray]:
+        """
+        Atoms of standard residues of a chain. A residue without the atoms
+        of `kind` is kept with no atoms, so it still takes its Fasta id.
+
+        Parameters
+        ----------
+        chain : Bio.PDB.Chain.Chain, optional
+            a chain of the structure, by default the chain of `seq_chain`.
+
+        Returns
+        -------
+        Tuple[List[int], List[str], np.ndarray, np.ndarray]
+            PDB ids and amino acids of residues, float32 coordinates of
+            atoms, and the position of the first atom of each residue
+            (that of the next residue for a residue without atoms).
+        """
+        pdb_ids = []
+        aas = []
+        coords = []
+        starts = []
+        chain = self.pdb_chain if chain is None else chain
+        for residue in chain:
+            res_name = residue.get_resname()
+            if residue.id[0] != " " or res_name not in self.three_to_one:
+                continue
+            if self.kind == "heavy":
+                atoms = [a for a in residue if a.element not in ("H", "D")]
+            elif self.kind == "cb":
+                atoms = [residue[n] for n in ("CB", "CA") if n in residue][:1]
+            else:
+                atoms = [residue["CA"]] if "CA" in residue else []
+            pdb_ids.append(residue.id[1])
+            aas.append(self.three_to_one[res_name])
+            starts.append(len(coords))
+            coords.extend(a.get_coord() for a in atoms)
+        return (
+            pdb_ids,
+            aas,
+            np.asarray(coords, dtype=np.float32).reshape(-1, 3),
+            np.asarray(starts, dtype=np.int64),
+        )
+
+    def matrix(
+        self,
+        coords: Optional[np.ndarray] = None,
+        starts: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Minimum atom distances of all pairs of residues.
+
+        Parameters
+        ----------
+        coords : np.ndarray, optional
+            coordinates of atoms, by default taken from `atoms`.
+        starts : np.ndarray, optional
+            position of the first atom of each residue, by default taken from `atoms`.
+
+        Returns
+        -------
+        np.ndarray
+            L x L float32 matrix of distances, inf for residues without
+            atoms.
+        """
+        if coords is None or starts is None:
+            _, _, coords, starts = self.atoms()
+        num_res = starts.shape[0]
+        ends = np.r_[starts[1:], coords.shape[0]]
+        is_atom = ends > starts
+        if not is_atom.all():
+            ### atoms of the other residues stay contiguous without them
+            dist = np.full((num_res, num_res), np.inf, dtype=np.float32)
+            dist[np.ix_(is_atom, is_atom)] = self.matrix(
+                coords=coords, starts=starts[is_atom]
+            )
+            return dist
+        coords = coords.astype(np.float64)
+        norms = np.einsum("ij,ij->i", coords, coords)
+        dist = np.zeros((num_res, num_res), dtype=np.float32)
+        for i in range(0, num_res, self.block):
+            i_end = min(i + self.block, num_res)
+            ids_i = slice(starts[i], ends[i_end - 1])
+            for j in range(i, num_res, self.block):
+                j_end = min(j + self.block, num_res)
+                ids_j = slice(starts[j], ends[j_end - 1])
+                ### |a - b|^2 = |a|^2 + |b|^2 - 2ab, as one matrix product
+                sq = norms[ids_i, None] + norms[None, ids_j]
+                sq -= 2 * coords[ids_i] @ coords[ids_j].T
+                np.maximum(sq, 0, out=sq)
+                ### minimum over atoms of each residue along both axes
+                sq = np.minimum.reduceat(sq, starts[i:i_end] - starts[i], axis=0)
+                sq = np.minimum.reduceat(sq, starts[j:j_end] - starts[j], axis=1)
+                dist[i:i_end, j:j_end] = np.sqrt(sq)
+                dist[j:j_end, i:i_end] = dist[i:i_end, j:j_end].T
+        return dist
+
+    def tofas(
+        self,
+        pdb_ids: List[int],
+        aas: List[str],
+        fasta_fpn: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Map PDB residues to Fasta ids in order, as tmkit.id.Mapping does,
+        i.e., the k-th residue of the chain is given the k-th Fasta id.
+        If the chain and the Fasta sequence differ in length, the longer
+        one is cut to the shorter one with a warning.
+
+        Parameters
+        ----------
+        pdb_ids : List[int]
+            PDB ids of residues.
+        aas : List[str]
+            amino acids of residues.
+        fasta_fpn : str, optional
+            path to the Fasta file of the chain. Without it, Fasta ids are
+            1, 2, ..., L and amino acids are taken from the PDB file.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            Fasta ids, amino acids and PDB ids of mapped residues.
+        """
+        if fasta_fpn is not None:
+            from tmkit.id.Fasta import Fasta as idfasta
+
+            fasids = idfasta().get(fasta_fpn=fasta_fpn)
+            num_res = min(len(pdb_ids), len(fasids))
+            if len(pdb_ids) != len(fasids):
+                warnings.warn(
+                    "{} residues of chain {} of {} but {} in {}; both are "
+                    "cut to {}.".format(
+                        len(pdb_ids),
+                        self.seq_chain,
+                        self.prot_name,
+                        len(fasids),
+                        fasta_fpn,
+                        num_res,
+                    )
+                )
+            fas_ids = np.array([*fasids.keys()][:num_res])
+            aas = [*fasids.values()][:num_res]
+        else:
+            num_res = len(pdb_ids)
+            fas_ids = np.arange(1, num_res + 1)
+        return (
+            fas_ids,
+            np.array(aas[:num_res], dtype=object),
+            np.array(pdb_ids[:num_res]),
+        )
+
+    def extract(
+        self,
+        fasta_fpn: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Distances of all residue pairs i < j in the `.dist` format.
+
+        Parameters
+        ----------
+        fasta_fpn : str, optional
+            path to the Fasta file of the chain. Without it, Fasta ids are
+            1, 2, ..., L and amino acids are taken from the PDB file.
+
+        Returns
+        -------
+        pd.DataFrame
+            7 columns: fasta_id_1, aa_1, pdb_id_1, fasta_id_2, aa_2,
+            pdb_id_2 and dist.
+        """
+        pdb_ids, aas, coords, starts = self.atoms()
+        dist = self.matrix(coords=coords, starts=starts)
+        fas_ids, aas, pdb_ids = self.tofas(pdb_ids, aas, fasta_fpn=fasta_fpn)
+        id_1, id_2 = np.triu_indices(fas_ids.shape[0], k=1)
+        return pd.DataFrame(
+            {
+                0: fas_ids[id_1],
+                1: aas[id_1],
+                2: pdb_ids[id_1],
+                3: fas_ids[id_2],
+                4: aas[id_2],
+                5: pdb_ids[id_2],
+                6: dist[id_1, id_2].astype(np.float64),
+            }
+        )
+
+    def write(
+        self,
+        sv_fp: str,
+        fasta_fpn: Optional[str] = None,
+        is_binary: bool = False,
+    ) -> str:
+        """
+        Write distances to sv_fp + prot_name + file_chain + ".dist", or to
+        ".distb" if `is_binary`.
+
+        Parameters
+        ----------
+        sv_fp : str
+            path to save the file.
+        fasta_fpn : str, optional
+            path to the Fasta file of the chain, by default None.
+        is_binary : bool, optional
+            if True, write the upper triangle of float32 distances in the
+            binary layout of tmkit.structure.Binary, by default False.
+
+        Returns
+        -------
+        str
+            path to the written file.
+        """
+        sv_fpn = sv_fp + self.prot_name + self.file_chain + ".dist"
+        if is_binary:
+            from tmkit.structure.Binary import Binary
+
+            pdb_ids, aas, coords, starts = self.atoms()
+            dist = self.matrix(coords=coords, starts=starts)
+            fas_ids, aas, pdb_ids = self.tofas(pdb_ids, aas, fasta_fpn=fasta_fpn)
+            binary = Binary()
+            arrays = binary.residues(fas_ids, aas, pdb_ids)
+            num_res = fas_ids.shape[0]
+            arrays["dist"] = dist[:num_res, :num_res][np.triu_indices(num_res, k=1)]
+            return binary.write(
+                sv_fpn + "b",
+                kind="rrc",
+                arrays=arrays,
+                meta={"is_triu": True},
+            )
+        self.extract(fasta_fpn=fasta_fpn).to_csv(
+            sv_fpn, sep="\t", header=False, index=False
+        )
+        return sv_fpn
@@ -5,10 +5,13 @@ __license__ = "GPL v3.0"
 __email__ = "jianfeng.sunmt@gmail.com"
 __maintainer__ = "Jianfeng Sun"
 
+from typing import Tuple
+
 import numpy as np
 import pandas as pd
 
 from tmkit.position.scenario.Separation import Separation
+from tmkit.structure.Binary import Binary
 from tmkit.util.Reader import Reader
 
 
@@ -21,6 +24,7 @@ class Label:
         cutoff=5.5,
         seq_sep_inferior=None,
         seq_sep_superior=None,
+        is_binary=False,
     ):
         """
         Parameters
@@ -34,40 +38,91 @@ class Label:
             Chain of a protein in the prefix of a PDB file name (e.g., A in 1xqfA.pdb).
              Parameter file_chain will be converted within the function.
         cutoff
-            distance cutoff to see whether two residues are in spatial contact (e.g., 5.5 angstrom).
+            distance cutoff to see whether two residues are in spatial contact (e.g., 5.5 angstrom),
+            or a list of cutoffs (e.g., [5.5, 6, 8, 12]) labelled at once by `labels`.
         seq_sep_inferior
             The lower bounds of how far any two residues are in pairs.
         seq_sep_superior
             The upper bounds of how far any two residues are in pairs.
+        is_binary
+            Whether to open the binary `.distb` variant by memory map
+            (see tmkit.structure.Binary), by default False.
         """
         self.prot_name = prot_name
         self.file_chain = file_chain
         self.dist_fpn = dist_path + self.prot_name + self.file_chain + ".dist"
         self.cutoff = cutoff
+        self.cutoffs = (
+            list(cutoff) if isinstance(cutoff, (list, tuple, np.ndarray)) else [cutoff]
+        )
         self.seq_sep_inferior = seq_sep_inferior
         self.seq_sep_superior = seq_sep_superior
+        self.is_binary = is_binary
+        if self.is_binary:
+            self.dist_fpn = dist_path + self.prot_name + self.file_chain + ".distb"
 
     def attach(self) -> pd.DataFrame:
         """
         Attach distance between residues.
 
+        Notes
+        -----
+            With several cutoffs, `is_contact` is labelled with the first
+            one (see `labels` for all of them).
+
         Returns
         -------
         pd.DataFrame
             A Pandas DataFrame.
 
         """
+        dist_df = self.table()
+        dist_df["is_contact"] = (dist_df["dist"].values < self.cutoffs[0]).astype(
+            np.int64
+        )
+        return dist_df
+
+    def labels(
+        self,
+        is_packed: bool = False,
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Label residue pairs at every cutoff from one read of distances.
+
+        Parameters
+        ----------
+        is_packed : bool, optional
+            Whether to pack labels into bits along pairs (np.packbits with
+            axis=0; unpack with np.unpackbits(labels, axis=0, count=n)),
+            by default False.
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, np.ndarray]
+            The table of `attach` and a uint8 matrix of labels of shape
+            pairs x cutoffs, or (pairs / 8) x cutoffs if packed.
+
+        """
+        dist_df = self.attach()
+        cutoffs = np.asarray(self.cutoffs, dtype=np.float64)
+        labels = (dist_df["dist"].values[:, None] < cutoffs[None, :]).view(np.uint8)
+        if is_packed:
+            labels = np.packbits(labels, axis=0)
+        return dist_df, labels
+
+    def table(self) -> pd.DataFrame:
+        """
+        Distances between residues within the sequence-separation band.
+
+        Returns
+        -------
+        pd.DataFrame
+            A Pandas DataFrame without labels.
+
+        """
+        if self.is_binary:
+            return self.table_binary()
         dist_df = Reader().generic(self.dist_fpn)
-        dist_np = np.array(dist_df)
-        row = dist_np.shape[0]
-        new_col = np.array([np.ones(row) * -1])
-        dist_np = np.column_stack((dist_np, new_col.T))
-        for i in range(row):
-            if dist_np[i][6] < self.cutoff:
-                dist_np[i][7] = 1
-            else:
-                dist_np[i][7] = 0
-        dist_df = pd.DataFrame(dist_np)
         dist_df.columns = [
             "fasta_id_1",
             "aa_1",
@@ -76,7 +131,6 @@ class Label:
             "aa_2",
             "pdb_id_2",
             "dist",
-            "is_contact",
         ]
         dist_df = Separation(
             df=dist_df,
@@ -88,3 +142,53 @@ class Label:
             is_sort=False,
         ).extract()
         return dist_df.reset_index(inplace=False, drop=True)
+
+    def table_binary(self) -> pd.DataFrame:
+        """
+        Distances between residues within the sequence-separation band,
+        from a binary `.distb` file.
+
+        Notes
+        -----
+            Pairs are filtered by sequence separation as array operations
+            over the memory-mapped file, so only distances of pairs kept
+            are read. Rows are in the same order and columns have the same
+            names as those of the text file.
+
+        Returns
+        -------
+        pd.DataFrame
+            A Pandas DataFrame without labels.
+
+        """
+        binary = Binary()
+        header, arrays = binary.open(self.dist_fpn)
+        id_1, id_2 = binary.pairs(header, arrays)
+        fasta_id = np.asarray(arrays["fasta_id"], dtype=np.int64)
+        sep = fasta_id[id_2] - fasta_id[id_1]
+        if self.seq_sep_inferior is not None and self.seq_sep_superior is None:
+            query = sep > self.seq_sep_inferior
+        elif self.seq_sep_inferior is None and self.seq_sep_superior is not None:
+            query = sep < self.seq_sep_superior
+        elif self.seq_sep_inferior is not None and self.seq_sep_superior is not None:
+            query = (sep > self.seq_sep_inferior) & (sep < self.seq_sep_superior)
+        else:
+            query = sep > 0
+        keep = np.flatnonzero(query)
+        keep = keep[np.lexsort((fasta_id[id_2[keep]], fasta_id[id_1[keep]]))]
+        id_1 = id_1[keep]
+        id_2 = id_2[keep]
+        dist = np.asarray(arrays["dist"][keep], dtype=np.float64)
+        aa = binary.aa(arrays["aa"])
+        pdb_id = np.asarray(arrays["pdb_id"], dtype=np.int64)
+        return pd.DataFrame(
+            {
+                "fasta_id_1": fasta_id[id_1],
+                "aa_1": aa[id_1],
+                "pdb_id_1": pdb_id[id_1],
+                "fasta_id_2": fasta_id[id_2],
+                "aa_2": aa[id_2],
+                "pdb_id_2": pdb_id[id_2],
+                "dist": dist,
+            }
+        )